@@ -16,6 +16,7 @@ from typing import Tuple, Optional, Dict, Any
 from datetime import datetime
 from app.tools.registry import get_tool, get_script_path, WORKDIR_BASE, LOGS_DIR, update_tool_adapter, update_tool_metadata
 from app.tools.synthesizer import repair_adapter
+from app.tools import result_cache
 
 log = logging.getLogger("tool_executor")
 
@@ -224,12 +225,13 @@ def _execute_subprocess(
         raise TimeoutError(f"스크립트 실행이 {SUBPROCESS_TIMEOUT_SEC}초를 초과했습니다.")
 
 
-async def execute_tool(tool_id: str, bop_data: dict, params: Optional[Dict[str, Any]] = None) -> dict:
+async def execute_tool(tool_id: str, bop_data: dict, params: Optional[Dict[str, Any]] = None,
+                       use_cache: bool = True) -> dict:
     """
     도구 실행 파이프라인 (자동 복구 기능 포함):
     1. 레지스트리에서 도구 로드
     2. Pre-processor 실행 (BOP → 도구 입력)
-    3. 외부 스크립트 실행 (subprocess)
+    3. 외부 스크립트 실행 (subprocess, cacheable 도구는 동일 스크립트 + 동일 입력이면 캐시된 출력 재사용)
     4. Post-processor 실행 (도구 출력 → BOP 업데이트)
 
     어댑터 오류 발생 시 Gemini를 통해 자동 복구 시도
@@ -278,6 +280,7 @@ async def execute_tool(tool_id: str, bop_data: dict, params: Optional[Dict[str,
         "execution_time_sec": None,
         "auto_repair_attempts": 0,
         "auto_repair_success": False,
+        "cache_hit": False,
     }
 
     # 현재 사용할 어댑터 코드 (복구 시 업데이트됨)
@@ -346,18 +349,30 @@ async def execute_tool(tool_id: str, bop_data: dict, params: Optional[Dict[str,
 
         output_file = work_dir / "output_data.json"
 
-        # 6. 외부 스크립트 실행
-        log.info("[execute] 스크립트 실행 시작: %s", metadata.file_name)
-        try:
-            stdout, stderr, return_code = _execute_subprocess(
-                script_path, work_dir, input_file, output_file,
-                metadata.execution_type,
-            )
-            log.info("[execute] 스크립트 실행 완료: return_code=%d", return_code)
-        except TimeoutError as e:
-            exec_log["message"] = str(e)
-            exec_log["execution_time_sec"] = time.time() - start_time
-            return {"success": False, "message": exec_log["message"], "execution_time_sec": exec_log["execution_time_sec"]}
+        # 6. 외부 스크립트 실행 (캐시 적중 시 생략)
+        cache_key = None
+        if use_cache and metadata.cacheable:
+            if result_cache.cacheable_input(tool_input):
+                cache_key = result_cache.make_key(tool_id, script_path, tool_input)
+            else:
+                log.info("[execute] 입력이 캐시 제외를 요청함 (%s) — 캐시 사용 안 함", result_cache.NO_CACHE_KEY)
+        cached = result_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            log.info("[execute] 캐시 적중: %s — 스크립트 실행 생략", cache_key[:12])
+            exec_log["cache_hit"] = True
+            stdout, stderr, return_code = cached["stdout"], cached["stderr"], 0
+        else:
+            log.info("[execute] 스크립트 실행 시작: %s", metadata.file_name)
+            try:
+                stdout, stderr, return_code = _execute_subprocess(
+                    script_path, work_dir, input_file, output_file,
+                    metadata.execution_type,
+                )
+                log.info("[execute] 스크립트 실행 완료: return_code=%d", return_code)
+            except TimeoutError as e:
+                exec_log["message"] = str(e)
+                exec_log["execution_time_sec"] = time.time() - start_time
+                return {"success": False, "message": exec_log["message"], "execution_time_sec": exec_log["execution_time_sec"]}
 
         exec_log["stdout"] = stdout
         exec_log["stderr"] = stderr
@@ -382,8 +397,8 @@ async def execute_tool(tool_id: str, bop_data: dict, params: Optional[Dict[str,
             }
 
         # 7. 도구 출력 수집 (output file에서 읽기)
-        tool_output = None
-        if output_file.exists():
+        tool_output = cached["tool_output"] if cached is not None else None
+        if tool_output is None and output_file.exists():
             try:
                 with open(output_file, "r", encoding="utf-8") as f:
                     tool_output = f.read()
@@ -483,6 +498,10 @@ async def execute_tool(tool_id: str, bop_data: dict, params: Optional[Dict[str,
                 "execution_time_sec": exec_log["execution_time_sec"],
             }
 
+        # Post-processor까지 성공한 출력만 캐시 (거부된 출력이 다음 호출에서 재사용되지 않도록)
+        if cache_key and cached is None and tool_output:
+            result_cache.put(cache_key, tool_output, stdout, stderr)
+
         # === 자동 복구된 코드가 있으면 레지스트리 업데이트 ===
         if current_pre_code != adapter.pre_process_code or current_post_code != adapter.post_process_code:
             from app.tools.tool_models import AdapterCode as AC
@@ -516,6 +535,7 @@ async def execute_tool(tool_id: str, bop_data: dict, params: Optional[Dict[str,
             "stderr": stderr[:500] if stderr else None,
             "execution_time_sec": exec_log["execution_time_sec"],
             "auto_repaired": exec_log["auto_repair_success"],
+            "cache_hit": exec_log["cache_hit"],
         }
 
     except Exception as e:
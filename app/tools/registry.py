@@ -11,6 +11,7 @@ REGISTRY_DIR = BASE_DIR / "data" / "tool_registry"
 UPLOADS_DIR = BASE_DIR / "uploads" / "scripts"
 WORKDIR_BASE = BASE_DIR / "uploads" / "workdir"
 LOGS_DIR = BASE_DIR / "data" / "tool_logs"
+CACHE_DIR = BASE_DIR / "data" / "tool_cache"
 
 
 def _ensure_dirs():
@@ -18,6 +19,7 @@ def _ensure_dirs():
     UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
     WORKDIR_BASE.mkdir(parents=True, exist_ok=True)
     LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def generate_tool_id(tool_name: str, allow_existing: bool = True) -> str:
@@ -0,0 +1,123 @@
+"""
+도구 실행 결과 캐시
+
+동일한 도구 스크립트에 동일한 입력(pre-processor 결과)이 주어지면 subprocess를 다시
+실행하지 않고 이전 출력을 재사용합니다.
+
+- 키: sha256(tool_id, 스크립트 파일 해시, 키 정렬로 정규화한 입력 JSON)
+  → 스크립트가 수정되면 자동으로 다른 키가 됩니다.
+- 저장: 프로세스 메모리 LRU + data/tool_cache/<key>.json (전체 크기 제한, 오래된 항목부터 삭제)
+- 대상: 메타데이터 cacheable=True로 등록한 도구만. pre-processor 출력 JSON 객체에
+  NO_CACHE_KEY가 참이면(로그 파일 재생, 체크포인트, 분산 실행 등 입력 밖의 상태에 의존) 캐시하지 않습니다.
+"""
+
+import collections
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.tools.registry import CACHE_DIR
+
+log = logging.getLogger("tool_result_cache")
+
+MAX_MEMORY_ENTRIES = 64
+MAX_DISK_BYTES = 128 * 1024 * 1024
+NO_CACHE_KEY = "_no_cache"
+
+_memory: "collections.OrderedDict[str, Dict[str, Any]]" = collections.OrderedDict()
+
+
+def _canonical_input(tool_input: str) -> str:
+    """JSON이면 키 정렬/공백 제거로 정규화, 아니면 원문 그대로."""
+    try:
+        parsed = json.loads(tool_input)
+    except (TypeError, ValueError):
+        return tool_input
+    return json.dumps(parsed, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def cacheable_input(tool_input: str) -> bool:
+    """pre-processor 출력이 캐시 제외(NO_CACHE_KEY)를 요청하지 않았으면 True."""
+    try:
+        parsed = json.loads(tool_input)
+    except (TypeError, ValueError):
+        return True
+    return not (isinstance(parsed, dict) and parsed.get(NO_CACHE_KEY))
+
+
+def make_key(tool_id: str, script_path: Path, tool_input: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(tool_id.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(hashlib.sha256(script_path.read_bytes()).digest())
+    digest.update(_canonical_input(tool_input).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _remember(key: str, entry: Dict[str, Any]) -> None:
+    _memory[key] = entry
+    _memory.move_to_end(key)
+    while len(_memory) > MAX_MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """캐시된 실행 결과({"tool_output", "stdout", "stderr"}) 또는 None."""
+    entry = _memory.get(key)
+    if entry is not None:
+        _memory.move_to_end(key)
+        return dict(entry)
+
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    _remember(key, entry)
+    return dict(entry)
+
+
+def put(key: str, tool_output: str, stdout: Optional[str], stderr: Optional[str]) -> None:
+    entry = {"tool_output": tool_output, "stdout": stdout, "stderr": stderr}
+    _remember(key, entry)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = CACHE_DIR / f"{key}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        _prune()
+    except OSError as e:
+        log.warning("[cache] 디스크 저장 실패: %s", e)
+
+
+def _prune() -> None:
+    """디스크 캐시가 MAX_DISK_BYTES를 넘으면 마지막 사용 시각이 오래된 항목부터 삭제."""
+    files = []
+    total = 0
+    for path in CACHE_DIR.glob("*.json"):
+        st = path.stat()
+        files.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+    files.sort()
+    for _mtime, size, path in files:
+        if total <= MAX_DISK_BYTES:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+
+
+def clear() -> None:
+    _memory.clear()
+    if CACHE_DIR.exists():
+        for path in CACHE_DIR.glob("*.json"):
+            path.unlink()
@@ -79,8 +79,9 @@ async def register_tool(req: RegisterRequest):
             params_schema=req.params_schema,
             example_input=req.example_input,
             example_output=req.example_output,
+            cacheable=req.cacheable,
         )
-        log.info("[register] metadata 생성 완료")
+        log.info("[register] metadata 생성 완료 (cacheable=%s)", req.cacheable)
 
         # LLM으로 어댑터 코드 자동 생성
         log.info("[register] synthesize_adapter 호출, model=%s", req.model or "기본값")
@@ -530,6 +531,7 @@ async def apply_improvement_endpoint(tool_id: str, req: ApplyImprovementRequest)
             input_schema=old_metadata.input_schema,
             output_schema=old_metadata.output_schema,
             params_schema=new_params_schema,
+            cacheable=old_metadata.cacheable,
         )
 
         # 어댑터 코드 처리
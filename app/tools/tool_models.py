@@ -56,6 +56,7 @@ class ToolMetadata(BaseModel):
     params_schema: Optional[List[ParamDef]] = Field(default=None, description="도구별 추가 파라미터 정의")
     example_input: Optional[Any] = Field(default=None, description="입력 예시 데이터")
     example_output: Optional[Any] = Field(default=None, description="출력 예시 데이터")
+    cacheable: bool = Field(default=False, description="동일 스크립트 + 동일 입력의 실행 결과 캐시 허용 (입력 JSON 밖의 파일/상태를 읽지 않는 도구만)")
     created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
 
 
@@ -103,6 +104,7 @@ class RegisterRequest(BaseModel):
     sample_input: Optional[str] = None
     example_input: Optional[Any] = Field(default=None, description="입력 예시 데이터")
     example_output: Optional[Any] = Field(default=None, description="출력 예시 데이터")
+    cacheable: bool = Field(default=False, description="실행 결과 캐시 허용 (예: line_simulator)")
     model: Optional[str] = Field(default=None, description="사용할 LLM 모델")
 
 
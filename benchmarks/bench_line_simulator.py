@@ -0,0 +1,345 @@
+"""
+line_simulator 벤치마크
+
+- analytic: 해석적 추정(estimate)과 이산 시뮬레이션(sequential/event)의 처리량·부하율 오차 및 실행 시간 비교
+- crn: 공통 난수 vs 독립 난수로 두 시나리오를 비교할 때 쌍대 차이의 표준편차/필요 반복 수
+- large: 대형 합성 라인(기본 5,000 공정)에서 sequential 엔진 처리 속도와 상태 메모리
+         (평탄 array('d') 배치 vs 공정별 float 리스트 배치) 비교. 기준 구현(--baseline-rev 커밋의
+         line_simulator.simulate, 공정별 list/dict 상태)의 실행 시간도 같은 입력으로 함께 잰다
+- parallel: 독립 서브 조립 가지가 합류하는 합성 공장 라인에서 parallel 엔진(가지 분할 병렬)과
+            sequential 엔진의 실행 시간 및 결과 일치 여부
+- replay: sequential 트레이스로 만든 한 달 분량 이벤트 로그(CSV.gz)의 재생 속도와 KPI 차이
+
+Usage:
+    python benchmarks/bench_line_simulator.py analytic
+    python benchmarks/bench_line_simulator.py large --stations 5000 --num-products 200
+    python benchmarks/bench_line_simulator.py crn --stations 20 --num-products 1000 --warmup-products 100
+    python benchmarks/bench_line_simulator.py parallel --stations 4000 --branches 16 --num-products 500
+    python benchmarks/bench_line_simulator.py replay --stations 20 --days 30
+"""
+
+import argparse
+import copy
+import csv
+import gzip
+import heapq
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# 프로젝트 루트를 Python 경로에 추가
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import line_simulator  # noqa: E402
+
+# struct-of-arrays 상태 도입 이전의 line_simulator (large 벤치마크의 기준 구현)
+BASELINE_REV = "841997b"
+
+SAMPLE_BOPS = [
+    PROJECT_ROOT / "input.json",
+    PROJECT_ROOT / "전기 자전거 조립 라인_2026-02-02.json",
+    PROJECT_ROOT / "tests" / "tool_integration" / "test_bop_bicycle.json",
+]
+
+
+# ── 공통 ──────────────────────────────────────────────────
+def load_sample(path: Path, num_products: int, warmup_products: int) -> Dict[str, Any]:
+    """샘플 BOP → 시뮬레이터 입력. 공정 CT가 없으면 병렬 라인 CT 평균을 사용."""
+    with open(path, "r", encoding="utf-8") as f:
+        bop = json.load(f)
+    processes = []
+    for proc in bop["processes"]:
+        proc = copy.deepcopy(proc)
+        if "cycle_time_sec" not in proc:
+            lines = [ln["cycle_time_sec"] for ln in proc.get("parallel_lines", []) if "cycle_time_sec" in ln]
+            proc["cycle_time_sec"] = sum(lines) / len(lines) if lines else 0.0
+        proc.setdefault("parallel_count", len(proc.get("parallel_lines", [])) or 1)
+        processes.append(proc)
+    return {"processes": processes, "num_products": num_products, "warmup_products": warmup_products}
+
+
+def timed(fn: Callable[[], Any], repeat: int = 1) -> Tuple[Any, float]:
+    """repeat회 실행 중 최소 시간(초)과 마지막 결과."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def synthetic_line(stations: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """직렬 라인 + 일정 간격의 분기/합류를 가진 합성 공정 목록."""
+    rng = random.Random(seed)
+    processes = []
+    for i in range(stations):
+        preds = [f"S{i - 1:05d}"] if i else []
+        if i >= 10 and i % 10 == 0:
+            preds.append(f"S{i - 10:05d}")
+        processes.append({
+            "process_id": f"S{i:05d}",
+            "name": f"station {i}",
+            "cycle_time_sec": rng.randint(30, 120),
+            "parallel_count": rng.randint(1, 4),
+            "predecessor_ids": preds,
+        })
+    return processes
+
+
+def synthetic_plant(stations: int, branches: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """branches개의 직렬 서브 조립 가지가 하나의 최종 조립 라인(전체의 1/10)에 합류하는 합성 공장."""
+    rng = random.Random(seed)
+    trunk = max(1, stations // 10)
+    length = max(1, (stations - trunk) // branches)
+    processes: List[Dict[str, Any]] = []
+    ends = []
+    for b in range(branches):
+        for k in range(length):
+            processes.append({
+                "process_id": f"B{b:02d}-{k:04d}",
+                "name": f"branch {b} station {k}",
+                "cycle_time_sec": rng.randint(30, 120),
+                "parallel_count": rng.randint(1, 4),
+                "predecessor_ids": [f"B{b:02d}-{k - 1:04d}"] if k else [],
+            })
+        ends.append(f"B{b:02d}-{length - 1:04d}")
+    for k in range(trunk):
+        processes.append({
+            "process_id": f"T{k:04d}",
+            "name": f"final assembly {k}",
+            "cycle_time_sec": rng.randint(30, 120),
+            "parallel_count": rng.randint(1, 4),
+            "predecessor_ids": [f"T{k - 1:04d}"] if k else ends,
+        })
+    return processes
+
+
+def rel_err(estimate: float, reference: float) -> float:
+    return abs(estimate - reference) / reference * 100.0 if reference else 0.0
+
+
+# ── analytic vs simulation ───────────────────────────────
+def bench_analytic(args: argparse.Namespace) -> None:
+    header = f"{'BOP':<28} {'engine':<10} {'UPH':>8} {'est UPH':>8} {'err%':>6} {'util MAE':>8} {'sim ms':>9} {'est us':>8}"
+    print(header)
+    print("-" * len(header))
+    for path in SAMPLE_BOPS:
+        if not path.exists():
+            continue
+        data = load_sample(path, args.num_products, args.warmup_products)
+        est, est_sec = timed(lambda: line_simulator.estimate(data), repeat=args.repeat)
+        for engine in ("sequential", "event"):
+            sim, sim_sec = timed(lambda: line_simulator.simulate(dict(data, engine=engine)))
+            sim_uph = sim["simulation_summary"]["throughput_uph"]
+            est_uph = est["simulation_summary"]["throughput_uph"]
+            util_err: List[float] = [
+                abs(e["utilization_pct"] - s["utilization_pct"])
+                for e, s in zip(est["process_analysis"], sim["process_analysis"])
+            ]
+            print(f"{path.stem[:28]:<28} {engine:<10} {sim_uph:>8.2f} {est_uph:>8.2f} "
+                  f"{rel_err(est_uph, sim_uph):>6.2f} {sum(util_err) / len(util_err):>8.2f} "
+                  f"{sim_sec * 1e3:>9.1f} {est_sec * 1e6:>8.1f}")
+
+
+# ── 대형 라인: struct-of-arrays 상태 ─────────────────────
+def _list_layout_bytes(state: "line_simulator._SequentialState") -> int:
+    """같은 값을 공정별 float 리스트(list of lists) 4종으로 들고 있을 때의 할당량."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    layout = [
+        [[float(v) for v in state.station(values, j)] for j in range(len(state.counts))]
+        for values in (state.servers, state.working, state.starving, state.blocking)
+    ]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del layout
+    return size
+
+
+def load_baseline(rev: str) -> Any:
+    """git rev 시점의 line_simulator.py를 별도 모듈로 불러온다 (git/커밋이 없으면 None)."""
+    try:
+        source = subprocess.run(["git", "show", f"{rev}:line_simulator.py"], cwd=PROJECT_ROOT,
+                                capture_output=True, check=True, encoding="utf-8").stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"baseline {rev}: 불러오기 실패 ({e}) — 기준 구현 측정 생략")
+        return None
+    module = types.ModuleType(f"line_simulator_{rev}")
+    exec(compile(source, f"{rev}:line_simulator.py", "exec"), module.__dict__)
+    return module
+
+
+def bench_large(args: argparse.Namespace) -> None:
+    processes = synthetic_line(args.stations)
+    data = {"processes": processes, "num_products": args.num_products,
+            "warmup_products": args.warmup_products}
+    line_simulator._validate(data)
+    topo = line_simulator._build_topology(processes)
+
+    result, sec = timed(lambda: line_simulator._simulate_sequential(data, topo))
+    steps = args.stations * args.num_products
+    print(f"stations={args.stations} servers={sum(p['parallel_count'] for p in processes)} "
+          f"products={args.num_products}")
+    print(f"sequential: {sec:.2f}s  {steps / sec / 1e6:.3f}M station-steps/s  "
+          f"throughput={result['simulation_summary']['throughput_uph']} UPH")
+
+    baseline = load_baseline(args.baseline_rev) if args.baseline_rev else None
+    if baseline is not None:
+        base_result, base_sec = timed(lambda: baseline.simulate(copy.deepcopy(data)))
+        print(f"baseline {args.baseline_rev}: {base_sec:.2f}s  {steps / base_sec / 1e6:.3f}M station-steps/s  "
+              f"throughput={base_result['simulation_summary']['throughput_uph']} UPH  "
+              f"(speedup {base_sec / sec:.2f}x)")
+
+    parallel_counts = [p["parallel_count"] for p in topo.ordered]
+    tracemalloc.start()
+    state = line_simulator._SequentialState(parallel_counts)
+    flat_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    for values in (state.servers, state.working, state.starving, state.blocking):
+        for i in range(len(values)):
+            values[i] = random.random()
+    list_bytes = _list_layout_bytes(state)
+    print(f"state memory: flat array('d') {flat_bytes / 1024:.0f} KiB vs "
+          f"list of lists {list_bytes / 1024:.0f} KiB ({list_bytes / flat_bytes:.1f}x)")
+
+
+# ── 공통 난수(CRN) vs 독립 난수 비교 ────────────────────
+def bench_crn(args: argparse.Namespace) -> None:
+    """병목 CT를 3% 줄인 variant와 비교할 때 쌍대 차이의 표준편차 (필요 반복 수는 분산에 비례)."""
+    # 직렬 라인 (합류 버퍼가 WIP를 묶는 분기/합류 라인은 event 엔진에서 CT 변화가 드러나지 않음)
+    processes = synthetic_line(args.stations if args.stations < 200 else 20)
+    for p in processes:
+        p["predecessor_ids"] = p["predecessor_ids"][:1]
+    base = {"processes": processes, "num_products": args.num_products,
+            "warmup_products": args.warmup_products, "n_replications": args.replications,
+            "cycle_time_dist": {"type": "lognormal", "cv": 0.3}}
+    by_id = {p["process_id"]: p for p in processes}
+
+    print(f"{'engine':<10} {'streams':<12} {'diff UPH':>9} {'std':>8} {'half':>8} {'sec':>7}")
+    for engine in ("sequential", "event"):
+        deterministic = {k: v for k, v in base.items() if k not in ("cycle_time_dist", "n_replications")}
+        analysis = line_simulator.simulate(dict(deterministic, engine=engine))["process_analysis"]
+        bottleneck = by_id[max(analysis, key=lambda pa: pa["utilization_pct"])["process_id"]]
+        variant = line_simulator._variant_input(base, {"overrides": {
+            bottleneck["process_id"]: {"cycle_time_sec": bottleneck["cycle_time_sec"] * 0.97}}})
+        stds = {}
+        for crn in (False, True):
+            result, sec = timed(lambda: line_simulator.compare(
+                dict(base, engine=engine, common_random_numbers=crn), dict(variant, engine=engine)))
+            diff = result["comparison_summary"]["throughput_uph_diff"]
+            stds[crn] = diff["std"]
+            print(f"{engine:<10} {'common' if crn else 'independent':<12} {diff['mean']:>9.3f} "
+                  f"{diff['std']:>8.4f} {diff['half_width']:>8.4f} {sec:>7.2f}")
+        if stds[True] > 0:
+            print(f"{engine:<10} 같은 CI 폭에 필요한 반복 수 비율 (independent / common): "
+                  f"{(stds[False] / stds[True]) ** 2:.1f}x")
+
+
+# ── 가지 분할 병렬 엔진 ──────────────────────────────────
+def bench_parallel(args: argparse.Namespace) -> None:
+    processes = synthetic_plant(args.stations, args.branches)
+    data = {"processes": processes, "num_products": args.num_products,
+            "warmup_products": args.warmup_products}
+    seq, seq_sec = timed(lambda: line_simulator.simulate(dict(data)))
+    print(f"stations={len(processes)} branches={args.branches} products={args.num_products}")
+    print(f"{'engine':<10} {'workers':>7} {'parts':>6} {'sec':>7} {'speedup':>8} {'same':>5}")
+    print(f"{'sequential':<10} {1:>7} {1:>6} {seq_sec:>7.2f} {1.0:>8.2f} {'-':>5}")
+    for workers in args.workers:
+        par, sec = timed(lambda: line_simulator.simulate(dict(data, engine="parallel", max_workers=workers)))
+        info = par.pop("parallel")
+        par["simulation_summary"]["engine"] = "sequential"
+        print(f"{'parallel':<10} {info['workers']:>7} {info['partitions']:>6} {sec:>7.2f} "
+              f"{seq_sec / sec:>8.2f} {'yes' if par == seq else 'NO':>5}")
+
+
+# ── 이벤트 로그 재생 ─────────────────────────────────────
+def write_event_log(data: Dict[str, Any], path: str) -> int:
+    """sequential 트레이스 → 시각순 start/finish 이벤트 CSV.gz (finish = 가공 완료, 정체 제외).
+
+    제품 투입 시각은 단조 증가하므로 현재 제품 투입 시각 이전의 이벤트만 힙에서 내보낸다.
+    """
+    first = line_simulator._build_topology(data["processes"]).proc_ids[0]
+    pending: List[Tuple[float, str, str]] = []
+    events = 0
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp", "process_id", "event"])
+        for rec in line_simulator.iter_trace(data):
+            if rec["process_id"] == first:
+                while pending and pending[0][0] <= rec["start"]:
+                    writer.writerow(heapq.heappop(pending))
+                    events += 1
+            heapq.heappush(pending, (rec["start"], rec["process_id"], "start"))
+            heapq.heappush(pending, (rec["finish"] - rec["block"], rec["process_id"], "finish"))
+        while pending:
+            writer.writerow(heapq.heappop(pending))
+            events += 1
+    return events
+
+
+def bench_replay(args: argparse.Namespace) -> None:
+    processes = synthetic_line(args.stations)
+    for p in processes:
+        p["predecessor_ids"] = p["predecessor_ids"][:1]
+    bottleneck = max(p["cycle_time_sec"] / p["parallel_count"] for p in processes)
+    data = {"processes": processes, "num_products": int(args.days * 86400 / bottleneck),
+            "warmup_products": 0}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "events.csv.gz")
+        events, gen_sec = timed(lambda: write_event_log(data, path))
+        sim = line_simulator.simulate(data)
+        result, sec = timed(lambda: line_simulator.replay(data, path))
+    span_days = result["simulation_summary"]["total_time_sec"] / 86400
+    print(f"stations={len(processes)} products={data['num_products']} events={events} "
+          f"span={span_days:.1f} days (log written in {gen_sec:.1f}s)")
+    print(f"replay: {sec:.2f}s  {events / sec / 1e6:.2f}M events/s  "
+          f"{span_days * 86400 / sec:,.0f}x real time  anomalies={result['replay']['anomalies']}")
+    # sequential 엔진은 공정별 관측 구간이 자기 마지막 작업에서 끝나므로(투입 제한 없음) 비병목 공정의
+    # 부하율은 로그 전체 구간 기준의 재생 값보다 높다. 병목 부하율과 처리량은 같아야 한다.
+    capacity = [pa["cycle_time_sec"] / pa["parallel_count"] for pa in sim["process_analysis"]]
+    bottleneck_idx = capacity.index(max(capacity))
+    print(f"  throughput_uph   replay {result['simulation_summary']['throughput_uph']} "
+          f"vs sequential {sim['simulation_summary']['throughput_uph']}")
+    print(f"  bottleneck util  replay {result['process_analysis'][bottleneck_idx]['utilization_pct']} "
+          f"vs sequential {sim['process_analysis'][bottleneck_idx]['utilization_pct']}")
+
+
+BENCHMARKS = {
+    "analytic": bench_analytic,
+    "large": bench_large,
+    "crn": bench_crn,
+    "parallel": bench_parallel,
+    "replay": bench_replay,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="line_simulator 벤치마크")
+    parser.add_argument("bench", choices=sorted(BENCHMARKS), help="실행할 벤치마크")
+    parser.add_argument("--num-products", type=int, default=2000)
+    parser.add_argument("--warmup-products", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20, help="짧은 측정의 반복 횟수 (최소값 사용)")
+    parser.add_argument("--stations", type=int, default=5000, help="large: 합성 라인 공정 수")
+    parser.add_argument("--replications", type=int, default=30, help="crn: 시나리오별 반복 수")
+    parser.add_argument("--days", type=float, default=30, help="replay: 이벤트 로그 기간(일)")
+    parser.add_argument("--branches", type=int, default=16, help="parallel: 서브 조립 가지 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8],
+                        help="parallel: 비교할 작업 프로세스 수")
+    parser.add_argument("--baseline-rev", default=BASELINE_REV,
+                        help="large: 기준 구현으로 측정할 line_simulator의 git 커밋 (빈 문자열이면 생략)")
+    args = parser.parse_args()
+    BENCHMARKS[args.bench](args)
+
+
+if __name__ == "__main__":
+    main()
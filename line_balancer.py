@@ -0,0 +1,698 @@
+#!/usr/bin/env python3
+"""
+line_balancer.py — 작업-스테이션 할당 라인 밸런싱 도구 (SALBP-1 / SALBP-2)
+
+BOP의 processes(cycle_time_sec, predecessor_ids/successor_ids; 없으면 process_details의 값)를
+작업(task)과 선후행 관계로 보고, 작업들을 직렬 스테이션에 다시 묶는다.
+parallel_optimizer가 공정 전체를 복제하는 것과 달리 공정 간 작업 내용을 재배분한다.
+
+- SALBP-1 (target_uph 또는 takt_time_sec): takt 안에서 스테이션 수 최소화
+- SALBP-2 (station_count): 주어진 스테이션 수에서 사이클 타임(takt) 최소화
+
+takt보다 긴 작업은 다른 작업과 묶지 않고 단독 스테이션을 ceil(CT / takt)대 병렬로 둔다
+(병렬 대수만큼 스테이션 수에 포함).
+
+해법: 순위 위치 가중치(RPW) 등 우선순위 규칙 휴리스틱으로 상한을 구하고, 작업 수가
+exact_max_tasks(기본 60) 이하이면 스테이션 단위 분기한정(할당 작업 bitset 메모 + 하한 가지치기)으로
+최적해를 탐색한다. time_limit_sec(기본 10초)를 넘으면 그때까지의 최선 해를 optimal=false로 반환한다.
+SALBP-2는 스테이션 수가 station_count 이하가 되는 최소 사이클 타임을 이분 탐색한다.
+
+결과의 processes는 스테이션 단위의 새 BOP 공정 목록이며, post_process가 BOP의 processes
+(및 process_details / resource_assignments가 있으면 함께)를 교체한다.
+
+Usage:
+    python line_balancer.py --input input.json --output output.json
+    python line_balancer.py --input input.json --output output.json --log-level DEBUG
+    python line_balancer.py --input input.json --output output.json --station-count 6
+"""
+
+import argparse
+import json
+import logging
+import math
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+log = logging.getLogger("line_balancer")
+
+DEFAULT_TIME_LIMIT_SEC = 10.0
+DEFAULT_EXACT_MAX_TASKS = 60
+PARALLEL_OFFSET_Z = 5.0   # 병렬 라인 #n 위치 = location + (0, 0, 5 * (n - 1))
+
+_EPS = 1e-9
+_CYCLE_TOL_SEC = 0.01     # SALBP-2 이분 탐색 종료 폭
+
+
+class _Timeout(Exception):
+    pass
+
+
+# ── 작업 그래프 ───────────────────────────────────────────
+class _TaskGraph:
+    """위상 순서로 재색인한 작업 목록. pred_mask[i]는 직접 선행 작업의 bitset (선행 색인 < i)."""
+
+    def __init__(self, processes: List[Dict[str, Any]]):
+        ids = [p["process_id"] for p in processes]
+        index = {pid: i for i, pid in enumerate(ids)}
+        if len(index) != len(ids):
+            raise ValueError("process_id가 중복되었습니다")
+        preds: List[set] = [set() for _ in ids]
+        for i, p in enumerate(processes):
+            for q in p.get("predecessor_ids") or []:
+                if q in index and q != ids[i]:
+                    preds[i].add(index[q])
+            for q in p.get("successor_ids") or []:
+                if q in index and q != ids[i]:
+                    preds[index[q]].add(i)
+
+        # Kahn 위상 정렬 (같은 단계에서는 입력 순서 유지)
+        indegree = [len(s) for s in preds]
+        succs: List[List[int]] = [[] for _ in ids]
+        for i, s in enumerate(preds):
+            for q in s:
+                succs[q].append(i)
+        ready = [i for i in range(len(ids)) if indegree[i] == 0]
+        order: List[int] = []
+        while ready:
+            ready.sort()
+            i = ready.pop(0)
+            order.append(i)
+            for j in succs[i]:
+                indegree[j] -= 1
+                if indegree[j] == 0:
+                    ready.append(j)
+        if len(order) != len(ids):
+            raise ValueError("선후행 관계에 순환이 있습니다")
+
+        pos = {old: new for new, old in enumerate(order)}
+        self.processes = [processes[i] for i in order]
+        self.ids = [ids[i] for i in order]
+        self.names = [p.get("name", "") for p in self.processes]
+        self.times = [float(p["cycle_time_sec"]) for p in self.processes]
+        if any(t < 0 for t in self.times):
+            raise ValueError("cycle_time_sec는 음수일 수 없습니다")
+        self.n = len(order)
+        self.full = (1 << self.n) - 1
+        self.pred_mask = [0] * self.n
+        self.succ_lists: List[List[int]] = [[] for _ in range(self.n)]
+        for old in order:
+            for q in preds[old]:
+                self.pred_mask[pos[old]] |= 1 << pos[q]
+                self.succ_lists[pos[q]].append(pos[old])
+
+        # 전이적 후속 작업 (역위상 순서로 누적) — RPW와 후속 수 규칙에 사용
+        self.desc_mask = [0] * self.n
+        for i in range(self.n - 1, -1, -1):
+            m = 0
+            for j in self.succ_lists[i]:
+                m |= (1 << j) | self.desc_mask[j]
+            self.desc_mask[i] = m
+
+    def positional_weight(self, i: int) -> float:
+        m, w = self.desc_mask[i], self.times[i]
+        while m:
+            low = m & -m
+            w += self.times[low.bit_length() - 1]
+            m ^= low
+        return w
+
+
+# ── 해 표현 ───────────────────────────────────────────────
+def _parallel_need(t: float, cycle: float) -> int:
+    return max(1, math.ceil(t / cycle - _EPS))
+
+
+def _oversized(graph: _TaskGraph, cycle: float) -> List[bool]:
+    return [t > cycle + _EPS for t in graph.times]
+
+
+def _cost(graph: _TaskGraph, stations: List[List[int]], cycle: float) -> int:
+    """스테이션 수 (takt 초과 작업의 단독 스테이션은 병렬 대수만큼)."""
+    over = _oversized(graph, cycle)
+    return sum(_parallel_need(graph.times[s[0]], cycle) if over[s[0]] else 1 for s in stations)
+
+
+def _effective_cycle(graph: _TaskGraph, stations: List[List[int]], cycle: float) -> float:
+    over = _oversized(graph, cycle)
+    eff = 0.0
+    for s in stations:
+        load = sum(graph.times[i] for i in s)
+        if over[s[0]]:
+            load /= _parallel_need(load, cycle)
+        eff = max(eff, load)
+    return eff
+
+
+def _lower_bound(graph: _TaskGraph, remaining: int, cycle: float, over: List[bool]) -> int:
+    """ceil(남은 작업량 / takt)와 takt/2 초과 작업 수 중 큰 값 + takt 초과 작업의 병렬 대수."""
+    work, big, fixed = 0.0, 0, 0
+    m = remaining
+    while m:
+        low = m & -m
+        i = low.bit_length() - 1
+        m ^= low
+        t = graph.times[i]
+        if over[i]:
+            fixed += _parallel_need(t, cycle)
+        else:
+            work += t
+            if t > cycle / 2 + _EPS:
+                big += 1
+    lb1 = math.ceil(work / cycle - _EPS) if cycle > 0 else 0
+    return max(lb1, big) + fixed
+
+
+# ── 휴리스틱 ─────────────────────────────────────────────
+def _priority_assign(graph: _TaskGraph, cycle: float, ranked: List[int]) -> List[List[int]]:
+    """우선순위 순서대로 선행이 끝난 작업 중 남은 시간에 들어가는 첫 작업을 현재 스테이션에 배정."""
+    over = _oversized(graph, cycle)
+    pred_mask, times = graph.pred_mask, graph.times
+    assigned = 0
+    stations: List[List[int]] = []
+    while assigned != graph.full:
+        load: List[int] = []
+        rem = cycle
+        while True:
+            pick = None
+            first_over = None
+            for i in ranked:
+                if (assigned >> i) & 1 or pred_mask[i] & ~assigned:
+                    continue
+                if over[i]:
+                    if first_over is None:
+                        first_over = i
+                elif times[i] <= rem + _EPS:
+                    pick = i
+                    break
+            if pick is None:
+                if not load and first_over is not None:
+                    stations.append([first_over])
+                    assigned |= 1 << first_over
+                break
+            load.append(pick)
+            assigned |= 1 << pick
+            rem -= times[pick]
+        if load:
+            stations.append(load)
+    return stations
+
+
+def _heuristic(graph: _TaskGraph, cycle: float) -> Tuple[List[List[int]], str]:
+    """RPW, 최장 작업 시간, 최다 후속 작업 규칙 중 스테이션 수가 가장 적은 해."""
+    rules = {
+        "rpw": lambda i: graph.positional_weight(i),
+        "longest_task": lambda i: graph.times[i],
+        "most_successors": lambda i: bin(graph.desc_mask[i]).count("1"),
+    }
+    best: Optional[Tuple[int, float, List[List[int]], str]] = None
+    for rule, key in rules.items():
+        ranked = sorted(range(graph.n), key=lambda i: (-key(i), i))
+        stations = _priority_assign(graph, cycle, ranked)
+        cand = (_cost(graph, stations, cycle), _effective_cycle(graph, stations, cycle), stations, rule)
+        if best is None or cand[:2] < best[:2]:
+            best = cand
+    return best[2], best[3]
+
+
+# ── 분기한정 ─────────────────────────────────────────────
+class _BranchAndBound:
+    """스테이션 단위 분기: 각 단계에서 남은 작업으로 만들 수 있는 극대 적재(maximal load)를 나열.
+
+    위상 순서 색인이 증가하는 순으로만 작업을 더하므로 같은 적재를 두 번 만들지 않는다.
+    할당된 작업 bitset → 도달 스테이션 수 메모로 지배되는 상태를 잘라내고, 하한이 현재 최선 해 이상이면
+    분기하지 않는다. stop_at 이하의 해를 찾으면 (SALBP-2 판정용) 즉시 종료한다.
+    """
+
+    def __init__(self, graph: _TaskGraph, cycle: float, deadline: float,
+                 upper: List[List[int]], stop_at: int = 0):
+        self.graph = graph
+        self.cycle = cycle
+        self.deadline = deadline
+        self.over = _oversized(graph, cycle)
+        self.best = [list(s) for s in upper]
+        self.best_cost = _cost(graph, upper, cycle)
+        self.stop_at = stop_at
+        self.memo: Dict[int, int] = {}
+        self.nodes = 0
+        self.timed_out = False
+
+    def solve(self) -> bool:
+        """최적성을 증명했으면(또는 stop_at 달성) True."""
+        root_lb = _lower_bound(self.graph, self.graph.full, self.cycle, self.over)
+        if self.best_cost <= max(root_lb, self.stop_at):
+            return True
+        try:
+            self._dfs(0, 0, [])
+        except _Timeout:
+            self.timed_out = True
+            return self.best_cost <= self.stop_at
+        return True
+
+    def _maximal_loads(self, assigned: int) -> List[Tuple[float, int, List[int]]]:
+        g, cycle, over = self.graph, self.cycle, self.over
+        times, pred_mask = g.times, g.pred_mask
+        cand = [i for i in range(g.n) if not (assigned >> i) & 1 and not over[i]]
+        out: List[Tuple[float, int, List[int]]] = []
+
+        def extend(start: int, cur: int, rem: float, load: List[int], total: float) -> None:
+            for j in range(start, len(cand)):
+                i = cand[j]
+                if times[i] <= rem + _EPS and not pred_mask[i] & ~cur:
+                    load.append(i)
+                    extend(j + 1, cur | (1 << i), rem - times[i], load, total + times[i])
+                    load.pop()
+            if not load:
+                return
+            for i in cand:
+                if not (cur >> i) & 1 and times[i] <= rem + _EPS and not pred_mask[i] & ~cur:
+                    return   # 더 넣을 수 있으면 극대 적재가 아님
+            out.append((total, cur, list(load)))
+
+        extend(0, assigned, cycle, [], 0.0)
+        out.sort(key=lambda x: -x[0])
+        return out
+
+    def _dfs(self, assigned: int, used: int, path: List[List[int]]) -> None:
+        self.nodes += 1
+        if not self.nodes & 0xFF and time.perf_counter() > self.deadline:
+            raise _Timeout()
+        g = self.graph
+        if assigned == g.full:
+            if used < self.best_cost:
+                self.best_cost, self.best = used, [list(s) for s in path]
+                log.debug("[bnb] 개선 해: %d 스테이션 (노드 %d)", used, self.nodes)
+            return
+        if used + _lower_bound(g, g.full & ~assigned, self.cycle, self.over) >= self.best_cost:
+            return
+        if self.memo.get(assigned, 1 << 30) <= used:
+            return
+        self.memo[assigned] = used
+
+        for i in range(g.n):
+            if self.over[i] and not (assigned >> i) & 1 and not g.pred_mask[i] & ~assigned:
+                path.append([i])
+                self._dfs(assigned | (1 << i), used + _parallel_need(g.times[i], self.cycle), path)
+                path.pop()
+                if self.best_cost <= self.stop_at:
+                    return
+        for _total, nxt, load in self._maximal_loads(assigned):
+            path.append(load)
+            self._dfs(nxt, used + 1, path)
+            path.pop()
+            if self.best_cost <= self.stop_at:
+                return
+
+
+# ── SALBP-1 / SALBP-2 ─────────────────────────────────────
+def _solve_salbp1(graph: _TaskGraph, cycle: float, deadline: float, exact: bool,
+                  stop_at: int = 0) -> Dict[str, Any]:
+    stations, rule = _heuristic(graph, cycle)
+    info = {
+        "stations": stations,
+        "heuristic_rule": rule,
+        "heuristic_stations": _cost(graph, stations, cycle),
+        "optimal": False,
+        "nodes": 0,
+        "timed_out": False,
+    }
+    if exact:
+        bnb = _BranchAndBound(graph, cycle, deadline, stations, stop_at)
+        info["optimal"] = bnb.solve()
+        info.update(stations=bnb.best, nodes=bnb.nodes, timed_out=bnb.timed_out)
+    info["num_stations"] = _cost(graph, info["stations"], cycle)
+    return info
+
+
+def _solve_salbp2(graph: _TaskGraph, station_count: int, deadline: float,
+                  exact: bool) -> Tuple[float, Dict[str, Any], bool]:
+    """스테이션 수 <= station_count인 최소 사이클 타임. (cycle, SALBP-1 해, 증명 여부) 반환.
+
+    사이클 타임이 커질수록 필요한 스테이션 수는 줄어들기만 하므로 이분 탐색하며, 가능한 해를 찾으면
+    상한을 그 해의 실제 최대 스테이션 부하로 당긴다. 하한은 총 작업량 / station_count.
+    """
+    total = sum(graph.times)
+    lo = total / station_count
+    hi = max(total, _EPS)
+    best = _solve_salbp1(graph, hi, deadline, exact=False)
+    proven = True
+
+    def attempt(cycle: float) -> Optional[Dict[str, Any]]:
+        nonlocal proven
+        heur = _solve_salbp1(graph, cycle, deadline, exact=False)
+        if heur["num_stations"] <= station_count or not exact:
+            return heur if heur["num_stations"] <= station_count else None
+        if time.perf_counter() > deadline:
+            proven = False
+            return None
+        res = _solve_salbp1(graph, cycle, deadline, exact=True, stop_at=station_count)
+        if res["num_stations"] <= station_count:
+            return res
+        if not res["optimal"]:
+            proven = False
+        return None
+
+    first = attempt(lo)
+    if first is not None:
+        return _effective_cycle(graph, first["stations"], lo), first, proven
+    while hi - lo > _CYCLE_TOL_SEC:
+        mid = (lo + hi) / 2
+        res = attempt(mid)
+        if res is None:
+            lo = mid
+        else:
+            best = res
+            hi = min(mid, _effective_cycle(graph, res["stations"], mid))
+    if not exact:
+        proven = False
+    return hi, best, proven
+
+
+# ── 결과 구성 ─────────────────────────────────────────────
+def _station_processes(graph: _TaskGraph, stations: List[List[int]], cycle: float
+                       ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """스테이션 요약과 새 BOP 공정 목록 (직렬 선후행 S001 → S002 → ...)."""
+    over = _oversized(graph, cycle)
+    width = max(3, len(str(len(stations))))
+    ids = [f"S{k + 1:0{width}d}" for k in range(len(stations))]
+    summary: List[Dict[str, Any]] = []
+    processes: List[Dict[str, Any]] = []
+    for k, s in enumerate(stations):
+        load = sum(graph.times[i] for i in s)
+        par = _parallel_need(load, cycle) if over[s[0]] else 1
+        eff = load / par
+        members = [graph.processes[i] for i in s]
+        summary.append({
+            "station_id": ids[k],
+            "process_ids": [graph.ids[i] for i in s],
+            "names": [graph.names[i] for i in s],
+            "load_sec": round(load, 4),
+            "parallel_count": par,
+            "effective_ct_sec": round(eff, 4),
+            "idle_sec": round(cycle * par - load, 4),
+        })
+        proc: Dict[str, Any] = {
+            "process_id": ids[k],
+            "name": " + ".join(n for n in (graph.names[i] for i in s) if n) or ids[k],
+            "description": "라인 밸런싱 통합 공정: " + ", ".join(graph.ids[i] for i in s),
+            "cycle_time_sec": round(load, 4),
+            "parallel_count": par,
+            "predecessor_ids": [ids[k - 1]] if k > 0 else [],
+            "successor_ids": [ids[k + 1]] if k + 1 < len(stations) else [],
+            "balanced_process_ids": [graph.ids[i] for i in s],
+        }
+        if "location" in members[0]:
+            proc["location"] = members[0]["location"]
+        if any("parallel_lines" in m for m in members):
+            proc["parallel_lines"] = _station_lines(members[0], proc, par)
+        # parallel_line_index는 0부터: 스테이션 병렬 수 밖의 라인에 놓인 자원은 제거
+        resources = [r for m in members for r in (m.get("resources") or [])
+                     if int(r.get("parallel_line_index", 0)) < par]
+        if resources:
+            proc["resources"] = resources
+        processes.append(proc)
+    return summary, processes
+
+
+def _station_lines(first: Dict[str, Any], proc: Dict[str, Any], par: int) -> List[Dict[str, Any]]:
+    """스테이션의 parallel_lines[0..par-1]: 첫 작업의 같은 parallel_index 행(위치, 회전)을 쓰고,
+    없으면 첫 행 위치에서 z축 PARALLEL_OFFSET_Z 간격. 이름/설명/CT는 스테이션 값."""
+    rows = sorted(first.get("parallel_lines") or [], key=lambda ln: ln.get("parallel_index", 1))
+    base = rows[0] if rows else {"location": first.get("location")}
+    lines: List[Dict[str, Any]] = []
+    for idx in range(1, par + 1):
+        row = next((ln for ln in rows if ln.get("parallel_index") == idx), None)
+        line = {k: v for k, v in (row or base).items() if k not in ("parallel_index", "computed_size")}
+        if row is None and isinstance(base.get("location"), dict):
+            loc = dict(base["location"])
+            loc["z"] = loc.get("z", 0.0) + PARALLEL_OFFSET_Z * (idx - 1)
+            line["location"] = loc
+        line.update({
+            "parallel_index": idx,
+            "name": proc["name"],
+            "description": proc["description"],
+            "cycle_time_sec": proc["cycle_time_sec"],
+        })
+        lines.append(line)
+    return lines
+
+
+def balance(data: Dict[str, Any]) -> Dict[str, Any]:
+    """SALBP-1(target_uph / takt_time_sec) 또는 SALBP-2(station_count) 라인 밸런싱."""
+    t0 = time.perf_counter()
+    graph = _TaskGraph(data["processes"])
+    if graph.n == 0:
+        raise ValueError("processes가 비어 있습니다")
+    time_limit = float(data.get("time_limit_sec", DEFAULT_TIME_LIMIT_SEC))
+    exact_max = int(data.get("exact_max_tasks", DEFAULT_EXACT_MAX_TASKS))
+    exact = graph.n <= exact_max and time_limit > 0
+    deadline = t0 + time_limit
+
+    station_count = data.get("station_count")
+    if station_count is not None:
+        station_count = int(station_count)
+        if station_count < 1:
+            raise ValueError("station_count는 1 이상이어야 합니다")
+        problem = "SALBP-2"
+        cycle, info, optimal = _solve_salbp2(graph, station_count, deadline, exact)
+        target_uph = None
+    else:
+        if data.get("takt_time_sec") is not None:
+            cycle = float(data["takt_time_sec"])
+        elif data.get("target_uph") is not None:
+            if float(data["target_uph"]) <= 0:
+                raise ValueError("target_uph must be positive")
+            cycle = 3600.0 / float(data["target_uph"])
+        else:
+            raise KeyError("target_uph, takt_time_sec, station_count 중 하나가 필요합니다")
+        if cycle <= 0:
+            raise ValueError("takt_time_sec must be positive")
+        problem = "SALBP-1"
+        info = _solve_salbp1(graph, cycle, deadline, exact)
+        optimal = info["optimal"]
+        target_uph = data.get("target_uph")
+
+    stations = info["stations"]
+    summary_rows, processes = _station_processes(graph, stations, cycle)
+    num_stations = _cost(graph, stations, cycle)
+    eff_ct = _effective_cycle(graph, stations, cycle)
+    total_work = sum(graph.times)
+    efficiency = total_work / (num_stations * eff_ct) * 100.0 if eff_ct > 0 else 0.0
+    smoothness = math.sqrt(sum((eff_ct - r["effective_ct_sec"]) ** 2 * r["parallel_count"]
+                               for r in summary_rows))
+    elapsed = time.perf_counter() - t0
+    log.info("[balance] %s: 작업 %d개 → 스테이션 %d (사이클 %.2fs, 효율 %.1f%%, %s, %.2fs)",
+             problem, graph.n, num_stations, eff_ct, efficiency,
+             "최적" if optimal else "휴리스틱/시간 제한", elapsed)
+
+    return {
+        "problem": problem,
+        "target_uph": target_uph,
+        "takt_time_sec": round(cycle, 4),
+        "station_count": station_count,
+        "stations": summary_rows,
+        "processes": processes,
+        "solver": {
+            "method": "branch_and_bound" if exact else "heuristic",
+            "optimal": bool(optimal),
+            "heuristic_rule": info["heuristic_rule"],
+            "heuristic_stations": info["heuristic_stations"],
+            "lower_bound": _lower_bound(graph, graph.full, cycle, _oversized(graph, cycle)),
+            "nodes": info["nodes"],
+            "timed_out": info["timed_out"],
+            "time_limit_sec": time_limit,
+            "elapsed_sec": round(elapsed, 4),
+        },
+        "summary": {
+            "num_tasks": graph.n,
+            "current_stations": sum(int(p.get("parallel_count", 1)) for p in graph.processes),
+            "num_stations": num_stations,
+            "cycle_time_sec": round(eff_ct, 4),
+            "achieved_uph": round(3600.0 / eff_ct, 2) if eff_ct > 0 else 0.0,
+            "line_efficiency_pct": round(efficiency, 2),
+            "balance_delay_pct": round(100.0 - efficiency, 2),
+            "smoothness_index": round(smoothness, 4),
+        },
+    }
+
+
+def run(data: Dict[str, Any]) -> Dict[str, Any]:
+    """CLI/어댑터 진입점."""
+    return balance(data)
+
+
+# ── 어댑터 (pre_process / post_process) ───────────────────
+_PASSTHROUGH_PARAMS = ("takt_time_sec", "station_count", "time_limit_sec", "exact_max_tasks")
+
+
+def _details_by_process(bop_json: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    for d in bop_json.get("process_details") or []:
+        out.setdefault(d["process_id"], []).append(d)
+    for rows in out.values():
+        rows.sort(key=lambda d: d.get("parallel_index", 1))
+    return out
+
+
+def pre_process(bop_json: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """BOP JSON + params → 도구 입력 형태로 변환 (작업 시간/이름이 없으면 process_details에서 보충)."""
+    log.info("[pre_process] 호출됨")
+    log.info("[pre_process] bop_json 최상위 키: %s", list(bop_json.keys()))
+    log.info("[pre_process] params 키: %s", list(params.keys()))
+
+    processes = bop_json.get("processes")
+    if processes is None:
+        log.error("[pre_process] bop_json에 'processes' 키가 없습니다")
+        raise KeyError("bop_json에 'processes' 키가 없습니다")
+
+    details = _details_by_process(bop_json)
+    tasks: List[Dict[str, Any]] = []
+    for p in processes:
+        task = dict(p)
+        first = (details.get(p["process_id"]) or p.get("parallel_lines") or [{}])[0]
+        for key in ("name", "cycle_time_sec", "location"):
+            if task.get(key) is None and first.get(key) is not None:
+                task[key] = first[key]
+        if task.get("cycle_time_sec") is None:
+            log.error("[pre_process] 공정 %s의 cycle_time_sec를 찾을 수 없습니다", p["process_id"])
+            raise KeyError(f"공정 {p['process_id']}의 cycle_time_sec가 없습니다")
+        if "parallel_count" not in task and p["process_id"] in details:
+            task["parallel_count"] = len(details[p["process_id"]])
+        tasks.append(task)
+        log.debug("[pre_process]   작업 %s (%s): CT=%s, predecessors=%s",
+                  task["process_id"], task.get("name"), task["cycle_time_sec"],
+                  task.get("predecessor_ids"))
+    log.info("[pre_process] 추출된 작업 수: %d", len(tasks))
+
+    target_uph = params.get("target_uph", bop_json.get("target_uph"))
+    if target_uph is None and params.get("takt_time_sec") is None and params.get("station_count") is None:
+        log.error("[pre_process] params에 'target_uph' / 'takt_time_sec' / 'station_count' 키가 없습니다")
+        raise KeyError("params에 'target_uph' 키가 없습니다")
+    log.info("[pre_process] target_uph = %s", target_uph)
+
+    tool_input: Dict[str, Any] = {"processes": tasks, "target_uph": target_uph}
+    for key in _PASSTHROUGH_PARAMS:
+        if key in params:
+            tool_input[key] = params[key]
+            log.info("[pre_process] %s=%s", key, params[key])
+    log.info("[pre_process] 도구 입력 생성 완료 (작업 %d개)", len(tasks))
+    return tool_input
+
+
+def post_process(bop_json: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """밸런싱 결과로 BOP 공정을 스테이션 단위로 교체 + 메타데이터 첨부.
+
+    parallel_lines 구조의 BOP는 balance()가 스테이션별 parallel_lines를 이미 만들어 두었다.
+    process_details가 있는 BOP는 스테이션마다 parallel_index 1..parallel_count 행을 만들고(위치는
+    첫 작업의 행, 없으면 z축 PARALLEL_OFFSET_Z 간격), resource_assignments는 원래 공정 ID를
+    스테이션 ID로 바꾼다. 스테이션 병렬 수를 넘는 parallel_index의 할당은 제거한다.
+    """
+    log.info("[post_process] 호출됨")
+    log.info("[post_process] result 키: %s", list(result.keys()))
+
+    details = _details_by_process(bop_json)
+    station_of: Dict[str, Dict[str, Any]] = {}
+    for proc in result["processes"]:
+        for pid in proc["balanced_process_ids"]:
+            station_of[pid] = proc
+
+    if "process_details" in bop_json:
+        new_details: List[Dict[str, Any]] = []
+        for proc in result["processes"]:
+            first_rows = details.get(proc["balanced_process_ids"][0], [])
+            base = first_rows[0] if first_rows else {}
+            for idx in range(1, proc["parallel_count"] + 1):
+                row = next((d for d in first_rows if d.get("parallel_index") == idx), None)
+                detail = {k: v for k, v in (row or base).items()
+                          if k not in ("process_id", "parallel_index", "computed_size")}
+                if row is None and isinstance(base.get("location"), dict):
+                    loc = dict(base["location"])
+                    loc["z"] = loc.get("z", 0.0) + PARALLEL_OFFSET_Z * (idx - 1)
+                    detail["location"] = loc
+                detail.update({
+                    "process_id": proc["process_id"],
+                    "parallel_index": idx,
+                    "name": proc["name"],
+                    "description": proc["description"],
+                    "cycle_time_sec": proc["cycle_time_sec"],
+                })
+                new_details.append(detail)
+        bop_json["process_details"] = new_details
+        log.info("[post_process] process_details 재구성: %d행", len(new_details))
+
+    if "resource_assignments" in bop_json:
+        kept, dropped = [], 0
+        for ra in bop_json["resource_assignments"]:
+            proc = station_of.get(ra.get("process_id"))
+            if proc is None or ra.get("parallel_index", 1) > proc["parallel_count"]:
+                dropped += 1
+                continue
+            kept.append(dict(ra, process_id=proc["process_id"]))
+        bop_json["resource_assignments"] = kept
+        log.info("[post_process] resource_assignments 재매핑: %d개 유지, %d개 제거", len(kept), dropped)
+
+    if "process_details" in bop_json:
+        # 상세 정보는 process_details에 있으므로 processes에는 라우팅만 남긴다
+        bop_json["processes"] = [
+            {k: proc[k] for k in ("process_id", "parallel_count", "predecessor_ids", "successor_ids")}
+            for proc in result["processes"]
+        ]
+    else:
+        # parallel_lines 구조의 BOP는 이름/설명/CT/위치를 parallel_lines 안에만 둔다
+        line_keys = ("name", "description", "cycle_time_sec", "location")
+        bop_json["processes"] = [
+            {k: v for k, v in proc.items()
+             if k != "balanced_process_ids" and not ("parallel_lines" in proc and k in line_keys)}
+            for proc in result["processes"]
+        ]
+    log.info("[post_process] BOP 공정 교체: %d → %d 스테이션 (%s)",
+             len(station_of), len(bop_json["processes"]), result["problem"])
+
+    bop_json["_line_balancing"] = {k: v for k, v in result.items() if k != "processes"}
+    log.info("[post_process] bop_json['_line_balancing'] 키 첨부 완료")
+    log.debug("[post_process] 첨부된 summary: %s", result.get("summary"))
+    return bop_json
+
+
+# ── CLI ───────────────────────────────────────────────────
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Line Balancer — 작업-스테이션 할당 (SALBP-1/2)")
+    parser.add_argument("--input", required=True, help="입력 JSON 파일 경로")
+    parser.add_argument("--output", required=True, help="출력 JSON 파일 경로")
+    parser.add_argument("--log-level", default="DEBUG",
+                        help="로그 레벨 (DEBUG|INFO|WARNING|ERROR, default: DEBUG)")
+    parser.add_argument("--station-count", type=int, default=None,
+                        help="SALBP-2: 주어진 스테이션 수에서 사이클 타임 최소화")
+    parser.add_argument("--time-limit", type=float, default=None,
+                        help=f"분기한정 시간 제한 (초, default: {DEFAULT_TIME_LIMIT_SEC:g})")
+    args, _unknown = parser.parse_known_args()
+
+    level = getattr(logging, args.log_level.upper(), None)
+    if level is None:
+        level = logging.DEBUG
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        stream=sys.stderr,
+    )
+
+    log.info("[CLI] 입력 파일: %s", args.input)
+    with open(args.input, encoding="utf-8") as f:
+        data = json.load(f)
+    log.info("[CLI] 입력 JSON 로드 완료 (키: %s)", list(data.keys()))
+
+    if args.station_count is not None:
+        data["station_count"] = args.station_count
+    if args.time_limit is not None:
+        data["time_limit_sec"] = args.time_limit
+    result = run(data)
+    log.info("[CLI] run() 완료 — summary: %s", result.get("summary"))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    log.info("[CLI] 출력 파일 저장 완료: %s", args.output)
+
+
+if __name__ == "__main__":
+    main()
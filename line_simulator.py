@@ -6,21 +6,208 @@ line_simulator.py — 결정적 이산 시뮬레이션 기반 라인 분석 도
 DAG 위상정렬로 공정 순서를 결정하고, 제품을 순차 투입하여
 각 공정의 병렬 서버(parallel_count)에 배정하며 시뮬레이션한다.
 
+엔진 (입력 JSON의 "engine" 키):
+    sequential  제품 단위 순차 계산 (기본값)
+    event       이벤트 힙 + 공정별 유휴 서버 힙 기반 이산 사건 시뮬레이션
+                (유한 버퍼의 정체/대기 상호작용을 실제로 모델링)
+    maxplus     결정적 CT의 max-plus 점화식을 NumPy로 블록 단위 벡터화 계산
+                (버퍼 무한 가정, numpy 필요)
+    parallel    DAG를 가지(branch) 부분 그래프로 나눠 작업 프로세스에서 제품 chunk 단위로
+                진행하는 보수적 병렬 sequential (결과는 sequential과 동일, 확률적 CT는 CRN 필요)
+
+확률적 CT: 공정별 "cycle_time_dist"(normal/lognormal/triangular, 평균 = cycle_time_sec)
+또는 최상위 기본 분포를 지정하고 "n_replications" > 1이면 독립 시드 스트림으로
+ProcessPoolExecutor 병렬 반복 후 평균/신뢰구간을 "replications" 블록에 보고한다.
+
+버퍼 용량: 공정별 "buffer_capacity"(입력 대기열 용량, 기본 parallel_count * 2)로 정체 조건을 정한다.
+"mode": "optimize_buffers" + "target_uph"(+ 선택 "total_buffer")는 탐욕적 증감 탐색을 병렬 배치 평가와
+메모 캐시로 수행해 목표 UPH를 만족하는 최소 버퍼 배분을 반환한다.
+
+민감도 분석: "mode": "sensitivity"이면 공정별로 CT를 sensitivity_ct_step(기본 5%) 줄인 variant와
+병렬 수를 1 늘린 variant를 한 번의 배치로 평가해 dUPH/dCT, CT 탄력성, 서버 추가 효과의 순위표를 반환한다.
+
+공통 난수(CRN): "common_random_numbers": true이면 공정별 전용 난수열에서 미리 생성한 균등난수
+블록을 역변환해 CT를 뽑으므로, 같은 seed/반복 번호의 시나리오끼리 같은 난수를 공유한다.
+compare(base, variant) 또는 "mode": "compare" + "variant"({"overrides": ...})는 반복별 쌍대 차이의
+신뢰구간을 보고한다.
+
+해석적 추정: "mode": "analytic"이면 시뮬레이션 없이 용량 상한(CT/병렬 수), DAG 임계 경로,
+폐쇄 대기행렬망 MVA 근사로 처리량/부하율/대기 시간을 즉시 추정한다 (estimate()).
+
+배치 스윕: "mode": "batch" + "variants"(공정별 overrides 목록) 또는
+"grid"({"P001": {"parallel_count": [1, 2, 3]}}) → simulate_batch()가 한 번의 호출로
+모든 조합을 병렬 평가하여 columns/rows 형태의 결과 표를 반환한다.
+
+적응형 실행 길이: "adaptive": true이면 num_products 대신 배치 평균 처리량의
+상대 CI 반폭이 target_rel_half_width 미만이 될 때까지 제품을 투입하고 실제 사용한 제품 수를
+simulation_summary.adaptive에 보고한다 (sequential 엔진).
+
+타임라인: "timeline_window_sec"를 지정하면 공정별 작업/대기/정체 초와 최대 대기열 길이를
+해당 시간 구간 단위로 실행 중에 누적해 "timeline" 블록에 보고한다 (sequential 엔진).
+
+워밍업 자동 절단: "warmup_products": "auto"이면 제품별 완료 간격 계열에
+MSER-5를 적용해 절단점을 정하고 simulation_summary.warmup_detection에 보고한다.
+
+트레이스: iter_trace()/--trace는 제품×공정별 시작/완료/대기/정체 기록을 진행 중에
+NDJSON으로 스트리밍한다. 기본 모드는 제품별 기록을 보관하지 않는다 (공정 수에 비례한 상태만 유지).
+
+증분 재시뮬레이션: LineSimulation(data).run() 후 update_process()로 공정 CT/병렬 수를
+바꾸면 변경 공정의 하류 영역만 가장 가까운 체크포인트부터 다시 계산한다.
+
+이벤트 로그 재생: "mode": "replay" + "event_log"(--replay)는 실측 공정 시작/완료 이벤트(CSV/NDJSON,
+timestamp/process_id/event 열)를 한 줄씩 읽어 BOP 라인 모델(버퍼 용량, 합류)에 흘리며 부하/대기/정체를
+증분 누적한다 (replay()). 정체는 버퍼 모델로 추론하며 메모리는 공정 수에만 비례한다.
+
+분산 반복 실험: "coordinator_address"(--serve HOST:PORT)를 지정하면 반복 번호를 HTTP 작업으로 제공하고
+상태 없는 워커(--worker http://HOST:PORT)가 가져가 실행한 요약/공정 분석을 gzip JSON으로 돌려준다.
+lease_sec(기본 120초) 안에 결과가 없는 작업은 재할당하므로 워커가 중간에 사라져도 완료된다 (표준 라이브러리만 사용).
+코디네이터는 기본적으로 루프백(HOST 생략 시 127.0.0.1)에만 바인딩하며, 외부 주소(0.0.0.0 등) 바인딩은
+"allow_remote_workers": true(--allow-remote-workers)로 명시해야 한다. 워커는 받은 입력을 검증하고
+파일 경로/부수 효과 키(체크포인트, 이벤트 로그, 코디네이터 설정)를 제거한 뒤 실행한다.
+
+프로파일링: "profile": true 또는 --profile이면 단계(topology/validate/simulate/aggregate/cache)별
+wall/CPU 시간과 이벤트 수(products, station_steps, events)를 "timings" 블록에 첨부한다.
+계측은 비활성 시 호출당 None 검사 한 번만 하며, --profile-out은 cProfile 통계를 저장한다.
+
+결과 캐시: run(data, cache=ResultCache(...))는 정규화 입력 해시(input_key)가 같으면
+메모리 LRU 또는 디스크(--cache-dir, 크기 제한)에 저장된 결과를 바로 반환한다.
+
+체크포인트/재개: "checkpoint_path"(--checkpoint)를 지정하면 sequential 단일 실행의 상태 배열과
+진행 제품 수, RNG 상태를 checkpoint_interval_sec(기본 5초)마다 메모리 매핑 파일에 기록하고,
+"resume": true(--resume)이면 같은 입력의 최신 스냅샷부터 이어서 계산한다 (결과는 중단 없는 실행과 동일).
+
 Usage:
     python line_simulator.py --input input.json --output output.json
     python line_simulator.py --input input.json --output output.json --log-level DEBUG
+    python line_simulator.py --input input.json --output output.json --profile --profile-out sim.pstats
+    python line_simulator.py --input input.json --output output.json --trace trace.ndjson.gz
+    python line_simulator.py --input input.json --output output.json --cache-dir data/simulation_cache
+    python line_simulator.py --input input.json --output output.json --checkpoint run.ckpt --resume
+    python line_simulator.py --input input.json --output output.json --replay events.csv.gz
+    python line_simulator.py --input input.json --output output.json --serve 0.0.0.0:8765 --allow-remote-workers
+    python line_simulator.py --worker http://coordinator-host:8765
 """
 
 import argparse
 import collections
+import concurrent.futures
+import contextlib
+import copy
+import cProfile
+import csv
+import datetime
+import functools
+import hashlib
+import heapq
+import http.server
+import io
+import ipaddress
+import itertools
+import gzip
 import json
 import logging
+import math
+import mmap
+import multiprocessing
+import os
+import pstats
+import queue
+import random
+import statistics
+import struct
 import sys
-from typing import Any, Dict, List
+import threading
+import time
+import traceback
+import urllib.request
+import zlib
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 log = logging.getLogger("line_simulator")
 
 
+# ── 프로파일링 (단계별 시간) ──────────────────────────────
+class _Timings:
+    """단계별 벽시계/CPU 시간과 이벤트 수 누적 ("profile": true일 때만 활성).
+
+    단계는 중첩될 수 있으며 각 단계에는 하위 단계를 뺀 자기 시간(self time)을 기록하므로
+    단계 합계가 전체 시간과 같다. 반복 실험/배치를 프로세스 풀로 돌리면 워커 내부 시간은
+    "simulate" 단계의 대기 시간으로 잡힌다.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, List[float]] = {}
+        self.counts: Dict[str, int] = collections.Counter()
+        self._stack: List[List[float]] = []
+        self._start = (time.perf_counter(), time.process_time())
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        frame = [0.0, 0.0]  # 하위 단계 wall/cpu 합
+        self._stack.append(frame)
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.process_time() - cpu0
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += wall
+                self._stack[-1][1] += cpu
+            entry = self.phases.setdefault(name, [0.0, 0.0, 0])
+            entry[0] += wall - frame[0]
+            entry[1] += cpu - frame[1]
+            entry[2] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        total_wall = time.perf_counter() - self._start[0]
+        return {
+            "total_wall_sec": round(total_wall, 6),
+            "total_cpu_sec": round(time.process_time() - self._start[1], 6),
+            "unattributed_wall_sec": round(total_wall - sum(w for w, _c, _n in self.phases.values()), 6),
+            "phases": {
+                name: {"wall_sec": round(wall, 6), "cpu_sec": round(cpu, 6), "calls": calls}
+                for name, (wall, cpu, calls) in self.phases.items()
+            },
+            "counts": dict(self.counts),
+        }
+
+
+# 현재 프로파일 중인 실행의 _Timings (비활성이면 None → 계측 비용 없음)
+_timings: Optional[_Timings] = None
+
+
+def _phase(name: str):
+    return _timings.phase(name) if _timings is not None else contextlib.nullcontext()
+
+
+def _timed_phase(name: str):
+    """함수 전체를 한 단계로 계측하는 데코레이터 (비활성 시 바로 호출)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _timings is None:
+                return fn(*args, **kwargs)
+            with _timings.phase(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _count(name: str, n: int = 1) -> None:
+    if _timings is not None:
+        _timings.counts[name] += n
+
+
 # ── DAG 위상정렬 ──────────────────────────────────────────
 def topological_sort(processes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """predecessor_ids 기반 Kahn 알고리즘 위상정렬."""
@@ -50,186 +237,3180 @@ def topological_sort(processes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return ordered
 
 
-# ── 시뮬레이션 엔진 ───────────────────────────────────────
-def simulate(data: Dict[str, Any]) -> Dict[str, Any]:
-    """결정적 이산 시뮬레이션 실행."""
-    processes = data["processes"]
-    num_products: int = data.get("num_products", 100)
-    warmup_products: int = data.get("warmup_products", 10)
+# ── 라인 토폴로지 ─────────────────────────────────────────
+@dataclass
+class _LineTopology:
+    """위상정렬 순서와 정수 인덱스 기반 선후행 맵 (엔진 간 공유)."""
+    ordered: List[Dict[str, Any]]
+    proc_ids: List[str]
+    proc_index: Dict[str, int]
+    pred_idx: List[List[int]]
+    succ_idx: List[List[int]]
+
+    @property
+    def num_procs(self) -> int:
+        return len(self.ordered)
 
-    if num_products <= warmup_products:
-        raise ValueError("num_products must be greater than warmup_products")
 
+@_timed_phase("topology")
+def _build_topology(processes: List[Dict[str, Any]]) -> _LineTopology:
+    """위상정렬 후 공정 ID를 정수 인덱스로 치환한 선후행 맵을 구성."""
     ordered = topological_sort(processes)
-    num_procs = len(ordered)
     proc_ids = [p["process_id"] for p in ordered]
     proc_index = {pid: i for i, pid in enumerate(proc_ids)}
 
-    cycle_times = [float(p["cycle_time_sec"]) for p in ordered]
-    parallel_counts = [int(p.get("parallel_count", 1)) for p in ordered]
-    queue_capacities = [pc * 2 for pc in parallel_counts]
+    pred_idx = [[proc_index[pred] for pred in p.get("predecessor_ids", [])] for p in ordered]
+    succ_idx: List[List[int]] = [[] for _ in ordered]
+    for p in processes:
+        for pred_id in p.get("predecessor_ids", []):
+            succ_idx[proc_index[pred_id]].append(proc_index[p["process_id"]])
+
+    return _LineTopology(ordered, proc_ids, proc_index, pred_idx, succ_idx)
+
+
+def _queue_capacities(ordered: List[Dict[str, Any]], parallel_counts: List[int]) -> List[int]:
+    """공정별 입력 버퍼 용량: 공정의 "buffer_capacity", 없으면 parallel_count * 2."""
+    return [int(p.get("buffer_capacity", pc * 2)) for p, pc in zip(ordered, parallel_counts)]
+
+
+# ── 확률적 사이클 타임 ────────────────────────────────────
+def _make_sampler(mean: float, dist: Optional[Dict[str, Any]], rng: random.Random):
+    """cycle_time_dist 정의 → 평균이 cycle_time_sec인 난수 생성 함수 (없으면 None).
+
+    지원 분포:
+        {"type": "normal", "std": 5}          또는 {"type": "normal", "cv": 0.1}
+        {"type": "lognormal", "cv": 0.1}      또는 {"type": "lognormal", "std": 5}
+        {"type": "triangular", "min": 50, "max": 80, "mode": 60}  (mode 기본값 = CT)
+    """
+    if not dist:
+        return None
+
+    kind = dist.get("type", "normal")
+    if kind in ("normal", "lognormal"):
+        std = float(dist["std"]) if "std" in dist else mean * float(dist.get("cv", 0.1))
+        if std <= 0 or mean <= 0:
+            return None
+        if kind == "normal":
+            gauss = rng.gauss
+            return lambda: max(gauss(mean, std), 0.0)
+        sigma2 = math.log(1.0 + (std / mean) ** 2)
+        mu = math.log(mean) - sigma2 / 2.0
+        sigma = math.sqrt(sigma2)
+        lognorm = rng.lognormvariate
+        return lambda: lognorm(mu, sigma)
+    if kind == "triangular":
+        low = float(dist["min"])
+        high = float(dist["max"])
+        mode = float(dist.get("mode", mean))
+        tri = rng.triangular
+        return lambda: tri(low, high, mode)
+    raise ValueError(f"알 수 없는 cycle_time_dist type: {kind}")
+
+
+def _inverse_cdf(mean: float, dist: Optional[Dict[str, Any]]):
+    """cycle_time_dist 정의 → 균등난수 u ∈ (0, 1)를 CT로 바꾸는 역변환 함수 (없으면 None).
+
+    분포 해석은 _make_sampler와 같다. 공통 난수(CRN)에서 시나리오 간 CT가 바뀌어도
+    같은 u가 같은 분위수에 대응하도록 역변환을 사용한다.
+    """
+    if not dist:
+        return None
+
+    kind = dist.get("type", "normal")
+    if kind in ("normal", "lognormal"):
+        std = float(dist["std"]) if "std" in dist else mean * float(dist.get("cv", 0.1))
+        if std <= 0 or mean <= 0:
+            return None
+        inv = statistics.NormalDist().inv_cdf
+        if kind == "normal":
+            return lambda u: max(mean + std * inv(u), 0.0)
+        sigma2 = math.log(1.0 + (std / mean) ** 2)
+        mu = math.log(mean) - sigma2 / 2.0
+        sigma = math.sqrt(sigma2)
+        return lambda u: math.exp(mu + sigma * inv(u))
+    if kind == "triangular":
+        low = float(dist["min"])
+        high = float(dist["max"])
+        mode = float(dist.get("mode", mean))
+        span = high - low
+        split = (mode - low) / span if span > 0 else 0.5
+
+        def tri(u: float) -> float:
+            if u < split:
+                return low + math.sqrt(u * span * (mode - low))
+            return high - math.sqrt((1.0 - u) * span * (high - mode))
+        return tri
+    raise ValueError(f"알 수 없는 cycle_time_dist type: {kind}")
+
+
+_CRN_BLOCK = 1024
+
+
+def _crn_sampler(transform: Callable[[float], float], rng: random.Random, skip: int = 0):
+    """공정 전용 난수열에서 _CRN_BLOCK개씩 미리 생성한 균등난수 블록을 CT로 변환해 공급.
+
+    skip개의 균등난수는 변환 없이 건너뛴다 (체크포인트 재개 시 이미 소비한 CT).
+    """
+    def stream() -> Iterator[float]:
+        uniform = rng.random
+        for _ in range(skip):
+            uniform()
+        while True:
+            block = [transform(min(max(uniform(), 1e-12), 1.0 - 1e-12)) for _ in range(_CRN_BLOCK)]
+            yield from block
+    return stream().__next__
+
+
+def _cycle_time_samplers(data: Dict[str, Any], topo: _LineTopology,
+                         rng: Optional[random.Random], skip: int = 0) -> List[Any]:
+    """공정별 CT 샘플러 목록 (결정적 공정은 None). 공정에 분포가 없으면 data의 기본 분포 사용.
+
+    "common_random_numbers"가 참이면 공정마다 (반복 시드, process_id)로 정해지는 독립 난수열을
+    두어, 같은 seed/반복 번호의 시나리오끼리 공정별 k번째 CT 난수를 공유한다 (공통 난수).
+    skip은 공통 난수열에서 공정별로 건너뛸 표본 수이다 (sequential 엔진은 제품당 공정별 1회 추출).
+    """
+    default_dist = data.get("cycle_time_dist")
+    dists = [p.get("cycle_time_dist", default_dist) for p in topo.ordered]
+    if rng is None:
+        return [None] * topo.num_procs
+    if not data.get("common_random_numbers"):
+        return [_make_sampler(float(p["cycle_time_sec"]), d, rng) for p, d in zip(topo.ordered, dists)]
+
+    base = rng.getrandbits(64)
+    samplers: List[Any] = []
+    for p, d in zip(topo.ordered, dists):
+        transform = _inverse_cdf(float(p["cycle_time_sec"]), d)
+        if transform is None:
+            samplers.append(None)
+            continue
+        digest = hashlib.sha256(f"{base}:{p['process_id']}".encode()).digest()
+        samplers.append(_crn_sampler(transform, random.Random(int.from_bytes(digest[:8], "big")), skip))
+    return samplers
+
+
+def _validate_dist(proc: Dict[str, Any], default_dist: Optional[Dict[str, Any]]) -> None:
+    """triangular 분포의 min <= mode <= max 검사 (mode 생략 시 mode = cycle_time_sec)."""
+    dist = proc.get("cycle_time_dist", default_dist)
+    if not dist or dist.get("type", "normal") != "triangular":
+        return
+    low, high = float(dist["min"]), float(dist["max"])
+    if "mode" in dist:
+        mode, what = float(dist["mode"]), "mode"
+    else:
+        mode, what = float(proc["cycle_time_sec"]), "mode 기본값 cycle_time_sec"
+    if not low <= mode <= high:
+        raise ValueError(f"triangular cycle_time_dist의 {what}({mode:g})가 "
+                         f"[min, max] = [{low:g}, {high:g}] 범위 밖입니다 ({proc['process_id']})")
+
+
+def _is_stochastic(data: Dict[str, Any]) -> bool:
+    return bool(data.get("cycle_time_dist")) or any(
+        p.get("cycle_time_dist") for p in data["processes"])
+
+
+def _replication_seed(seed: int, replication: int) -> int:
+    """(seed, replication) → 독립 난수 스트림용 64비트 시드."""
+    digest = hashlib.sha256(f"{seed}:{replication}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+# ── 결과 집계 ─────────────────────────────────────────────
+@_timed_phase("aggregate")
+def _summarize(
+    topo: _LineTopology,
+    parallel_counts: List[int],
+    working: List[float],
+    starving: List[float],
+    blocking: List[float],
+    total_wait: List[float],
+    wait_count: List[int],
+    max_queue: List[int],
+    num_products: int,
+    warmup_products: int,
+    total_time: float,
+    engine: str,
+) -> Dict[str, Any]:
+    """공정별 누적 시간 → simulation_summary / process_analysis 스키마."""
+    num_procs = topo.num_procs
+    measured_products = num_products - warmup_products
+    throughput_uph = (measured_products / total_time * 3600.0) if total_time > 0 else 0.0
 
-    servers = [[0.0] * parallel_counts[i] for i in range(num_procs)]
-    queue_lengths = [0] * num_procs
+    process_analysis: List[Dict[str, Any]] = []
+    total_utilization = 0.0
 
-    stats_working = [[0.0] * parallel_counts[i] for i in range(num_procs)]
-    stats_starving = [[0.0] * parallel_counts[i] for i in range(num_procs)]
-    stats_blocking = [[0.0] * parallel_counts[i] for i in range(num_procs)]
-    stats_max_queue = [0] * num_procs
-    stats_total_wait = [0.0] * num_procs
-    stats_wait_count = [0] * num_procs
+    for step_idx in range(num_procs):
+        proc = topo.ordered[step_idx]
 
-    successors: Dict[str, List[str]] = {p["process_id"]: [] for p in processes}
-    for p in processes:
-        for pred_id in p.get("predecessor_ids", []):
-            successors[pred_id].append(p["process_id"])
+        total_working = working[step_idx]
+        total_starving_time = starving[step_idx]
+        total_blocking_time = blocking[step_idx]
 
-    product_finish: List[Dict[str, float]] = []
-    measure_start_time = None
-    measure_end_time = None
+        total_observed = total_working + total_starving_time + total_blocking_time
+        if total_observed > 0:
+            util_pct = (total_working / total_observed) * 100.0
+            starv_pct = (total_starving_time / total_observed) * 100.0
+            block_pct = (total_blocking_time / total_observed) * 100.0
+        else:
+            util_pct = 0.0
+            starv_pct = 0.0
+            block_pct = 0.0
 
-    for prod_idx in range(num_products):
-        prod_finish: Dict[str, float] = {}
-        is_measured = prod_idx >= warmup_products
+        avg_wait = (
+            total_wait[step_idx] / wait_count[step_idx]
+            if wait_count[step_idx] > 0
+            else 0.0
+        )
+
+        process_analysis.append({
+            "process_id": proc["process_id"],
+            "name": proc.get("name", ""),
+            "cycle_time_sec": float(proc["cycle_time_sec"]),
+            "parallel_count": parallel_counts[step_idx],
+            "utilization_pct": round(util_pct, 2),
+            "starving_pct": round(starv_pct, 2),
+            "blocking_pct": round(block_pct, 2),
+            "avg_wait_time_sec": round(avg_wait, 2),
+            "max_queue_length": max_queue[step_idx],
+        })
+        total_utilization += util_pct
+
+    avg_utilization = total_utilization / num_procs if num_procs > 0 else 0.0
+
+    return {
+        "simulation_summary": {
+            "engine": engine,
+            "total_products": num_products,
+            "warmup_products": warmup_products,
+            "measured_products": measured_products,
+            "total_time_sec": round(total_time, 2),
+            "throughput_uph": round(throughput_uph, 2),
+            "avg_utilization_pct": round(avg_utilization, 2),
+        },
+        "process_analysis": process_analysis,
+    }
 
-        for step_idx in range(num_procs):
-            proc = ordered[step_idx]
-            pid = proc["process_id"]
-            ct = cycle_times[step_idx]
-            preds = proc.get("predecessor_ids", [])
 
-            if preds:
-                earliest_arrival = max(prod_finish[pred] for pred in preds)
+# ── 시간 구간별 타임라인 ──────────────────────────────────
+class _Timeline:
+    """window_sec 단위 시간 구간 × 공정별 작업/대기/정체 초와 최대 대기열 길이 누적기.
+
+    값은 구간 순서대로 공정 수만큼씩 이어 붙인 평탄 배열(구간 k, 공정 j → k * num_procs + j)에
+    두고, 시뮬레이션 시각이 새 구간에 도달하면 구간 행을 덧붙인다. 메모리는
+    O(총 시간 / window_sec × 공정 수)로 제품 수와 무관하며 트레이스를 보관하지 않는다.
+    sequential 엔진은 제품 순서로 진행하므로 시각이 단조 증가하지 않아도 된다.
+    """
+
+    def __init__(self, window_sec: float, num_procs: int):
+        self.window = float(window_sec)
+        self.num_procs = num_procs
+        self.num_windows = 0
+        self.working = array("d")
+        self.starving = array("d")
+        self.blocking = array("d")
+        self.max_queue = array("q")
+
+    def _grow(self, windows: int) -> None:
+        extra = (windows - self.num_windows) * self.num_procs
+        zeros = bytes(8 * extra)
+        self.working.frombytes(zeros)
+        self.starving.frombytes(zeros)
+        self.blocking.frombytes(zeros)
+        self.max_queue.frombytes(zeros)
+        self.num_windows = windows
+
+    def add(self, values: Any, j: int, begin: float, end: float) -> None:
+        """[begin, end) 구간 길이를 겹치는 시간 구간에 나누어 더한다."""
+        if end <= begin:
+            return
+        window = self.window
+        n = self.num_procs
+        first = int(begin // window)
+        last = int(end // window)
+        if end == last * window:
+            last -= 1
+        if last >= self.num_windows:
+            self._grow(last + 1)
+        if first == last:
+            values[first * n + j] += end - begin
+            return
+        values[first * n + j] += (first + 1) * window - begin
+        for k in range(first + 1, last):
+            values[k * n + j] += window
+        values[last * n + j] += end - last * window
+
+    def queue(self, j: int, at: float, length: int) -> None:
+        k = int(at // self.window)
+        if k >= self.num_windows:
+            self._grow(k + 1)
+        idx = k * self.num_procs + j
+        if length > self.max_queue[idx]:
+            self.max_queue[idx] = length
+
+    def to_dict(self, proc_ids: List[str]) -> Dict[str, Any]:
+        """공정별 시계열 (구간 k는 [k * window_sec, (k + 1) * window_sec))."""
+        n = self.num_procs
+        processes = []
+        for j, pid in enumerate(proc_ids):
+            processes.append({
+                "process_id": pid,
+                "working_sec": [round(v, 2) for v in self.working[j::n]],
+                "starving_sec": [round(v, 2) for v in self.starving[j::n]],
+                "blocking_sec": [round(v, 2) for v in self.blocking[j::n]],
+                "max_queue_length": list(self.max_queue[j::n]),
+            })
+        return {
+            "window_sec": self.window,
+            "num_windows": self.num_windows,
+            "processes": processes,
+        }
+
+
+def _make_timeline(data: Dict[str, Any], num_procs: int) -> Optional[_Timeline]:
+    window = data.get("timeline_window_sec")
+    return _Timeline(float(window), num_procs) if window else None
+
+
+# ── 시뮬레이션 엔진: sequential ───────────────────────────
+class _SequentialState:
+    """sequential 엔진의 공정별 가변 상태 (체크포인트 단위).
+
+    서버별 값(가용 시각, 작업/대기/정체 누적)은 공정 순서대로 이어 붙인 평탄한 array('d')에
+    두고 offsets[j]..offsets[j] + counts[j] 구간으로 접근한다 (struct-of-arrays).
+    공정 수가 수천 개여도 서버당 8바이트씩만 차지하고 공정별 리스트 객체를 만들지 않는다.
+    """
+
+    def __init__(self, parallel_counts: List[int]):
+        num_procs = len(parallel_counts)
+        self._layout(parallel_counts)
+        total = self.offsets[num_procs]
+        self.servers = array("d", bytes(8 * total))
+        self.working = array("d", bytes(8 * total))
+        self.starving = array("d", bytes(8 * total))
+        self.blocking = array("d", bytes(8 * total))
+        self.queue_lengths = array("q", bytes(8 * num_procs))
+        self.max_queue = array("q", bytes(8 * num_procs))
+        self.total_wait = array("d", bytes(8 * num_procs))
+        self.wait_count = array("q", bytes(8 * num_procs))
+        # 정체 검사 시 대기열이 용량에 도달한 적이 있는 공정 (대기열 계수는 시간과 무관)
+        self.saturated = bytearray(num_procs)
+        self.measure_start = 0.0
+        self.measure_end = 0.0
+
+    def _layout(self, parallel_counts: List[int]) -> None:
+        self.counts = array("q", parallel_counts)
+        self.offsets = array("q", itertools.accumulate(parallel_counts, initial=0))
+
+    def station(self, values: Any, j: int) -> Any:
+        """서버별 평탄 배열에서 공정 j 구간."""
+        return values[self.offsets[j]:self.offsets[j + 1]]
+
+    def station_totals(self, values: Any) -> List[float]:
+        """서버별 평탄 배열 → 공정별 합계."""
+        offsets = self.offsets
+        return [sum(values[offsets[j]:offsets[j + 1]]) for j in range(len(self.counts))]
+
+    def relayout(self, parallel_counts: List[int]) -> None:
+        """병렬 수 변경 시 서버별 배열을 새 배치로 옮긴다 (서버 수가 바뀐 공정은 0으로 초기화)."""
+        old_counts, old_offsets = self.counts, self.offsets
+        self._layout(parallel_counts)
+        total = self.offsets[len(parallel_counts)]
+        for name in ("servers", "working", "starving", "blocking"):
+            old = getattr(self, name)
+            new = array("d", bytes(8 * total))
+            for j, pc in enumerate(parallel_counts):
+                if old_counts[j] == pc:
+                    new[self.offsets[j]:self.offsets[j + 1]] = old[old_offsets[j]:old_offsets[j + 1]]
+            setattr(self, name, new)
+
+    def copy_steps(self, src: "_SequentialState", steps) -> None:
+        """src의 지정 공정 상태를 복사 (saturated는 누적 플래그라 제외). 두 상태의 배치는 같아야 한다."""
+        offsets = self.offsets
+        for j in steps:
+            lo, hi = offsets[j], offsets[j + 1]
+            self.servers[lo:hi] = src.servers[lo:hi]
+            self.working[lo:hi] = src.working[lo:hi]
+            self.starving[lo:hi] = src.starving[lo:hi]
+            self.blocking[lo:hi] = src.blocking[lo:hi]
+            self.queue_lengths[j] = src.queue_lengths[j]
+            self.max_queue[j] = src.max_queue[j]
+            self.total_wait[j] = src.total_wait[j]
+            self.wait_count[j] = src.wait_count[j]
+
+
+def _sequential_advance(
+    state: _SequentialState,
+    plan: List[tuple],
+    pred_idx: List[List[int]],
+    cycle_times: List[float],
+    samplers: List[Any],
+    queue_capacities: List[int],
+    products: range,
+    warmup_products: int,
+    num_products: int,
+    rows: Optional[List[Any]] = None,
+    trace: Optional[Callable[[tuple], Any]] = None,
+    releases: Optional[Any] = None,
+    completions: Optional[Any] = None,
+    timeline: Optional[_Timeline] = None,
+    inbound: Optional[List[tuple]] = None,
+    outbound: Optional[List[tuple]] = None,
+) -> None:
+    """products 구간의 제품을 plan 순서(위상정렬)로 통과시키며 state를 갱신.
+
+    plan 항목은 (공정 인덱스, 시간 계산 여부, 대기열을 증가시킬 후속 공정 목록).
+    시간 계산을 하지 않는 항목은 증분 재시뮬레이션에서 재계산 대상의 대기열 계수만 맞춘다.
+    rows가 주어지면 제품별 완료 시각 행을 읽고/기록한다 (미계산 공정은 기존 값 사용).
+    trace가 주어지면 공정 통과마다
+    (제품, 공정 인덱스, 서버, 시작, 완료, 대기, 정체) 튜플로 호출한다.
+    releases/completions가 주어지면 제품별 투입(첫 공정 시작)/완료 시각을 덧붙인다.
+    timeline이 주어지면 워밍업을 포함한 모든 통과의 작업/대기/정체 구간과 대기열 길이를 누적한다.
+    inbound/outbound는 parallel 엔진의 분할 경계로, [(공정 인덱스, 제품별 완료 시각 배열)] 형태이다.
+    제품마다 inbound 값(배열 인덱스 = 제품 - products.start)을 prod_finish에 채우고,
+    통과 후 outbound 공정의 완료 시각을 배열에 덧붙인다.
+    """
+    servers = state.servers
+    queue_lengths = state.queue_lengths
+    stats_working = state.working
+    stats_starving = state.starving
+    stats_blocking = state.blocking
+    stats_max_queue = state.max_queue
+    stats_total_wait = state.total_wait
+    stats_wait_count = state.wait_count
+    saturated = state.saturated
+    num_procs = len(cycle_times)
+    last_product = num_products - 1
+
+    # 공정별 상수를 루프 밖에서 한 번만 풀어 둔다: (공정, 시간 계산 여부, 단일 선행 공정(-1이면 없음/복수),
+    # 선행 공정, 서버 구간 시작/끝, 후속 공정 [(인덱스, 구간 시작/끝, 용량)])
+    offsets = state.offsets
+    steps = [
+        (j, timed, pred_idx[j][0] if len(pred_idx[j]) == 1 else -1, tuple(pred_idx[j]),
+         offsets[j], offsets[j + 1],
+         tuple((s, offsets[s], offsets[s + 1], queue_capacities[s]) for s in succ_steps))
+        for j, timed, succ_steps in plan
+    ]
+    shared_finish = [0.0] * num_procs
+    _count("products", len(products))
+    _count("station_steps", len(products) * len(steps))
+
+    for prod_idx in products:
+        # rows가 없으면 완료 시각 행을 재사용 (위상정렬 순서상 읽기 전에 항상 덮어쓴다)
+        prod_finish = rows[prod_idx] if rows is not None else shared_finish
+        is_measured = prod_idx >= warmup_products
+        if inbound is not None:
+            k = prod_idx - products.start
+            for node, values in inbound:
+                prod_finish[node] = values[k]
+
+        for step_idx, timed, pred, preds, lo, hi, succs in steps:
+            if not timed:
+                for succ_step, _lo, _hi, cap in succs:
+                    q = queue_lengths[succ_step] + 1
+                    queue_lengths[succ_step] = q if q < cap else cap
+                continue
+
+            sampler = samplers[step_idx]
+            ct = sampler() if sampler is not None else cycle_times[step_idx]
+
+            if pred >= 0:
+                earliest_arrival = prod_finish[pred]
+            elif preds:
+                earliest_arrival = max([prod_finish[p] for p in preds])
             else:
                 earliest_arrival = 0.0
 
-            srv = servers[step_idx]
-            best_srv_idx = 0
-            best_srv_time = srv[0]
-            for s_idx in range(1, len(srv)):
-                if srv[s_idx] < best_srv_time:
-                    best_srv_time = srv[s_idx]
+            best_srv_idx = lo
+            best_srv_time = servers[lo]
+            for s_idx in range(lo + 1, hi):
+                if servers[s_idx] < best_srv_time:
+                    best_srv_time = servers[s_idx]
                     best_srv_idx = s_idx
 
-            start_time = max(earliest_arrival, best_srv_time)
+            start_time = earliest_arrival if earliest_arrival > best_srv_time else best_srv_time
             wait_time = start_time - earliest_arrival
 
             finish_time = start_time + ct
             blocking_delay = 0.0
 
-            succ_ids = successors.get(pid, [])
-            if succ_ids:
-                for succ_id in succ_ids:
-                    succ_step = proc_index[succ_id]
-                    if queue_lengths[succ_step] >= queue_capacities[succ_step]:
-                        next_srv = servers[succ_step]
-                        earliest_next = min(next_srv)
-                        delay = max(0.0, earliest_next - finish_time)
-                        blocking_delay = max(blocking_delay, delay)
+            for succ_step, s_lo, s_hi, cap in succs:
+                if queue_lengths[succ_step] >= cap:
+                    saturated[succ_step] = 1
+                    earliest_next = min(servers[s_lo:s_hi]) if s_hi - s_lo > 1 else servers[s_lo]
+                    delay = earliest_next - finish_time
+                    if delay > blocking_delay:
+                        blocking_delay = delay
 
             actual_finish = finish_time + blocking_delay
 
             if is_measured:
-                if measure_start_time is None:
-                    measure_start_time = start_time
+                if step_idx == 0 and prod_idx == warmup_products:
+                    state.measure_start = start_time
 
                 if best_srv_time <= earliest_arrival:
                     actual_starving = earliest_arrival - best_srv_time
                 else:
                     actual_starving = 0.0
 
-                stats_working[step_idx][best_srv_idx] += ct
-                stats_starving[step_idx][best_srv_idx] += actual_starving
-                stats_blocking[step_idx][best_srv_idx] += blocking_delay
+                stats_working[best_srv_idx] += ct
+                stats_starving[best_srv_idx] += actual_starving
+                stats_blocking[best_srv_idx] += blocking_delay
                 stats_total_wait[step_idx] += wait_time
                 stats_wait_count[step_idx] += 1
 
-            for succ_id in succ_ids:
-                succ_step = proc_index[succ_id]
-                queue_lengths[succ_step] = min(
-                    queue_lengths[succ_step] + 1,
-                    queue_capacities[succ_step],
-                )
+            for succ_step, _lo, _hi, cap in succs:
+                q = queue_lengths[succ_step] + 1
+                queue_lengths[succ_step] = q if q < cap else cap
             if queue_lengths[step_idx] > 0:
                 queue_lengths[step_idx] -= 1
 
             if queue_lengths[step_idx] > stats_max_queue[step_idx]:
                 stats_max_queue[step_idx] = queue_lengths[step_idx]
 
-            servers[step_idx][best_srv_idx] = actual_finish
-            prod_finish[pid] = actual_finish
+            servers[best_srv_idx] = actual_finish
+            prod_finish[step_idx] = actual_finish
+
+            if timeline is not None:
+                timeline.add(timeline.working, step_idx, start_time, finish_time)
+                timeline.add(timeline.starving, step_idx, best_srv_time, earliest_arrival)
+                timeline.add(timeline.blocking, step_idx, finish_time, actual_finish)
+                timeline.queue(step_idx, start_time, queue_lengths[step_idx])
+
+            if trace is not None:
+                trace((prod_idx, step_idx, best_srv_idx - lo, start_time, actual_finish,
+                       wait_time, blocking_delay))
+            if releases is not None and step_idx == 0:
+                releases.append(start_time)
+
+        if completions is not None:
+            completions.append(max(prod_finish))
+        if outbound is not None:
+            for node, values in outbound:
+                values.append(prod_finish[node])
+        if prod_idx == last_product:
+            state.measure_end = max(prod_finish)
+
+
+def _summarize_sequential(topo: _LineTopology, parallel_counts: List[int],
+                          state: _SequentialState, num_products: int,
+                          warmup_products: int) -> Dict[str, Any]:
+    return _summarize(
+        topo, parallel_counts,
+        state.station_totals(state.working),
+        state.station_totals(state.starving),
+        state.station_totals(state.blocking),
+        state.total_wait, state.wait_count, state.max_queue,
+        num_products, warmup_products,
+        state.measure_end - state.measure_start, "sequential",
+    )
 
-        product_finish.append(prod_finish)
 
-        if is_measured:
-            last_finish = max(prod_finish.values())
-            measure_end_time = last_finish
+def _simulate_sequential(data: Dict[str, Any], topo: _LineTopology,
+                         rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """제품을 하나씩 위상정렬 순서로 통과시키는 결정적 계산."""
+    if data.get("adaptive"):
+        return _simulate_sequential_adaptive(data, topo, rng)
+    if data.get("checkpoint_path"):
+        return _simulate_sequential_checkpointed(data, topo, rng)
+    if data.get("warmup_products") == "auto":
+        return _simulate_sequential_auto_warmup(data, topo, rng)
+
+    num_products: int = data.get("num_products", 100)
+    warmup_products: int = data.get("warmup_products", 10)
+
+    ordered = topo.ordered
+    cycle_times = [float(p["cycle_time_sec"]) for p in ordered]
+    samplers = _cycle_time_samplers(data, topo, rng)
+    parallel_counts = [int(p.get("parallel_count", 1)) for p in ordered]
+    queue_capacities = _queue_capacities(ordered, parallel_counts)
+
+    state = _SequentialState(parallel_counts)
+    plan = [(j, True, topo.succ_idx[j]) for j in range(topo.num_procs)]
+    timeline = _make_timeline(data, topo.num_procs)
+    _sequential_advance(state, plan, topo.pred_idx, cycle_times, samplers, queue_capacities,
+                        range(num_products), warmup_products, num_products, timeline=timeline)
+
+    result = _summarize_sequential(topo, parallel_counts, state, num_products, warmup_products)
+    if timeline is not None:
+        result["timeline"] = timeline.to_dict(topo.proc_ids)
+    return result
+
+
+def _simulate_sequential_adaptive(data: Dict[str, Any], topo: _LineTopology,
+                                  rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """배치 평균(batch means) 처리량의 상대 CI 반폭이 목표 이하가 될 때까지 제품 투입.
+
+    warmup 이후 batch_products개 제품마다 배치 처리량을 기록하고, 배치가
+    min_batches개 이상이며 상대 반폭(half_width / mean) < target_rel_half_width이면 종료한다.
+    max_products에 도달하면 수렴하지 않아도 종료하고 converged=False로 보고한다.
+    """
+    warmup_products: int = data.get("warmup_products", 10)
+    target = float(data.get("target_rel_half_width", 0.05))
+    confidence = float(data.get("confidence", 0.95))
+    min_batches = max(2, int(data.get("min_batches", 10)))
+    batch_products = int(data.get("batch_products") or max(20, 2 * topo.num_procs))
+    max_products = int(data.get("max_products", 100000))
+    if target <= 0:
+        raise ValueError("target_rel_half_width must be positive")
+    if batch_products <= 0:
+        raise ValueError("batch_products must be positive")
+
+    ordered = topo.ordered
+    cycle_times = [float(p["cycle_time_sec"]) for p in ordered]
+    samplers = _cycle_time_samplers(data, topo, rng)
+    parallel_counts = [int(p.get("parallel_count", 1)) for p in ordered]
+    queue_capacities = _queue_capacities(ordered, parallel_counts)
+
+    state = _SequentialState(parallel_counts)
+    plan = [(j, True, topo.succ_idx[j]) for j in range(topo.num_procs)]
+    timeline = _make_timeline(data, topo.num_procs)
+
+    def advance(lo: int, hi: int) -> None:
+        _sequential_advance(state, plan, topo.pred_idx, cycle_times, samplers, queue_capacities,
+                            range(lo, hi), warmup_products, hi, timeline=timeline)
+
+    advance(0, warmup_products + 1)
+    produced = warmup_products + 1
+    last_end = state.measure_end  # warmup 제품의 완료 시각: 첫 배치도 완료 간격만 측정
+    batch_uph: List[float] = []
+    rel_half = math.inf
+
+    while produced + batch_products <= max_products:
+        advance(produced, produced + batch_products)
+        produced += batch_products
+        span = state.measure_end - last_end
+        last_end = state.measure_end
+        batch_uph.append(batch_products / span * 3600.0 if span > 0 else 0.0)
+
+        if len(batch_uph) >= min_batches:
+            ci = _mean_ci(batch_uph, confidence)
+            rel_half = ci["half_width"] / ci["mean"] if ci["mean"] > 0 else math.inf
+            if rel_half < target:
+                break
+
+    result = _summarize_sequential(topo, parallel_counts, state, produced, warmup_products)
+    result["simulation_summary"]["adaptive"] = {
+        "products_used": produced,
+        "batches": len(batch_uph),
+        "batch_products": batch_products,
+        "rel_half_width": round(rel_half, 4) if math.isfinite(rel_half) else None,
+        "target_rel_half_width": target,
+        "converged": rel_half < target,
+    }
+    if timeline is not None:
+        result["timeline"] = timeline.to_dict(topo.proc_ids)
+    log.info("[simulate] adaptive 종료: %s", result["simulation_summary"]["adaptive"])
+    return result
+
+
+# ── 워밍업 자동 절단 (MSER-5) ─────────────────────────────
+MSER_BATCH = 5
+_MSER_MAX_SNAPSHOTS = 200
+
+
+def _mser_truncation(series: Any, batch: int = MSER_BATCH) -> int:
+    """MSER-m 절단점(제품 수) 계산.
+
+    배치 평균 Z_1..Z_n에 대해 MSER(d) = Σ_{i>d}(Z_i - Z̄_d)² / (n-d)² 를
+    후방 누적합으로 한 번에 구하고, d ≤ n/2 범위의 최솟값을 택한다.
+    """
+    n = len(series) // batch
+    if n < 2:
+        return 0
+    limit = n // 2
+    if NUMPY_AVAILABLE:
+        z = np.asarray(series[:n * batch], dtype=np.float64).reshape(n, batch).mean(axis=1)
+        s1 = np.cumsum(z[::-1])[::-1][:limit + 1]
+        s2 = np.cumsum((z * z)[::-1])[::-1][:limit + 1]
+        remaining = n - np.arange(limit + 1, dtype=np.float64)
+        mser = (s2 - s1 * s1 / remaining) / (remaining * remaining)
+        return int(np.argmin(mser)) * batch
+
+    z = [sum(series[i * batch:(i + 1) * batch]) / batch for i in range(n)]
+    s1 = s2 = 0.0
+    best_d, best = 0, math.inf
+    suffix = []
+    for value in reversed(z):
+        s1 += value
+        s2 += value * value
+        suffix.append((s1, s2))
+    for d in range(limit + 1):
+        t1, t2 = suffix[n - 1 - d]
+        remaining = n - d
+        mser = (t2 - t1 * t1 / remaining) / (remaining * remaining)
+        if mser < best:
+            best_d, best = d, mser
+    return best_d * batch
+
+
+def _simulate_sequential_auto_warmup(data: Dict[str, Any], topo: _LineTopology,
+                                     rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """warmup_products="auto": 한 번의 실행으로 MSER-5 절단점을 찾아 통계를 보정.
+
+    MSER 대상 계열은 제품 간 완료 간격(inter-departure time)이다. 이 모델은 원자재 투입을
+    제한하지 않아 첫 공정이 병목보다 빠르면 흐름 시간(완료 - 투입)이 계속 증가하므로
+    정상 상태 판정에 쓸 수 없다.
+
+    전체 제품을 측정 대상으로 실행하면서 제품별 투입/완료 시각을 버퍼링하고,
+    후보 절단점(앞 절반 구간, 최대 200개 간격)마다 공정별 누적 통계 스냅샷을 남긴다.
+    MSER-5 절단점 이상의 첫 스냅샷을 기준으로 '최종 누적 - 스냅샷'을 측정 통계로 사용한다.
+    """
+    num_products: int = data.get("num_products", 100)
+    ordered = topo.ordered
+    num_procs = topo.num_procs
+    cycle_times = [float(p["cycle_time_sec"]) for p in ordered]
+    samplers = _cycle_time_samplers(data, topo, rng)
+    parallel_counts = [int(p.get("parallel_count", 1)) for p in ordered]
+    queue_capacities = _queue_capacities(ordered, parallel_counts)
+
+    state = _SequentialState(parallel_counts)
+    plan = [(j, True, topo.succ_idx[j]) for j in range(num_procs)]
+    releases = array("d")
+    completions = array("d")
+    timeline = _make_timeline(data, num_procs)
+
+    def totals() -> tuple:
+        return (
+            state.station_totals(state.working),
+            state.station_totals(state.starving),
+            state.station_totals(state.blocking),
+            list(state.total_wait),
+            list(state.wait_count),
+        )
+
+    half = num_products // 2
+    stride = max(MSER_BATCH, -(-half // _MSER_MAX_SNAPSHOTS))
+    stride += -stride % MSER_BATCH
+    snapshots: Dict[int, tuple] = {0: ([0.0] * num_procs,) * 3 + ([0.0] * num_procs, [0] * num_procs)}
+    produced = 0
+    for cut in list(range(stride, half + 1, stride)) + [num_products]:
+        _sequential_advance(state, plan, topo.pred_idx, cycle_times, samplers, queue_capacities,
+                            range(produced, cut), 0, num_products,
+                            releases=releases, completions=completions, timeline=timeline)
+        produced = cut
+        if cut <= half:
+            snapshots[cut] = totals()
+
+    departures = [completions[0] - releases[0]]
+    departures.extend(b - a for a, b in zip(completions, completions[1:]))
+    truncation = _mser_truncation(departures)
+    warmup = min(s for s in snapshots if s >= truncation) if truncation <= max(snapshots) else max(snapshots)
+
+    final = totals()
+    base = snapshots[warmup]
+    working, starving, blocking, total_wait, wait_count = (
+        [f - b for f, b in zip(final[i], base[i])] for i in range(5))
+
+    result = _summarize(
+        topo, parallel_counts, working, starving, blocking, total_wait, wait_count,
+        state.max_queue, num_products, warmup,
+        state.measure_end - releases[warmup], "sequential",
+    )
+    result["simulation_summary"]["warmup_detection"] = {
+        "method": f"MSER-{MSER_BATCH}",
+        "mser_truncation_products": truncation,
+        "applied_warmup_products": warmup,
+        "snapshot_stride": stride,
+    }
+    if timeline is not None:
+        result["timeline"] = timeline.to_dict(topo.proc_ids)
+    log.info("[simulate] MSER 워밍업 절단: %s", result["simulation_summary"]["warmup_detection"])
+    return result
+
+
+# ── 체크포인트/재개 (메모리 매핑 상태 파일) ───────────────
+# 결과에 영향을 주지 않는 실행 제어 키 (캐시 키와 체크포인트 입력 해시에서 제외)
+_CHECKPOINT_KEYS = ("checkpoint_path", "resume", "checkpoint_interval_sec")
+
+
+class _CheckpointFile:
+    """_SequentialState + 진행 제품 수 + RNG 상태를 담는 mmap 파일 (두 슬롯 교대 기록).
+
+    레이아웃: 헤더(magic, 입력 해시, 공정 수, 서버 수) + 슬롯 2개.
+    슬롯 = 슬롯 헤더(seq, 진행 제품 수, 측정 시작/종료 시각, CRC32) + 상태 배열 원시 바이트.
+    배열을 먼저 쓰고 슬롯 헤더를 마지막에 기록하므로, 기록 중 프로세스가 종료되어도
+    CRC가 맞는 최신 슬롯(직전 스냅샷)으로 재개할 수 있다.
+    """
+
+    MAGIC = b"LSIMCKP1"
+    HEADER = struct.Struct("<8s32sQQ")
+    SLOT = struct.Struct("<QQddI")
+    RNG = struct.Struct("<?d")  # gauss_next 존재 여부, 값 (+ Mersenne Twister 상태 625 words)
+    RNG_WORDS = 625
+
+    def __init__(self, path: str, digest: bytes, state: _SequentialState):
+        num_procs = len(state.counts)
+        total = state.offsets[num_procs]
+        self.state = state
+        self.arrays = [state.servers, state.working, state.starving, state.blocking,
+                       state.queue_lengths, state.max_queue, state.total_wait, state.wait_count]
+        self.payload = 8 * (4 * total + 4 * num_procs) + num_procs + self.RNG.size + 8 * self.RNG_WORDS
+        self.slot_size = self.SLOT.size + self.payload
+        size = self.HEADER.size + 2 * self.slot_size
+        header = self.HEADER.pack(self.MAGIC, digest, num_procs, total)
+
+        fresh = True
+        if os.path.exists(path) and os.path.getsize(path) == size:
+            with open(path, "rb") as f:
+                fresh = f.read(self.HEADER.size) != header
+        self._file = open(path, "w+b" if fresh else "r+b")
+        if fresh:
+            self._file.truncate(size)
+        self.mm = mmap.mmap(self._file.fileno(), size)
+        if fresh:
+            self.mm[:self.HEADER.size] = header
+            self.mm.flush()
+        self.seq = max((self._slot(i)[0] for i in range(2)), default=0)
+
+    def _slot(self, i: int) -> tuple:
+        """(seq, 진행 제품 수, 측정 시작, 측정 종료, payload 시작, CRC 일치 여부)."""
+        at = self.HEADER.size + i * self.slot_size
+        seq, produced, start, end, crc = self.SLOT.unpack_from(self.mm, at)
+        lo = at + self.SLOT.size
+        valid = seq > 0 and zlib.crc32(self.mm[lo:lo + self.payload]) == crc
+        return seq, produced, start, end, lo, valid
+
+    def save(self, produced: int, rng_state: Optional[tuple]) -> None:
+        self.seq += 1
+        at = self.HEADER.size + (self.seq % 2) * self.slot_size
+        buf = bytearray()
+        for values in self.arrays:
+            buf += values.tobytes()
+        buf += self.state.saturated
+        if rng_state is not None:
+            _version, words, gauss_next = rng_state
+            buf += self.RNG.pack(gauss_next is not None, gauss_next or 0.0)
+            buf += array("Q", words).tobytes()
+        else:
+            buf += bytes(self.RNG.size + 8 * self.RNG_WORDS)
+        lo = at + self.SLOT.size
+        self.mm[lo:lo + self.payload] = bytes(buf)
+        self.mm.flush()
+        self.SLOT.pack_into(self.mm, at, self.seq, produced, self.state.measure_start,
+                            self.state.measure_end, zlib.crc32(buf))
+        self.mm.flush()
+
+    def load(self) -> Optional[tuple]:
+        """최신 유효 슬롯을 state에 복원하고 (진행 제품 수, RNG 상태 또는 None) 반환."""
+        slots = [slot for slot in (self._slot(0), self._slot(1)) if slot[5]]
+        if not slots:
+            return None
+        seq, produced, start, end, lo, _valid = max(slots)
+        view = memoryview(self.mm)[lo:lo + self.payload]
+        pos = 0
+        for values in self.arrays:
+            n = len(values) * values.itemsize
+            values[:] = array(values.typecode, bytes(view[pos:pos + n]))
+            pos += n
+        num_procs = len(self.state.saturated)
+        self.state.saturated[:] = view[pos:pos + num_procs]
+        pos += num_procs
+        has_gauss, gauss_next = self.RNG.unpack_from(view, pos)
+        pos += self.RNG.size
+        words = tuple(array("Q", bytes(view[pos:pos + 8 * self.RNG_WORDS])))
+        view.release()
+        self.state.measure_start = start
+        self.state.measure_end = end
+        rng_state = (3, words, gauss_next if has_gauss else None) if any(words) else None
+        return produced, rng_state
+
+    def close(self) -> None:
+        self.mm.close()
+        self._file.close()
+
+
+def _simulate_sequential_checkpointed(data: Dict[str, Any], topo: _LineTopology,
+                                      rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """checkpoint_path에 주기적으로(checkpoint_interval_sec, 기본 5초) 상태를 기록하며 실행.
+
+    "resume"이 참이고 같은 입력의 유효한 스냅샷이 있으면 그 제품부터 이어서 계산한다.
+    공용 RNG는 상태를 그대로 복원하고, 공통 난수열은 완료 제품 수만큼 균등난수를 건너뛴다.
+    고정 길이 sequential 단일 실행(adaptive/auto warmup/timeline 제외)만 지원한다.
+    """
+    if data.get("adaptive") or data.get("warmup_products") == "auto" or data.get("timeline_window_sec"):
+        raise ValueError("checkpoint_path는 고정 길이 실행(adaptive/auto warmup/timeline 제외)에서만 지원합니다")
+
+    num_products: int = data.get("num_products", 100)
+    warmup_products: int = data.get("warmup_products", 10)
+    interval = float(data.get("checkpoint_interval_sec", 5.0))
+    crn = bool(data.get("common_random_numbers"))
+
+    ordered = topo.ordered
+    cycle_times = [float(p["cycle_time_sec"]) for p in ordered]
+    parallel_counts = [int(p.get("parallel_count", 1)) for p in ordered]
+    queue_capacities = _queue_capacities(ordered, parallel_counts)
+    state = _SequentialState(parallel_counts)
+    plan = [(j, True, topo.succ_idx[j]) for j in range(topo.num_procs)]
+
+    digest = bytes.fromhex(input_key(data))
+    store = _CheckpointFile(data["checkpoint_path"], digest, state)
+    try:
+        produced, rng_state = 0, None
+        if data.get("resume"):
+            snapshot = store.load()
+            if snapshot is not None:
+                produced, rng_state = snapshot
+        resumed_from = produced
+        samplers = _cycle_time_samplers(data, topo, rng, skip=produced if crn else 0)
+        if rng is not None and not crn and rng_state is not None:
+            rng.setstate(rng_state)
+        log.info("[checkpoint] %s — %d/%d 제품부터 시작", data["checkpoint_path"], produced, num_products)
+
+        chunk = max(1, min(1000, num_products // 100 or 1))
+        snapshots = 0
+        last = time.perf_counter()
+        while produced < num_products:
+            hi = min(produced + chunk, num_products)
+            _sequential_advance(state, plan, topo.pred_idx, cycle_times, samplers, queue_capacities,
+                                range(produced, hi), warmup_products, num_products)
+            produced = hi
+            if produced == num_products or time.perf_counter() - last >= interval:
+                store.save(produced, rng.getstate() if rng is not None and not crn else None)
+                snapshots += 1
+                last = time.perf_counter()
+    finally:
+        store.close()
+
+    result = _summarize_sequential(topo, parallel_counts, state, num_products, warmup_products)
+    result["checkpoint"] = {
+        "path": data["checkpoint_path"],
+        "resumed_from_product": resumed_from,
+        "snapshots": snapshots,
+    }
+    return result
+
+
+# ── 시뮬레이션 엔진: parallel (가지 분할 보수적 병렬) ─────
+def _strongly_connected(adj: List[set]) -> List[int]:
+    """인접 집합 그래프 → 노드별 강연결 요소 번호 (Kosaraju, 번호 순서 = 축약 그래프의 위상 순서)."""
+    n = len(adj)
+    seen = [False] * n
+    finished: List[int] = []
+    for root in range(n):
+        if seen[root]:
+            continue
+        seen[root] = True
+        stack = [(root, iter(adj[root]))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, -1)
+            if child < 0:
+                stack.pop()
+                finished.append(node)
+            elif not seen[child]:
+                seen[child] = True
+                stack.append((child, iter(adj[child])))
+
+    radj: List[List[int]] = [[] for _ in range(n)]
+    for u in range(n):
+        for v in adj[u]:
+            radj[v].append(u)
+    comp = [-1] * n
+    num_comps = 0
+    for root in reversed(finished):
+        if comp[root] >= 0:
+            continue
+        comp[root] = num_comps
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            for v in radj[u]:
+                if comp[v] < 0:
+                    comp[v] = num_comps
+                    stack.append(v)
+        num_comps += 1
+    return comp
+
+
+def _partition_topology(topo: _LineTopology) -> List[List[int]]:
+    """공정 DAG를 가지(branch) 부분 그래프로 분할 (분할 목록은 위상 순서, 분할 내 공정은 인덱스 순).
+
+    sequential 엔진에서 공정 u는 후속 공정 s의 대기열 계수가 용량에 도달했을 때만 s의 서버 시각을
+    읽어 정체를 계산한다. 계수는 시간과 무관하게 제품마다 (s의 선행 공정 수 - 1)씩 쌓이므로
+    선행 공정이 하나뿐인 공정은 상류에 정체를 일으키지 않는다. 따라서 합류 공정과 그 선행 공정을
+    같은 분할에 두고 단일 선행 공정으로 들어가는 간선에서만 자르면 분할 사이에는 하류 방향으로
+    완료 시각만 흐른다. 분기 이후와 합류 이전의 각 가지가 별도 분할이 되고, 직렬 구간은 앞 공정의
+    분할에 이어 붙인다. 분할 간 그래프에 순환이 생기면 강연결 요소 단위로 합친다.
+    """
+    n = topo.num_procs
+    pred_idx, succ_idx = topo.pred_idx, topo.succ_idx
+    parent = list(range(n))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(a: int, b: int) -> None:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    feeds_merge = [any(len(pred_idx[s]) > 1 for s in succ_idx[j]) for j in range(n)]
+    for j in range(n):
+        if len(pred_idx[j]) > 1:
+            for p in pred_idx[j]:
+                union(j, p)
+        elif pred_idx[j] and len(succ_idx[pred_idx[j][0]]) == 1 and not feeds_merge[j]:
+            union(j, pred_idx[j][0])
+
+    roots = sorted({find(j) for j in range(n)})
+    group = {r: i for i, r in enumerate(roots)}
+    label = [group[find(j)] for j in range(n)]
+    adj: List[set] = [set() for _ in roots]
+    for j in range(n):
+        for s in succ_idx[j]:
+            if label[s] != label[j]:
+                adj[label[j]].add(label[s])
+    comp = _strongly_connected(adj)
+
+    parts: List[List[int]] = [[] for _ in range(max(comp) + 1)]
+    for j in range(n):
+        parts[comp[label[j]]].append(j)
+    return parts
+
+
+def _run_partitions(data: Dict[str, Any], topo: _LineTopology, rng: Optional[random.Random],
+                    parts: List[List[int]], owner: List[int], group: int, chunk: int,
+                    inboxes: List[Any]) -> tuple:
+    """group에 배정된 분할들을 chunk개 제품씩 위상 순서로 진행 → (상태, 마지막 제품 완료 시각).
+
+    분할 입력(외부 선행 공정 완료 시각)은 inboxes[group]에서 ((chunk 시작, 공정), 배열)로 받고,
+    다른 그룹의 분할로 나가는 완료 시각은 해당 그룹의 inbox로 보낸다. 같은 그룹 안의 전달은
+    메모리로 처리하므로 단일 그룹이면 inboxes가 필요 없다.
+    """
+    num_products: int = data.get("num_products", 100)
+    warmup_products: int = data.get("warmup_products", 10)
+    pred_idx, succ_idx = topo.pred_idx, topo.succ_idx
+
+    ordered = topo.ordered
+    cycle_times = [float(p["cycle_time_sec"]) for p in ordered]
+    samplers = _cycle_time_samplers(data, topo, rng)
+    parallel_counts = [int(p.get("parallel_count", 1)) for p in ordered]
+    queue_capacities = _queue_capacities(ordered, parallel_counts)
+    state = _SequentialState(parallel_counts)
+
+    part_of = [0] * topo.num_procs
+    for i, part in enumerate(parts):
+        for j in part:
+            part_of[j] = i
+
+    # 분할별 (plan, 외부 선행 공정, [(경계 공정, 받는 그룹)]).
+    # 외부 선행 공정은 시간 계산 없이 대기열 계수만 올리는 항목으로 plan 앞에 둔다
+    # (잘린 간선의 후속 공정은 선행 공정이 하나라 그 사이에 계수를 읽는 공정이 없다).
+    jobs = []
+    for i, part in enumerate(parts):
+        if owner[i] != group:
+            continue
+        external = sorted({p for j in part for p in pred_idx[j] if part_of[p] != i})
+        plan = [(u, False, [s for s in succ_idx[u] if part_of[s] == i]) for u in external]
+        plan += [(j, True, [s for s in succ_idx[j] if part_of[s] == i]) for j in part]
+        exports = []
+        for j in part:
+            dests = sorted({owner[part_of[s]] for s in succ_idx[j] if part_of[s] != i})
+            if dests:
+                exports.append((j, dests))
+        jobs.append((plan, external, exports))
+
+    pending: Dict[tuple, Any] = {}
+    measure_end = 0.0
+    for lo in range(0, num_products, chunk):
+        hi = min(lo + chunk, num_products)
+        for plan, external, exports in jobs:
+            inbound = []
+            for u in external:
+                while (lo, u) not in pending:
+                    key, values = inboxes[group].get()
+                    pending[key] = values
+                inbound.append((u, pending[(lo, u)]))
+            outbound = [(j, array("d")) for j, _dests in exports]
+            _sequential_advance(state, plan, pred_idx, cycle_times, samplers, queue_capacities,
+                                range(lo, hi), warmup_products, num_products,
+                                inbound=inbound or None, outbound=outbound or None)
+            for (j, dests), (_j, values) in zip(exports, outbound):
+                for dest in dests:
+                    if dest == group:
+                        pending[(lo, j)] = values
+                    else:
+                        inboxes[dest].put(((lo, j), values))
+            if hi == num_products:
+                measure_end = max(measure_end, state.measure_end)
+        for key in [key for key in pending if key[0] == lo]:
+            del pending[key]
+    return state, measure_end
+
+
+def _parallel_worker(data: Dict[str, Any], topo: _LineTopology, rng: Optional[random.Random],
+                     parts: List[List[int]], owner: List[int], group: int, chunk: int,
+                     inboxes: List[Any], results: Any) -> None:
+    """parallel 엔진 작업 프로세스 (최상위 함수여야 spawn 방식에서도 실행 가능)."""
+    try:
+        results.put((group, _run_partitions(data, topo, rng, parts, owner, group, chunk, inboxes)))
+    except BaseException:
+        results.put((group, traceback.format_exc()))
+
+
+def _simulate_parallel(data: Dict[str, Any], topo: _LineTopology,
+                       rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """가지 분할을 작업 프로세스에 나눠 제품 chunk 단위로 진행하는 보수적 병렬 sequential 엔진.
+
+    분할 사이에는 하류 방향 의존만 있으므로(_partition_topology) 각 분할은 상류 분할이 같은
+    chunk를 끝내는 즉시 진행한다 (chunk = 동기화 창, 역방향 대기/널 메시지 없음).
+    공정별 연산 순서가 sequential 엔진과 같아 결과도 동일하다.
+    분할은 크기 순 탐욕 배정(LPT)으로 max_workers(기본 CPU 수)개 프로세스에 나눈다.
+    """
+    num_products: int = data.get("num_products", 100)
+    warmup_products: int = data.get("warmup_products", 10)
+    parts = _partition_topology(topo)
+
+    max_workers = data.get("max_workers")
+    workers = min(len(parts), max(1, int(max_workers)) if max_workers is not None else os.cpu_count() or 1)
+    if multiprocessing.current_process().daemon:
+        workers = 1  # 프로세스 풀 작업(반복 실험/배치) 안에서는 자식 프로세스를 만들 수 없다
+    chunk = int(data.get("parallel_chunk_products") or max(1, min(1000, num_products // 20)))
+
+    load = [0] * workers
+    owner = [0] * len(parts)
+    for i in sorted(range(len(parts)), key=lambda i: -len(parts[i])):
+        g = load.index(min(load))
+        owner[i] = g
+        load[g] += len(parts[i])
+    log.info("[simulate] parallel: 분할 %d개 → 작업 프로세스 %d개 (chunk=%d제품)", len(parts), workers, chunk)
+
+    if workers == 1:
+        collected = {0: _run_partitions(data, topo, rng, parts, owner, 0, chunk, [])}
+    else:
+        ctx = multiprocessing.get_context()
+        inboxes = [ctx.Queue() for _ in range(workers)]
+        results = ctx.Queue()
+        procs = [ctx.Process(target=_parallel_worker,
+                             args=(data, topo, rng, parts, owner, g, chunk, inboxes, results))
+                 for g in range(workers)]
+        for proc in procs:
+            proc.start()
+        try:
+            collected = {}
+            while len(collected) < workers:
+                try:
+                    g, payload = results.get(timeout=1.0)
+                except queue.Empty:
+                    if any(proc.exitcode not in (None, 0) for proc in procs):
+                        raise RuntimeError("parallel 엔진 작업 프로세스가 비정상 종료했습니다")
+                    continue
+                if isinstance(payload, str):
+                    raise RuntimeError(f"parallel 엔진 작업 프로세스 {g} 실패:\n{payload}")
+                collected[g] = payload
+            for proc in procs:
+                proc.join()
+        finally:
+            for proc in procs:
+                if proc.is_alive():
+                    proc.terminate()
+                    proc.join()
+
+    parallel_counts = [int(p.get("parallel_count", 1)) for p in topo.ordered]
+    state = _SequentialState(parallel_counts)
+    for i, part in enumerate(parts):
+        src = collected[owner[i]][0]
+        state.copy_steps(src, part)
+        for j in part:
+            state.saturated[j] = src.saturated[j]
+        if 0 in part:
+            state.measure_start = src.measure_start
+    state.measure_end = max(end for _state, end in collected.values())
+
+    result = _summarize_sequential(topo, parallel_counts, state, num_products, warmup_products)
+    result["simulation_summary"]["engine"] = "parallel"
+    result["parallel"] = {
+        "partitions": len(parts),
+        "workers": workers,
+        "chunk_products": chunk,
+        "largest_partition": max(len(part) for part in parts),
+    }
+    return result
+
+
+# ── 시뮬레이션 엔진: event ────────────────────────────────
+def _simulate_event(data: Dict[str, Any], topo: _LineTopology,
+                    rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """이벤트 힙 기반 이산 사건 시뮬레이션 (유한 버퍼, BAS 정체).
+
+    - 공정 j의 선행 공정별 입력 버퍼 용량은 buffer_capacity (기본 parallel_count * 2)
+    - 서버는 가공 완료 후 모든 후속 버퍼에 자리가 날 때까지 정체(blocked)
+    - 합류 공정은 선행 공정별 버퍼에서 1개씩 꺼내 조립 (수량 매칭)
+    - 측정 구간: warmup 번째 제품 투입 시각 ~ 마지막 제품 완료 시각
+
+    비용: 공정-제품 단계마다 이벤트 힙 push/pop 1회와 유휴 서버 힙 push/pop 1회가 든다.
+    직렬 구간(단일 선행/단일 후속)은 리스트 순회 없이 처리해 합성 300공정
+    (benchmarks/bench_line_simulator.py의 synthetic_line) 기준 2,000제품 1.9초
+    (sequential 1.7초), 20,000제품 21.7초 (sequential 14.9초)이다. 느린 머신에서는 2배까지
+    걸릴 수 있으므로 60초 도구 제한 안에서는 수백 공정 × 2만 제품 정도가 상한이며,
+    정체를 정밀하게 볼 필요가 없는 대형 라인은 sequential/maxplus 엔진을 쓴다.
+    """
+    num_products: int = data.get("num_products", 100)
+    warmup_products: int = data.get("warmup_products", 10)
+
+    ordered = topo.ordered
+    num_procs = topo.num_procs
+    preds = topo.pred_idx
+
+    cycle_times = [float(p["cycle_time_sec"]) for p in ordered]
+    samplers = _cycle_time_samplers(data, topo, rng)
+    parallel_counts = [int(p.get("parallel_count", 1)) for p in ordered]
+    queue_capacities = _queue_capacities(ordered, parallel_counts)
+
+    # 간선별 입력 버퍼: 공정 i의 후속 간선은 (후속 공정 버퍼, 후속 공정, 용량)
+    in_bufs = [[collections.deque() for _ in preds[j]] for j in range(num_procs)]
+    succ_edges: List[List[tuple]] = [[] for _ in range(num_procs)]
+    for j in range(num_procs):
+        for k, i in enumerate(preds[j]):
+            succ_edges[i].append((in_bufs[j][k], j, queue_capacities[j]))
+
+    # 공정별 유휴 서버 힙: (유휴 시작 시각, 서버 번호)
+    free_servers = [[(0.0, s) for s in range(parallel_counts[j])] for j in range(num_procs)]
+    blocked = [collections.deque() for _ in range(num_procs)]
+    released = [0] * num_procs
+
+    sources = [j for j in range(num_procs) if not preds[j]]
+    sinks = [j for j in range(num_procs) if not succ_edges[j]]
+    sink_done = [0] * num_procs
+    completed = 0
+    warmup_sources_left = len(sources)
+
+    working = [0.0] * num_procs
+    starving = [0.0] * num_procs
+    blocking = [0.0] * num_procs
+    total_wait = [0.0] * num_procs
+    wait_count = [0] * num_procs
+    max_queue = [0] * num_procs
+
+    events: List[tuple] = []
+    seq = itertools.count()
+    work = collections.deque(sources)
+    queued = [False] * num_procs
+    for j in sources:
+        queued[j] = True
+
+    # 단일 선행/단일 후속 공정(대부분의 직렬 구간)은 리스트 순회 없이 처리
+    single_buf = [bufs[0] if len(bufs) == 1 else None for bufs in in_bufs]
+    single_edge = [edges[0] if len(edges) == 1 else None for edges in succ_edges]
+
+    # t0(워밍업 제품 투입 시각)가 정해지기 전에는 무한대로 두어 측정 조건 비교를 한 번으로 줄인다
+    inf = float("inf")
+    t0 = inf
+    t_end = 0.0
+    now = 0.0
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    while True:
+        while work:
+            j = work.popleft()
+            queued[j] = False
+
+            # 1) 정체 해소: 모든 후속 버퍼에 자리가 있으면 FIFO 순으로 반출
+            bq = blocked[j]
+            if bq:
+                edge = single_edge[j]
+                edges = succ_edges[j]
+                while bq:
+                    if edge is not None:
+                        buf, s, cap = edge
+                        if len(buf) >= cap:
+                            break
+                        srv, item, since = bq.popleft()
+                        buf.append((item, now))
+                        if len(buf) > max_queue[s]:
+                            max_queue[s] = len(buf)
+                        if not queued[s]:
+                            queued[s] = True
+                            work.append(s)
+                    else:
+                        full = False
+                        for buf, _s, cap in edges:
+                            if len(buf) >= cap:
+                                full = True
+                                break
+                        if full:
+                            break
+                        srv, item, since = bq.popleft()
+                        for buf, s, _cap in edges:
+                            buf.append((item, now))
+                            if len(buf) > max_queue[s]:
+                                max_queue[s] = len(buf)
+                            if not queued[s]:
+                                queued[s] = True
+                                work.append(s)
+                    if now > t0:
+                        blocking[j] += now - (since if since > t0 else t0)
+                    heappush(free_servers[j], (now, srv))
+
+            # 2) 가공 시작: 유휴 서버 + 투입 가능한 부품
+            fq = free_servers[j]
+            if not fq:
+                continue
+            sampler = samplers[j]
+            ct = cycle_times[j]
+            buf = single_buf[j]
+            if buf is not None:
+                if not buf:
+                    continue
+                while fq and buf:
+                    item, ready = buf.popleft()
+                    free_since, srv = heappop(fq)
+                    if now >= t0:
+                        if now > t0:
+                            starving[j] += now - (free_since if free_since > t0 else t0)
+                        total_wait[j] += now - ready
+                        wait_count[j] += 1
+                    if sampler is not None:
+                        ct = sampler()
+                    heappush(events, (now + ct, next(seq), j, srv, item, now))
+                p = preds[j][0]
+                if blocked[p] and not queued[p]:
+                    queued[p] = True
+                    work.append(p)
+                continue
+
+            bufs = in_bufs[j]
+            while fq:
+                if bufs:
+                    if not all(bufs):
+                        break
+                    heads = [b.popleft() for b in bufs]
+                    item = heads[0][0]
+                    ready = max(h[1] for h in heads)
+                    for p in preds[j]:
+                        if blocked[p] and not queued[p]:
+                            queued[p] = True
+                            work.append(p)
+                else:
+                    if released[j] >= num_products:
+                        break
+                    item = released[j]
+                    released[j] += 1
+                    ready = now
+                    if item == warmup_products:
+                        warmup_sources_left -= 1
+                        if warmup_sources_left == 0:
+                            t0 = now
+
+                free_since, srv = heappop(fq)
+                if now >= t0:
+                    if now > t0:
+                        starving[j] += now - (free_since if free_since > t0 else t0)
+                    total_wait[j] += now - ready
+                    wait_count[j] += 1
+                if sampler is not None:
+                    ct = sampler()
+                heappush(events, (now + ct, next(seq), j, srv, item, now))
+
+        if not events:
+            break
+
+        # 3) 가공 완료 이벤트
+        now, _, j, srv, item, started = heappop(events)
+        if now > t0:
+            working[j] += now - (started if started > t0 else t0)
+
+        if succ_edges[j]:
+            blocked[j].append((srv, item, now))
+        else:
+            heappush(free_servers[j], (now, srv))
+            sink_done[j] += 1
+            if all(sink_done[s] > completed for s in sinks):
+                completed += 1
+                t_end = now
+        if not queued[j]:
+            queued[j] = True
+            work.append(j)
+
+    if completed != num_products:
+        raise RuntimeError(
+            f"event 엔진이 교착 상태로 종료되었습니다 (완료 {completed}/{num_products})")
+    _count("products", num_products)
+    _count("events", next(seq))
+
+    # 측정 구간 종료 시점까지의 유휴 시간 정산
+    for j in range(num_procs):
+        for free_since, _srv in free_servers[j]:
+            start = free_since if free_since > t0 else t0
+            if t_end > start:
+                starving[j] += t_end - start
+
+    return _summarize(
+        topo, parallel_counts, working, starving, blocking,
+        total_wait, wait_count, max_queue,
+        num_products, warmup_products, t_end - t0, "event",
+    )
 
-    # ── 결과 집계 ─────────────────────────────────────────
-    measured_products = num_products - warmup_products
-    if measure_start_time is None:
-        measure_start_time = 0.0
-    if measure_end_time is None:
-        measure_end_time = 0.0
-    total_time = measure_end_time - measure_start_time
-    throughput_uph = (measured_products / total_time * 3600.0) if total_time > 0 else 0.0
+
+# ── 시뮬레이션 엔진: maxplus ──────────────────────────────
+def _maxplus_column(arrival, tail, ct: float, pc: int):
+    """한 공정 열의 max-plus 점화식을 누적 최대값으로 일괄 계산.
+
+    F[k] = max(A[k], F[k - pc]) + ct 를 잉여류(k mod pc)별로 풀면
+    H[q] = cummax(X[q] - q*ct), F[q] = H[q] + (q+1)*ct 가 된다.
+    tail(직전 블록의 마지막 pc개 완료 시각)을 앞에 붙여 블록 간 상태를 잇는다.
+    """
+    block = arrival.shape[0]
+    x = np.concatenate((tail - ct, arrival))
+    length = x.shape[0]
+    rows = -(-length // pc)
+    if rows * pc != length:
+        x = np.concatenate((x, np.full(rows * pc - length, -np.inf)))
+    q = np.arange(rows, dtype=np.float64)[:, None] * ct
+    finish = np.maximum.accumulate(x.reshape(rows, pc) - q, axis=0) + q + ct
+    return finish.ravel()[pc:pc + block]
+
+
+def _simulate_maxplus(data: Dict[str, Any], topo: _LineTopology,
+                      rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """결정적 CT에 대한 max-plus 점화식을 NumPy로 블록 단위 일괄 계산.
+
+    S[k,j] = max(max_p F[k,p], F[k - pc_j, j]),  F[k,j] = S[k,j] + ct_j
+
+    버퍼 용량 제약(정체)은 모델링하지 않으므로, 정체가 발생하지 않는 라인에서는
+    sequential 엔진과 동일한 결과를 낸다. 실행 후 공정별 최대 대기 수가 입력 버퍼 용량
+    (buffer_capacity, 기본 2 × parallel_count)에 닿은 공정이 있으면 유한 버퍼였다면 정체가
+    생겼을 것이므로 경고를 남긴다 (blocking_pct는 항상 0). 열 순서는 topological_sort를 그대로 사용하고
+    제품 축은 block_size 행씩 나누어 메모리를 O(block_size × 공정 수)로 제한한다.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("maxplus 엔진에는 numpy가 필요합니다. pip install numpy")
+    if _is_stochastic(data):
+        raise ValueError("maxplus 엔진은 결정적 CT만 지원합니다 (cycle_time_dist 사용 시 sequential/event)")
+
+    num_products: int = data.get("num_products", 100)
+    warmup_products: int = data.get("warmup_products", 10)
+    block_size = int(data.get("block_size", 65536))
+
+    ordered = topo.ordered
+    num_procs = topo.num_procs
+    preds = topo.pred_idx
+
+    cycle_times = [float(p["cycle_time_sec"]) for p in ordered]
+    parallel_counts = [int(p.get("parallel_count", 1)) for p in ordered]
+
+    tails = [np.zeros(pc) for pc in parallel_counts]
+    waiting = [np.empty(0) for _ in range(num_procs)]
+
+    working = [0.0] * num_procs
+    starving = [0.0] * num_procs
+    total_wait = [0.0] * num_procs
+    wait_count = [0] * num_procs
+    max_queue = [0] * num_procs
+
+    measure_start_time = 0.0
+    measure_end_time = 0.0
+
+    for block_start in range(0, num_products, block_size):
+        block_end = min(block_start + block_size, num_products)
+        rows = block_end - block_start
+        measured_from = max(warmup_products - block_start, 0)
+        n_measured = max(rows - measured_from, 0)
+        finish: List[Any] = [None] * num_procs
+
+        for j in range(num_procs):
+            ct = cycle_times[j]
+            pc = parallel_counts[j]
+            if preds[j]:
+                arrival = finish[preds[j][0]]
+                for p in preds[j][1:]:
+                    arrival = np.maximum(arrival, finish[p])
+            else:
+                arrival = np.zeros(rows)
+
+            col = _maxplus_column(arrival, tails[j], ct, pc)
+            server_free = np.concatenate((tails[j], col))[:rows]
+            start = np.maximum(arrival, server_free)
+            finish[j] = col
+            tails[j] = np.concatenate((tails[j], col))[-pc:]
+
+            if n_measured:
+                m_arrival = arrival[measured_from:]
+                m_free = server_free[measured_from:]
+                working[j] += ct * n_measured
+                starving[j] += float(np.maximum(m_arrival - m_free, 0.0).sum())
+                total_wait[j] += float((start[measured_from:] - m_arrival).sum())
+                wait_count[j] += n_measured
+                if block_start <= warmup_products < block_end and j == 0:
+                    measure_start_time = float(start[measured_from])
+
+            if preds[j]:
+                # 도착 시점에 아직 시작하지 못한 선행 제품 수 (S는 k에 대해 단조 증가)
+                started = np.concatenate((waiting[j], start))
+                ahead = np.arange(rows) + waiting[j].shape[0]
+                queue = ahead - np.searchsorted(started, arrival, side="right")
+                peak = int(queue.max()) if rows else 0
+                if peak > max_queue[j]:
+                    max_queue[j] = peak
+                waiting[j] = started[started > arrival[-1]]
+
+        if block_end == num_products:
+            measure_end_time = float(max(f[-1] for f in finish))
+
+    _count("products", num_products)
+    _count("station_steps", num_products * num_procs)
+    _count("blocks", -(-num_products // block_size))
+
+    queue_capacities = _queue_capacities(ordered, parallel_counts)
+    overflow = [topo.proc_ids[j] for j in range(num_procs) if preds[j] and max_queue[j] >= queue_capacities[j]]
+    if overflow:
+        log.warning("[simulate] maxplus 엔진은 버퍼 정체를 모델링하지 않습니다: 대기 수가 buffer_capacity에 "
+                    "닿은 공정 %d개 (%s%s) — 정체를 반영하려면 sequential/event 엔진을 사용하세요",
+                    len(overflow), ", ".join(overflow[:5]), " 외" if len(overflow) > 5 else "")
+
+    return _summarize(
+        topo, parallel_counts, working, starving, [0.0] * num_procs,
+        total_wait, wait_count, max_queue,
+        num_products, warmup_products,
+        measure_end_time - measure_start_time, "maxplus",
+    )
+
+
+# ── 반복 실험 (Monte Carlo) ───────────────────────────────
+def _t_quantile(p: float, df: int) -> float:
+    """Student t 분포 분위수 (df 1, 2는 닫힌 해, 그 외 Cornish-Fisher 전개)."""
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) * math.sqrt(2.0 / (4 * p * (1 - p)))
+    z = statistics.NormalDist().inv_cdf(p)
+    z2 = z * z
+    g1 = (z2 + 1) * z / 4
+    g2 = ((5 * z2 + 16) * z2 + 3) * z / 96
+    g3 = (((3 * z2 + 19) * z2 + 17) * z2 - 15) * z / 384
+    g4 = ((((79 * z2 + 776) * z2 + 1482) * z2 - 1920) * z2 - 945) * z / 92160
+    return z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+
+
+def _mean_ci(values: List[float], confidence: float) -> Dict[str, float]:
+    """표본 평균과 t 분포 기반 신뢰구간."""
+    n = len(values)
+    mean = statistics.fmean(values)
+    std = statistics.stdev(values) if n > 1 else 0.0
+    half = _t_quantile(0.5 + confidence / 2, n - 1) * std / math.sqrt(n) if n > 1 else 0.0
+    return {
+        "mean": round(mean, 4),
+        "std": round(std, 4),
+        "half_width": round(half, 4),
+        "ci_low": round(mean - half, 4),
+        "ci_high": round(mean + half, 4),
+    }
+
+
+def _run_replication(data: Dict[str, Any], replication: int,
+                     topo: Optional[_LineTopology] = None) -> Dict[str, Any]:
+    """단일 반복 실행 (ProcessPoolExecutor 작업 단위, 최상위 함수여야 pickle 가능)."""
+    if topo is None:
+        topo = _build_topology(data["processes"])
+    seed = int(data.get("seed", 0))
+    rng = random.Random(_replication_seed(seed, replication))
+    return ENGINES[data.get("engine", "sequential")](data, topo, rng)
+
+
+def _aggregate_replications(runs: List[Dict[str, Any]], data: Dict[str, Any],
+                            confidence: float) -> Dict[str, Any]:
+    """반복 결과 → 평균 기반 동일 스키마 + 신뢰구간."""
+    summaries = [r["simulation_summary"] for r in runs]
+    first = summaries[0]
+    throughput = _mean_ci([s["throughput_uph"] for s in summaries], confidence)
 
     process_analysis: List[Dict[str, Any]] = []
-    total_utilization = 0.0
+    for step_idx, base in enumerate(runs[0]["process_analysis"]):
+        rows = [r["process_analysis"][step_idx] for r in runs]
+        entry = dict(base)
+        for key in ("utilization_pct", "starving_pct", "blocking_pct"):
+            ci = _mean_ci([row[key] for row in rows], confidence)
+            entry[key] = round(ci["mean"], 2)
+            entry[key.replace("_pct", "_ci")] = [round(ci["ci_low"], 2), round(ci["ci_high"], 2)]
+        entry["avg_wait_time_sec"] = round(statistics.fmean(row["avg_wait_time_sec"] for row in rows), 2)
+        entry["max_queue_length"] = max(row["max_queue_length"] for row in rows)
+        process_analysis.append(entry)
 
-    for step_idx in range(num_procs):
-        proc = ordered[step_idx]
-        pc = parallel_counts[step_idx]
+    return {
+        "simulation_summary": {
+            "engine": first["engine"],
+            "total_products": first["total_products"],
+            "warmup_products": first["warmup_products"],
+            "measured_products": first["measured_products"],
+            "total_time_sec": round(statistics.fmean(s["total_time_sec"] for s in summaries), 2),
+            "throughput_uph": round(throughput["mean"], 2),
+            "avg_utilization_pct": round(statistics.fmean(s["avg_utilization_pct"] for s in summaries), 2),
+        },
+        "process_analysis": process_analysis,
+        "replications": {
+            "n_replications": len(runs),
+            "seed": int(data.get("seed", 0)),
+            "confidence": confidence,
+            "throughput_uph": throughput,
+            "per_replication_uph": [s["throughput_uph"] for s in summaries],
+        },
+    }
 
-        total_working = sum(stats_working[step_idx])
-        total_starving_time = sum(stats_starving[step_idx])
-        total_blocking_time = sum(stats_blocking[step_idx])
 
-        total_observed = total_working + total_starving_time + total_blocking_time
-        if total_observed > 0:
-            util_pct = (total_working / total_observed) * 100.0
-            starv_pct = (total_starving_time / total_observed) * 100.0
-            block_pct = (total_blocking_time / total_observed) * 100.0
+def _run_replications(data: Dict[str, Any], n_replications: int,
+                      topo: _LineTopology,
+                      max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """반복 0..n_replications-1을 프로세스 풀에서 병렬 실행 (반복 번호 순서의 결과 목록).
+
+    data["coordinator_address"]가 있으면 로컬 풀 대신 HTTP 코디네이터로 원격 워커에 분배한다.
+    """
+    if data.get("coordinator_address"):
+        return _serve_replications(data, n_replications)
+    if max_workers is None:
+        max_workers = data.get("max_workers")
+    if max_workers is not None:
+        max_workers = max(1, int(max_workers))
+    workers = min(n_replications, max_workers or os.cpu_count() or 1)
+
+    log.info("[simulate] 반복 실험 %d회 (workers=%d)", n_replications, workers)
+    if workers == 1:
+        runs = [_run_replication(data, r, topo) for r in range(n_replications)]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(_run_replication, itertools.repeat(data),
+                                 range(n_replications)))
+    return runs
+
+
+def _simulate_replications(data: Dict[str, Any], n_replications: int,
+                           topo: _LineTopology,
+                           max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """n_replications회 독립 반복을 프로세스 풀에서 병렬 실행 후 집계."""
+    confidence = float(data.get("confidence", 0.95))
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    runs = _run_replications(data, n_replications, topo, max_workers)
+    return _aggregate_replications(runs, data, confidence)
+
+
+# ── 분산 반복 실험 (코디네이터/워커) ─────────────────────
+# 코디네이터는 반복 번호를 작업으로 HTTP로 나눠 주고, 상태 없는 워커가 가져가 실행한 뒤
+# 요약/공정 분석만 gzip JSON으로 돌려준다. 임대 시간 안에 결과가 없으면 작업을 다시 큐에 넣는다.
+DEFAULT_LEASE_SEC = 120.0
+# 원격 작업 입력에서 제거하는 키: 파일 경로/부수 효과(체크포인트 기록, 이벤트 로그 읽기)와 코디네이터 설정
+_REMOTE_STRIPPED_KEYS = ("coordinator_address", "lease_sec", "allow_remote_workers",
+                         "event_log") + _CHECKPOINT_KEYS
+
+
+def _coordinator_bind(address: str) -> tuple:
+    """coordinator_address(HOST:PORT) → 바인딩 주소. HOST 생략 시 루프백(127.0.0.1)."""
+    host, _sep, port = str(address).rpartition(":")
+    return host.strip("[]") or "127.0.0.1", int(port)
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class _JobBoard:
+    """한 번의 반복 실험 작업 상태: 대기 큐, 임대 중 작업(→ 만료 시각), 완료 결과."""
+
+    def __init__(self, data: Dict[str, Any], n_replications: int, lease_sec: float):
+        self.study = input_key(data)[:16]
+        self.payload = gzip.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        self.n_replications = n_replications
+        self.lease_sec = lease_sec
+        self.pending = collections.deque(range(n_replications))
+        self.leased: Dict[int, float] = {}
+        self.results: Dict[int, Dict[str, Any]] = {}
+        self.requeued = 0
+        self.error: Optional[str] = None
+        self.cond = threading.Condition()
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for job, deadline in list(self.leased.items()):
+            if deadline < now:
+                del self.leased[job]
+                self.pending.append(job)
+                self.requeued += 1
+                log.warning("[coordinator] 반복 %d 임대 만료 → 재할당 대기", job)
+
+    def lease(self) -> Optional[int]:
+        with self.cond:
+            self._expire()
+            if not self.pending or self.error is not None:
+                return None
+            job = self.pending.popleft()
+            self.leased[job] = time.monotonic() + self.lease_sec
+            return job
+
+    def complete(self, job: int, result: Optional[Dict[str, Any]], error: Optional[str] = None) -> None:
+        with self.cond:
+            if job in self.results:
+                return  # 재할당된 작업의 늦은 중복 결과 (같은 시드라 값도 같다)
+            if error is not None:
+                self.error = f"반복 {job}: {error}"
+            else:
+                self.leased.pop(job, None)
+                if job in self.pending:
+                    self.pending.remove(job)
+                self.results[job] = result
+            self.cond.notify_all()
+
+    def wait(self) -> List[Dict[str, Any]]:
+        with self.cond:
+            while len(self.results) < self.n_replications and self.error is None:
+                self.cond.wait(timeout=1.0)
+                self._expire()
+            if self.error is not None:
+                raise RuntimeError(f"원격 워커 실행 실패 — {self.error}")
+        return [self.results[r] for r in range(self.n_replications)]
+
+
+class _CoordinatorHandler(http.server.BaseHTTPRequestHandler):
+    """GET /job → 작업 임대, GET /study/<id> → gzip 입력, POST /result → gzip 결과 수신."""
+
+    def _send(self, status: int, body: bytes = b"", gzipped: bool = False) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        board: _JobBoard = self.server.board
+        if self.path == "/job":
+            job = board.lease()
+            if job is None:
+                self._send(204)
+                return
+            self._send(200, json.dumps({"study": board.study, "replication": job}).encode("utf-8"))
+        elif self.path == f"/study/{board.study}":
+            self._send(200, board.payload, gzipped=True)
         else:
-            util_pct = 0.0
-            starv_pct = 0.0
-            block_pct = 0.0
+            self._send(404)
+
+    def do_POST(self) -> None:
+        board: _JobBoard = self.server.board
+        if self.path != "/result":
+            self._send(404)
+            return
+        body = json.loads(gzip.decompress(self.rfile.read(int(self.headers["Content-Length"]))))
+        if body.get("study") != board.study:
+            self._send(409)
+            return
+        board.complete(int(body["replication"]), body.get("result"), body.get("error"))
+        self._send(200)
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        log.debug("[coordinator] %s " + fmt, self.address_string(), *args)
+
+
+def _serve_replications(data: Dict[str, Any], n_replications: int) -> List[Dict[str, Any]]:
+    """data["coordinator_address"](HOST:PORT)에서 작업을 제공하고 모든 반복 결과가 모이면 반환."""
+    host, port = _coordinator_bind(data["coordinator_address"])
+    lease_sec = float(data.get("lease_sec", DEFAULT_LEASE_SEC))
+    job_data = {k: v for k, v in data.items() if k not in _REMOTE_STRIPPED_KEYS}
+    board = _JobBoard(job_data, n_replications, lease_sec)
+
+    server = http.server.ThreadingHTTPServer((host, port), _CoordinatorHandler)
+    server.daemon_threads = True
+    server.board = board
+    thread = threading.Thread(target=server.serve_forever, name="coordinator", daemon=True)
+    thread.start()
+    log.info("[coordinator] %s:%s 에서 반복 %d회 작업 제공 (study=%s, lease=%.0fs)",
+             host, server.server_address[1], n_replications, board.study, lease_sec)
+    try:
+        runs = board.wait()
+    finally:
+        server.shutdown()
+        server.server_close()
+    log.info("[coordinator] 반복 %d회 완료 (재할당 %d회)", n_replications, board.requeued)
+    return runs
+
+
+def run_worker(url: str, idle_timeout: float = 30.0, poll_sec: float = 0.5) -> int:
+    """코디네이터(url)에서 반복 작업을 가져와 실행하고 결과를 돌려주는 상태 없는 워커 루프.
+
+    코디네이터에 idle_timeout초 동안 연결하지 못하면 종료하고 처리한 작업 수를 반환한다.
+    입력은 study별로 한 번만 내려받아 토폴로지와 함께 재사용한다. 받은 입력에서 파일 경로/부수 효과 키
+    (_REMOTE_STRIPPED_KEYS)를 제거하고 _validate로 검사하며, 검사 실패는 작업 오류로 코디네이터에 보고한다.
+    """
+    url = url.rstrip("/")
+    study_id, data, topo = None, None, None
+    done = 0
+    last_contact = time.monotonic()
+    while True:
+        try:
+            with urllib.request.urlopen(f"{url}/job", timeout=10) as resp:
+                job = json.load(resp) if resp.status == 200 else None
+            last_contact = time.monotonic()
+            if job is not None and job["study"] != study_id:
+                with urllib.request.urlopen(f"{url}/study/{job['study']}", timeout=30) as resp:
+                    data = json.loads(gzip.decompress(resp.read()))
+                data = {k: v for k, v in data.items() if k not in _REMOTE_STRIPPED_KEYS}
+                study_id, topo = job["study"], None
+        except OSError as e:
+            if time.monotonic() - last_contact > idle_timeout:
+                log.info("[worker] 코디네이터 응답 없음 (%s) → 종료, 처리 %d건", e, done)
+                return done
+            time.sleep(poll_sec)
+            continue
+        if job is None:
+            time.sleep(poll_sec)
+            continue
+
+        body: Dict[str, Any] = {"study": study_id, "replication": job["replication"]}
+        try:
+            if topo is None:
+                _validate(data)
+                topo = _build_topology(data["processes"])
+            result = _run_replication(data, job["replication"], topo)
+            body["result"] = {"simulation_summary": result["simulation_summary"],
+                              "process_analysis": result["process_analysis"]}
+        except Exception:
+            body["error"] = traceback.format_exc()
+        request = urllib.request.Request(
+            f"{url}/result", data=gzip.compress(json.dumps(body, ensure_ascii=False).encode("utf-8")),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+        try:
+            urllib.request.urlopen(request, timeout=30).close()
+        except OSError as e:
+            log.warning("[worker] 반복 %d 결과 전송 실패: %s", job["replication"], e)
+            continue
+        done += 1
+        log.info("[worker] 반복 %d 완료 (study=%s)", job["replication"], study_id)
+
+
+# ── 시뮬레이션 진입점 ─────────────────────────────────────
+ENGINES = {
+    "sequential": _simulate_sequential,
+    "event": _simulate_event,
+    "maxplus": _simulate_maxplus,
+    "parallel": _simulate_parallel,
+}
+
+
+def _validate(data: Dict[str, Any], allow_auto_warmup: bool = True) -> None:
+    num_products: int = data.get("num_products", 100)
+    warmup_products = data.get("warmup_products", 10)
+
+    engine = data.get("engine", "sequential")
+    if engine not in ENGINES:
+        raise ValueError(f"알 수 없는 engine: {engine} (지원: {', '.join(ENGINES)})")
+
+    for p in data["processes"]:
+        if "buffer_capacity" in p and int(p["buffer_capacity"]) < 1:
+            raise ValueError(f"buffer_capacity must be >= 1 ({p['process_id']})")
+        _validate_dist(p, data.get("cycle_time_dist"))
+
+    window = data.get("timeline_window_sec")
+    if window is not None:
+        if float(window) <= 0:
+            raise ValueError("timeline_window_sec must be positive")
+        if engine != "sequential" or int(data.get("n_replications", 1)) > 1:
+            raise ValueError("timeline_window_sec는 sequential 엔진의 단일 실행에서만 지원합니다")
+
+    if engine == "parallel" and _is_stochastic(data) and not data.get("common_random_numbers"):
+        raise ValueError("engine=\"parallel\"의 확률적 CT는 common_random_numbers가 필요합니다 (공정별 난수열)")
+
+    if data.get("coordinator_address"):
+        if int(data.get("n_replications", 1)) < 2:
+            raise ValueError("coordinator_address는 n_replications >= 2인 반복 실험에서만 사용합니다")
+        if float(data.get("lease_sec", DEFAULT_LEASE_SEC)) <= 0:
+            raise ValueError("lease_sec must be positive")
+        host, _port = _coordinator_bind(data["coordinator_address"])
+        if not _is_loopback(host) and not data.get("allow_remote_workers"):
+            raise ValueError(f"coordinator_address의 외부 주소({host}) 바인딩은 "
+                             "allow_remote_workers=true(--allow-remote-workers)로 명시해야 합니다")
+
+    if data.get("checkpoint_path"):
+        if engine != "sequential" or int(data.get("n_replications", 1)) > 1:
+            raise ValueError("checkpoint_path는 sequential 엔진의 단일 실행에서만 지원합니다")
+        if float(data.get("checkpoint_interval_sec", 5.0)) < 0:
+            raise ValueError("checkpoint_interval_sec must be >= 0")
+
+    if warmup_products == "auto":
+        if not allow_auto_warmup or engine != "sequential" or data.get("adaptive"):
+            raise ValueError("warmup_products=\"auto\"는 sequential 엔진의 고정 길이 실행에서만 지원합니다")
+        if num_products < 2 * MSER_BATCH:
+            raise ValueError(f"warmup_products=\"auto\"는 num_products >= {2 * MSER_BATCH}가 필요합니다")
+        return
 
-        avg_wait = (
-            stats_total_wait[step_idx] / stats_wait_count[step_idx]
-            if stats_wait_count[step_idx] > 0
-            else 0.0
-        )
+    if num_products <= warmup_products:
+        raise ValueError("num_products must be greater than warmup_products")
+
+
+def _simulate_topology(data: Dict[str, Any], topo: _LineTopology,
+                       max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """구성된 토폴로지로 단일 실행 또는 반복 실험 수행."""
+    n_replications = int(data.get("n_replications", 1))
+    if n_replications > 1:
+        return _simulate_replications(data, n_replications, topo, max_workers)
+
+    engine = data.get("engine", "sequential")
+    rng = random.Random(_replication_seed(int(data.get("seed", 0)), 0)) if _is_stochastic(data) else None
+    return ENGINES[engine](data, topo, rng)
+
+
+def simulate(data: Dict[str, Any]) -> Dict[str, Any]:
+    """이산 시뮬레이션 실행 (data["engine"]으로 엔진 선택, 기본 sequential)."""
+    with _phase("validate"):
+        _validate(data)
+    topo = _build_topology(data["processes"])
+    with _phase("simulate"):
+        return _simulate_topology(data, topo)
+
+
+# ── 시나리오 비교 (공통 난수) ─────────────────────────────
+def compare(base: Dict[str, Any], variant: Dict[str, Any],
+            max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """두 입력을 같은 반복 번호끼리 짝지어 실행하고 쌍대 차이(variant - base)의 신뢰구간을 보고.
+
+    반복 수/seed/confidence는 base의 n_replications(기본 10)/seed/confidence를 쓰고,
+    base에서 명시적으로 끄지 않으면 공통 난수(common_random_numbers)를 켠다.
+    끄면 variant는 seed + 1의 독립 난수열로 실행한다 (독립 비교 기준선).
+    같은 반복의 두 시나리오는 공정별 CT 난수열을 공유하므로 차이의 분산이 독립 실행보다 작다.
+    paired_variance_ratio = Var(차이) / (Var(base) + Var(variant)) (독립 실행이면 약 1).
+    """
+    n_replications = max(2, int(base.get("n_replications", 10)))
+    confidence = float(base.get("confidence", 0.95))
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    crn = bool(base.get("common_random_numbers", True))
+    seed = int(base.get("seed", 0))
+
+    scenarios = []
+    for data, scenario_seed in ((base, seed), (variant, seed if crn else seed + 1)):
+        data = {**data, "seed": scenario_seed, "common_random_numbers": crn, "n_replications": 1}
+        data.pop("mode", None)
+        _validate(data)
+        topo = _build_topology(data["processes"])
+        scenarios.append(_run_replications(data, n_replications, topo, max_workers))
+    base_runs, variant_runs = scenarios
+
+    def paired(values_base: List[float], values_variant: List[float]) -> Dict[str, Any]:
+        diffs = [v - b for b, v in zip(values_base, values_variant)]
+        ci = _mean_ci(diffs, confidence)
+        ci["significant"] = ci["ci_low"] > 0 or ci["ci_high"] < 0
+        return ci
+
+    uph_base = [r["simulation_summary"]["throughput_uph"] for r in base_runs]
+    uph_variant = [r["simulation_summary"]["throughput_uph"] for r in variant_runs]
+    independent_var = statistics.variance(uph_base) + statistics.variance(uph_variant)
+    difference = paired(uph_base, uph_variant)
+
+    variant_index = [{pa["process_id"]: pa for pa in r["process_analysis"]} for r in variant_runs]
+    process_differences: List[Dict[str, Any]] = []
+    for step_idx, pa in enumerate(base_runs[0]["process_analysis"]):
+        pid = pa["process_id"]
+        if pid not in variant_index[0]:
+            continue
+        entry: Dict[str, Any] = {"process_id": pid, "name": pa.get("name", "")}
+        for key in ("utilization_pct", "avg_wait_time_sec"):
+            entry[f"{key}_diff"] = paired(
+                [r["process_analysis"][step_idx][key] for r in base_runs],
+                [index[pid][key] for index in variant_index])
+        process_differences.append(entry)
+
+    return {
+        "comparison_summary": {
+            "engine": base.get("engine", "sequential"),
+            "n_replications": n_replications,
+            "seed": seed,
+            "confidence": confidence,
+            "common_random_numbers": crn,
+            "base_throughput_uph": _mean_ci(uph_base, confidence),
+            "variant_throughput_uph": _mean_ci(uph_variant, confidence),
+            "throughput_uph_diff": difference,
+            "paired_variance_ratio": (
+                round(difference["std"] ** 2 / independent_var, 4) if independent_var > 0 else None),
+        },
+        "process_differences": process_differences,
+    }
+
+
+def _variant_input(base: Dict[str, Any], variant: Dict[str, Any]) -> Dict[str, Any]:
+    """{"overrides": {"P001": {...}}} → 공정 필드를 덮어쓴 base 사본."""
+    overrides = variant.get("overrides", {})
+    known = {p["process_id"] for p in base["processes"]}
+    for pid, fields in overrides.items():
+        if pid not in known:
+            raise ValueError(f"variant에 알 수 없는 공정: {pid}")
+        unknown = set(fields) - set(_OVERRIDE_FIELDS)
+        if unknown:
+            raise ValueError(f"variant에서 변경할 수 없는 필드: {sorted(unknown)}")
+    processes = [{**p, **overrides.get(p["process_id"], {})} for p in base["processes"]]
+    return {**base, "processes": processes}
+
+
+# ── 해석적 추정 (analytic) ────────────────────────────────
+_SCHWEITZER_TOL = 1e-6
+
+
+def estimate(data: Dict[str, Any]) -> Dict[str, Any]:
+    """시뮬레이션 없이 처리량/병목/대기를 근사 계산 (mode="analytic").
+
+    - 용량 상한: 공정별 유효 CT = cycle_time_sec / parallel_count, 최대값이 병목
+    - 임계 경로: 선행 DAG에서 CT 합이 최대인 경로 (제품 1개의 최소 리드타임)
+    - 폐쇄 대기행렬망 근사 MVA (Schweitzer): 다중 서버는 Seidmann 근사(CT/c 단일 서버 + CT(c-1)/c 지연),
+      분기/합류는 체류 시간의 최장 경로를 사이클로 보고 X(N) = N / L(N)로 처리량을 구한다.
+      정확 MVA의 n = 1..N 점화 대신 N에서의 고정점만 풀어 비용이 모집단 크기와 무관하다.
+      모집단(wip_population)은 기본적으로 공정별 서버 수 + 버퍼 용량(buffer_capacity, 기본 2 × 병렬 수)의 합이다.
+    """
+    topo = _build_topology(data["processes"])
+    ordered = topo.ordered
+    num_procs = topo.num_procs
+    preds = topo.pred_idx
+
+    cycle_times = [float(p["cycle_time_sec"]) for p in ordered]
+    parallel_counts = [int(p.get("parallel_count", 1)) for p in ordered]
+    effective = [ct / pc for ct, pc in zip(cycle_times, parallel_counts)]
+    queue_demand = effective
+    delay_demand = [ct - e for ct, e in zip(cycle_times, effective)]
+
+    bottleneck = max(range(num_procs), key=lambda j: effective[j]) if num_procs else None
+    capacity_uph = 3600.0 / effective[bottleneck] if num_procs and effective[bottleneck] > 0 else 0.0
+
+    def longest_path(weights: List[float]) -> tuple:
+        dist = [0.0] * num_procs
+        back = [-1] * num_procs
+        for j in range(num_procs):
+            best = -1
+            for p in preds[j]:
+                if best < 0 or dist[p] > dist[best]:
+                    best = p
+            dist[j] = weights[j] + (dist[best] if best >= 0 else 0.0)
+            back[j] = best
+        end = max(range(num_procs), key=lambda j: dist[j]) if num_procs else -1
+        return (dist[end] if end >= 0 else 0.0), end, back
+
+    critical_sec, end, back = longest_path(cycle_times)
+    critical_path: List[str] = []
+    while end >= 0:
+        critical_path.append(topo.proc_ids[end])
+        end = back[end]
+    critical_path.reverse()
+
+    population = data.get("wip_population")
+    if population is None:
+        population = sum(parallel_counts) + sum(_queue_capacities(ordered, parallel_counts))
+    elif int(population) < 1:
+        raise ValueError("wip_population must be >= 1")
+    population = int(population)
+    # Schweitzer 근사 Q_j(N-1) ≈ s × Q_j(N), s = (N-1)/N 에서 처리량 X가 주어지면
+    # Q_j = X × dq_j / (1 - s × X × dq_j) 로 닫힌 형태가 되고 X × L(X)는 X에 대해 증가하므로,
+    # N = X × L(X)의 근을 이분법으로 찾는다. 비용은 O(반복 × 공정)으로 모집단 크기와 무관하다.
+    steps = list(zip(range(num_procs), queue_demand, delay_demand, preds))
+    shrink = (population - 1) / population
+    queue = [0.0] * num_procs
+    residence = list(cycle_times)
+    dist = [0.0] * num_procs
+
+    def cycle_at(x: float) -> float:
+        cycle = 0.0
+        for j, dq, dd, pj in steps:
+            rq = dq / max(1.0 - shrink * x * dq, 1e-12)
+            queue[j] = x * rq
+            residence[j] = rq + dd
+            d = rq + dd + (max(dist[p] for p in pj) if pj else 0.0)
+            dist[j] = d
+            if d > cycle:
+                cycle = d
+        return cycle
+
+    lo = 0.0
+    base_cycle = cycle_at(0.0)
+    hi = population / base_cycle if base_cycle > 0 else 0.0
+    max_demand = max(queue_demand, default=0.0)
+    if shrink > 0 and max_demand > 0:
+        hi = min(hi, 1.0 / (shrink * max_demand))
+    while hi - lo > _SCHWEITZER_TOL * hi:
+        mid = (lo + hi) / 2.0
+        if mid * cycle_at(mid) > population:
+            hi = mid
+        else:
+            lo = mid
+    throughput = lo
+    cycle_at(throughput)
 
+    throughput_uph = min(throughput * 3600.0, capacity_uph)
+    rate = throughput_uph / 3600.0
+
+    process_analysis: List[Dict[str, Any]] = []
+    total_utilization = 0.0
+    for j, proc in enumerate(ordered):
+        util_pct = min(rate * effective[j] * 100.0, 100.0)
         process_analysis.append({
             "process_id": proc["process_id"],
             "name": proc.get("name", ""),
-            "cycle_time_sec": float(proc["cycle_time_sec"]),
-            "parallel_count": pc,
+            "cycle_time_sec": cycle_times[j],
+            "parallel_count": parallel_counts[j],
+            "effective_ct_sec": round(effective[j], 2),
             "utilization_pct": round(util_pct, 2),
-            "starving_pct": round(starv_pct, 2),
-            "blocking_pct": round(block_pct, 2),
-            "avg_wait_time_sec": round(avg_wait, 2),
-            "max_queue_length": stats_max_queue[step_idx],
+            "starving_pct": round(100.0 - util_pct, 2),
+            "blocking_pct": 0.0,
+            "avg_wait_time_sec": round(residence[j] - cycle_times[j], 2),
+            "avg_queue_length": round(queue[j], 2),
         })
         total_utilization += util_pct
 
-    avg_utilization = total_utilization / num_procs if num_procs > 0 else 0.0
-
     return {
         "simulation_summary": {
-            "total_products": num_products,
-            "warmup_products": warmup_products,
-            "measured_products": measured_products,
-            "total_time_sec": round(total_time, 2),
+            "engine": "analytic",
             "throughput_uph": round(throughput_uph, 2),
-            "avg_utilization_pct": round(avg_utilization, 2),
+            "capacity_uph": round(capacity_uph, 2),
+            "bottleneck_process_id": topo.proc_ids[bottleneck] if bottleneck is not None else None,
+            "critical_path_sec": round(critical_sec, 2),
+            "critical_path": critical_path,
+            "wip_population": population,
+            "avg_utilization_pct": round(total_utilization / num_procs, 2) if num_procs else 0.0,
         },
         "process_analysis": process_analysis,
     }
 
 
+# ── 제품별 트레이스 스트리밍 ─────────────────────────────
+def iter_trace(data: Dict[str, Any], chunk_products: int = 256) -> Iterator[Dict[str, Any]]:
+    """시뮬레이션을 진행하면서 제품×공정 통과 기록을 순차적으로 생성 (sequential 엔진).
+
+    chunk_products개 제품씩 계산한 뒤 해당 구간의 기록만 내보내므로 메모리는
+    O(chunk_products × 공정 수)로 제한된다. 생성기 반환값(StopIteration.value)은
+    simulate()와 동일한 결과 dict이다. 입력 검증과 토폴로지 구성은 호출 시점에 바로 수행하고
+    (잘못된 입력은 첫 next()가 아니라 여기서 예외), 기록 생성기를 반환한다.
+    """
+    _validate(data, allow_auto_warmup=False)
+    if data.get("engine", "sequential") != "sequential":
+        raise ValueError("트레이스 모드는 sequential 엔진만 지원합니다")
+    if int(data.get("n_replications", 1)) > 1:
+        raise ValueError("트레이스 모드는 단일 실행(n_replications=1)만 지원합니다")
+
+    topo = _build_topology(data["processes"])
+    rng = random.Random(_replication_seed(int(data.get("seed", 0)), 0)) if _is_stochastic(data) else None
+    samplers = _cycle_time_samplers(data, topo, rng)
+    return _trace_records(data, topo, samplers, max(1, int(chunk_products)))
+
+
+def _trace_records(data: Dict[str, Any], topo: _LineTopology, samplers: List[Any],
+                   chunk_products: int) -> Iterator[Dict[str, Any]]:
+    num_products: int = data.get("num_products", 100)
+    warmup_products: int = data.get("warmup_products", 10)
+    cycle_times = [float(p["cycle_time_sec"]) for p in topo.ordered]
+    parallel_counts = [int(p.get("parallel_count", 1)) for p in topo.ordered]
+    queue_capacities = _queue_capacities(topo.ordered, parallel_counts)
+
+    state = _SequentialState(parallel_counts)
+    plan = [(j, True, topo.succ_idx[j]) for j in range(topo.num_procs)]
+    proc_ids = topo.proc_ids
+    buffer: List[tuple] = []
+
+    for lo in range(0, num_products, chunk_products):
+        hi = min(lo + chunk_products, num_products)
+        _sequential_advance(state, plan, topo.pred_idx, cycle_times, samplers, queue_capacities,
+                            range(lo, hi), warmup_products, num_products, trace=buffer.append)
+        for prod_idx, step_idx, srv, start, finish, wait, block in buffer:
+            yield {
+                "product": prod_idx,
+                "process_id": proc_ids[step_idx],
+                "server": srv,
+                "start": start,
+                "finish": finish,
+                "wait": wait,
+                "block": block,
+            }
+        buffer.clear()
+
+    return _summarize_sequential(topo, parallel_counts, state, num_products, warmup_products)
+
+
+def write_trace(data: Dict[str, Any], path: str, chunk_products: int = 256) -> Dict[str, Any]:
+    """iter_trace() 기록을 NDJSON 파일로 스트리밍 저장 (.gz 확장자면 gzip 압축) 후 결과 반환."""
+    opener = gzip.open if path.endswith(".gz") else open
+    records = 0
+    trace = iter_trace(data, chunk_products)  # 잘못된 입력이면 파일을 만들기 전에 예외
+    with opener(path, "wt", encoding="utf-8") as f:
+        while True:
+            try:
+                record = next(trace)
+            except StopIteration as stop:
+                result = stop.value
+                break
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+            records += 1
+    log.info("[trace] %d건 기록 → %s", records, path)
+    result["trace"] = {"path": path, "records": records}
+    return result
+
+
+# ── 실측 이벤트 로그 재생 ─────────────────────────────────
+# 이벤트 로그 열 이름 (앞의 것 우선)
+_EVENT_TIME_KEYS = ("timestamp", "ts", "time")
+
+
+def _event_time(value: Any) -> float:
+    """숫자(초) 또는 ISO 8601 문자열 → 초."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def read_event_log(path: str) -> Iterator[tuple]:
+    """CSV 또는 NDJSON(.gz 가능) 공정 이벤트 로그를 한 줄씩 읽어 (시각, process_id, 이벤트) 생성.
+
+    필요한 필드는 timestamp(또는 ts/time, 초 또는 ISO 8601), process_id, event(start|finish)이며
+    나머지 열(product_id, server 등)은 무시한다. 확장자가 .csv(.gz)가 아니면 NDJSON으로 읽는다.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        if path.endswith((".csv", ".csv.gz")):
+            reader = csv.reader(f)
+            header = next(reader)
+            missing = [k for k in ("process_id", "event") if k not in header]
+            ts_col = next((header.index(k) for k in _EVENT_TIME_KEYS if k in header), None)
+            if missing or ts_col is None:
+                raise ValueError(f"이벤트 로그 CSV 헤더에 {missing or ['timestamp']} 열이 없습니다: {path}")
+            pid_col = header.index("process_id")
+            ev_col = header.index("event")
+            for row in reader:
+                if row:
+                    yield _event_time(row[ts_col]), row[pid_col], row[ev_col]
+        else:
+            for line in f:
+                if line.strip():
+                    rec = json.loads(line)
+                    ts = next((rec[k] for k in _EVENT_TIME_KEYS if k in rec), None)
+                    if ts is None:
+                        raise ValueError(f"이벤트에 timestamp가 없습니다: {line.strip()}")
+                    yield _event_time(ts), rec["process_id"], rec["event"]
+
+
+class _ReplayState:
+    """이벤트 로그 재생 중 공정/간선별 카운터와 시간 적분 (메모리 O(공정 수 + 간선 수)).
+
+    라인 모델은 event 엔진과 같다: 공정 s의 선행 공정별 입력 버퍼 용량은 buffer_capacity
+    (기본 parallel_count * 2), 완료품은 모든 후속 버퍼에 자리가 날 때까지 서버를 점유(정체),
+    합류 공정은 선행 공정별 버퍼에서 1개씩 꺼내 시작한다. 로그에는 시작/완료만 있으므로
+    정체는 이 모델로 추론하고, 유휴 서버(병렬 수 - 작업 - 정체) 시간을 대기(starving)로 본다.
+    모든 서버가 작업/정체 중인데 시작 이벤트가 오면 정체품 하나가 빠져나간 것으로 보정한다.
+    평균 대기 시간은 대기열 길이 적분 / 시작 수(리틀의 법칙)이다.
+    """
+
+    def __init__(self, topo: _LineTopology, parallel_counts: List[int], queue_capacities: List[int]):
+        n = topo.num_procs
+        self.topo = topo
+        self.parallel_counts = parallel_counts
+        self.in_edges: List[tuple] = []
+        self.out_edges: List[tuple] = []
+        edge_ids: Dict[tuple, int] = {}
+        for s in range(n):
+            for u in topo.pred_idx[s]:
+                edge_ids[(u, s)] = len(edge_ids)
+        # 간선 = (간선 인덱스, 상대 공정): 입력 간선은 선행 공정, 출력 간선은 후속 공정
+        for j in range(n):
+            self.in_edges.append(tuple((edge_ids[(u, j)], u) for u in topo.pred_idx[j]))
+            self.out_edges.append(tuple((edge_ids[(j, s)], s) for s in topo.succ_idx[j]))
+        self.edge_count = array("q", bytes(8 * len(edge_ids)))
+        self.edge_cap = array("q", bytes(8 * len(edge_ids)))
+        for (_u, s), e in edge_ids.items():
+            self.edge_cap[e] = queue_capacities[s]
+
+        self.busy = array("q", bytes(8 * n))
+        self.blocked = array("q", bytes(8 * n))
+        self.queue = array("q", bytes(8 * n))
+        self.max_queue = array("q", bytes(8 * n))
+        self.starts = array("q", bytes(8 * n))
+        self.finishes = array("q", bytes(8 * n))
+        self.working = array("d", bytes(8 * n))
+        self.starving = array("d", bytes(8 * n))
+        self.blocking = array("d", bytes(8 * n))
+        self.queue_area = array("d", bytes(8 * n))
+        self.last = array("d", bytes(8 * n))
+        self.anomalies: Dict[str, int] = collections.Counter()
+        self.events = 0
+        self.first_time: Optional[float] = None
+        self.last_time: Optional[float] = None
+
+    def feed(self, events: Iterator[tuple]) -> None:
+        """(시각, process_id, "start"|"finish") 이벤트를 순서대로 반영 (여러 번 나눠 호출 가능).
+
+        공정별 배열을 지역 변수로 풀어 두고 이벤트마다 해당 공정과 인접 버퍼만 적분/갱신한다.
+        """
+        index = self.topo.proc_index
+        parallel_counts = self.parallel_counts
+        in_edges, out_edges = self.in_edges, self.out_edges
+        edge_count, edge_cap = self.edge_count, self.edge_cap
+        busy, blocked, queue_len, max_queue = self.busy, self.blocked, self.queue, self.max_queue
+        starts, finishes = self.starts, self.finishes
+        working, starving, blocking, queue_area = self.working, self.starving, self.blocking, self.queue_area
+        last = self.last
+        anomalies = self.anomalies
+
+        def advance(j: int, t: float) -> None:
+            dt = t - last[j]
+            if dt > 0:
+                b, k = busy[j], blocked[j]
+                working[j] += b * dt
+                if k:
+                    blocking[j] += k * dt
+                idle = parallel_counts[j] - b - k
+                if idle > 0:
+                    starving[j] += idle * dt
+                if queue_len[j]:
+                    queue_area[j] += queue_len[j] * dt
+                last[j] = t
+
+        def push(j: int, t: float) -> None:
+            """j의 완료품 하나를 모든 후속 버퍼에 넣는다."""
+            for e, s in out_edges[j]:
+                advance(s, t)
+                c = edge_count[e] + 1
+                edge_count[e] = c
+                inputs = in_edges[s]
+                q = c if len(inputs) == 1 else min([edge_count[i] for i, _u in inputs])
+                queue_len[s] = q
+                if q > max_queue[s]:
+                    max_queue[s] = q
+
+        def release(u: int, t: float) -> None:
+            """u의 정체 완료품을 후속 버퍼 모두에 자리가 있는 만큼 내보낸다."""
+            out = out_edges[u]
+            while blocked[u] > 0:
+                for e, _s in out:
+                    if edge_count[e] >= edge_cap[e]:
+                        return
+                advance(u, t)
+                blocked[u] -= 1
+                push(u, t)
+
+        count = self.events
+        first, prev = self.first_time, self.last_time
+        for t, pid, kind in events:
+            j = index.get(pid)
+            if j is None:
+                anomalies["unknown_process"] += 1
+                continue
+            if kind != "start" and kind != "finish":
+                anomalies["unknown_event"] += 1
+                continue
+            if first is None:
+                first = prev = t
+                for i in range(len(last)):
+                    last[i] = t
+            elif t < prev:
+                anomalies["out_of_order"] += 1
+                t = prev
+            prev = t
+            count += 1
+            advance(j, t)
+
+            if kind == "start":
+                if busy[j] + blocked[j] >= parallel_counts[j]:
+                    if blocked[j] > 0:
+                        # 로그상 서버가 새 작업을 시작했으므로 정체품 하나는 버퍼 용량을 넘겨 빠져나갔다
+                        blocked[j] -= 1
+                        anomalies["forced_release"] += 1
+                        push(j, t)
+                    else:
+                        anomalies["over_parallel_count"] += 1
+                busy[j] += 1
+                starts[j] += 1
+                inputs = in_edges[j]
+                if not inputs:
+                    continue
+                if queue_len[j] <= 0:
+                    anomalies["start_without_input"] += 1
+                    continue
+                for e, _u in inputs:
+                    edge_count[e] -= 1
+                queue_len[j] -= 1
+                for _e, u in inputs:
+                    if blocked[u]:
+                        release(u, t)
+            else:
+                if busy[j] > 0:
+                    busy[j] -= 1
+                else:
+                    anomalies["finish_without_start"] += 1
+                finishes[j] += 1
+                if out_edges[j]:
+                    blocked[j] += 1
+                    release(j, t)
+
+        self.events, self.first_time, self.last_time = count, first, prev
+
+    def close(self) -> None:
+        """모든 공정의 적분을 마지막 이벤트 시각까지 진행."""
+        for j in range(len(self.last)):
+            dt = self.last_time - self.last[j]
+            if dt > 0:
+                b, k = self.busy[j], self.blocked[j]
+                self.working[j] += b * dt
+                self.blocking[j] += k * dt
+                self.starving[j] += max(self.parallel_counts[j] - b - k, 0) * dt
+                self.queue_area[j] += self.queue[j] * dt
+                self.last[j] = self.last_time
+
+
+def replay(data: Dict[str, Any], events: Any = None) -> Dict[str, Any]:
+    """실측 공정 이벤트를 BOP 라인 모델에 시간 순으로 흘려 부하/대기/정체 KPI를 산출.
+
+    events는 로그 경로(기본 data["event_log"], read_event_log 형식) 또는 (시각, process_id,
+    "start"|"finish") 반복자이다. 이벤트를 한 건씩 처리하며 해당 공정과 인접 버퍼만 갱신하므로
+    메모리는 O(공정 수)이고 로그 크기와 무관하다. 처리량은 완료 공정(후속 공정 없음) 중 최소
+    완료 수 / 로그 구간으로 계산하고, 로그와 모델이 맞지 않는 이벤트 수를 replay.anomalies에 보고한다.
+    """
+    if events is None:
+        if not data.get("event_log"):
+            raise ValueError("mode=\"replay\"에는 event_log(이벤트 로그 경로)가 필요합니다")
+        events = read_event_log(data["event_log"])
+    elif isinstance(events, str):
+        events = read_event_log(events)
+
+    topo = _build_topology(data["processes"])
+    parallel_counts = [int(p.get("parallel_count", 1)) for p in topo.ordered]
+    state = _ReplayState(topo, parallel_counts, _queue_capacities(topo.ordered, parallel_counts))
+    with _phase("simulate"):
+        state.feed(events)
+        if state.first_time is None:
+            raise ValueError("재생할 이벤트가 없습니다")
+        state.close()
+    _count("events", state.events)
+
+    span = state.last_time - state.first_time
+    completed = min(state.finishes[j] for j in range(topo.num_procs) if not topo.succ_idx[j])
+    log.info("[replay] 이벤트 %d건, 구간 %.0f초, 완료 %d개", state.events, span, completed)
+
+    result = _summarize(
+        topo, parallel_counts,
+        state.working, state.starving, state.blocking,
+        state.queue_area, state.starts, state.max_queue,
+        completed, 0, span, "replay",
+    )
+    result["replay"] = {
+        "events": state.events,
+        "first_event_time": state.first_time,
+        "last_event_time": state.last_time,
+        "anomalies": dict(state.anomalies),
+    }
+    return result
+
+
+# ── 배치 what-if 스윕 ─────────────────────────────────────
+# 변형(variant)에서 공정별로 덮어쓸 수 있는 필드
+_OVERRIDE_FIELDS = ("parallel_count", "cycle_time_sec", "cycle_time_dist", "buffer_capacity")
+
+BATCH_COLUMNS = [
+    "variant", "throughput_uph", "total_time_sec", "avg_utilization_pct",
+    "bottleneck_process_id", "bottleneck_utilization_pct",
+]
+
+# 프로세스 풀 워커별 공유 상태 (initializer로 1회 전달): (base data, topology)
+_batch_context: Optional[tuple] = None
+
+
+def expand_grid(grid: Dict[str, Dict[str, List[Any]]]) -> List[Dict[str, Any]]:
+    """{"P001": {"parallel_count": [1, 2]}, ...} → 모든 조합의 variant 목록."""
+    axes = [(pid, field, values)
+            for pid, fields in grid.items()
+            for field, values in fields.items()]
+    variants: List[Dict[str, Any]] = []
+    for combo in itertools.product(*(values for _pid, _field, values in axes)):
+        overrides: Dict[str, Dict[str, Any]] = {}
+        labels = []
+        for (pid, field, _values), value in zip(axes, combo):
+            overrides.setdefault(pid, {})[field] = value
+            labels.append(f"{pid}.{field}={value}")
+        variants.append({"name": ",".join(labels), "overrides": overrides})
+    return variants
+
+
+def _apply_overrides(topo: _LineTopology,
+                     overrides: Dict[str, Dict[str, Any]]) -> _LineTopology:
+    """선후행 맵은 그대로 공유하고 덮어쓴 공정 dict만 교체한 토폴로지."""
+    ordered = list(topo.ordered)
+    for pid, fields in overrides.items():
+        if pid not in topo.proc_index:
+            raise ValueError(f"variant에 알 수 없는 공정: {pid}")
+        unknown = set(fields) - set(_OVERRIDE_FIELDS)
+        if unknown:
+            raise ValueError(f"variant에서 변경할 수 없는 필드: {sorted(unknown)}")
+        idx = topo.proc_index[pid]
+        ordered[idx] = {**ordered[idx], **fields}
+    return _LineTopology(ordered, topo.proc_ids, topo.proc_index, topo.pred_idx, topo.succ_idx)
+
+
+def _evaluate_variant(data: Dict[str, Any], topo: _LineTopology,
+                      variant: Dict[str, Any]) -> List[Any]:
+    """variant 1개 실행 → 결과 표의 한 행 (BATCH_COLUMNS 순서)."""
+    if "num_products" in variant:
+        data = {**data, "num_products": variant["num_products"]}
+    result = _simulate_topology(data, _apply_overrides(topo, variant.get("overrides", {})),
+                                max_workers=1)
+    summary = result["simulation_summary"]
+    bottleneck = max(result["process_analysis"], key=lambda pa: pa["utilization_pct"])
+    return [
+        variant.get("name", ""),
+        summary["throughput_uph"],
+        summary["total_time_sec"],
+        summary["avg_utilization_pct"],
+        bottleneck["process_id"],
+        bottleneck["utilization_pct"],
+    ]
+
+
+def _init_batch_worker(data: Dict[str, Any], topo: _LineTopology) -> None:
+    global _batch_context
+    _batch_context = (data, topo)
+
+
+def _run_batch_variant(variant: Dict[str, Any]) -> List[Any]:
+    data, topo = _batch_context
+    return _evaluate_variant(data, topo, variant)
+
+
+def _batch_workers(base: Dict[str, Any], n_variants: Optional[int] = None) -> int:
+    max_workers = base.get("max_workers")
+    workers = int(max_workers) if max_workers else (os.cpu_count() or 1)
+    if n_variants is not None:
+        workers = min(workers, n_variants)
+    return max(workers, 1)
+
+
+def batch_pool(base: Dict[str, Any]) -> Optional[concurrent.futures.Executor]:
+    """simulate_batch(base, ..., pool=)를 여러 번 호출하는 탐색용 프로세스 풀 (워커 1개면 None).
+
+    기준 입력과 토폴로지는 initializer로 워커마다 한 번만 전달되므로, 같은 base로 호출하는
+    동안에만 재사용해야 한다. 호출자가 shutdown()한다.
+    """
+    _validate(base)
+    workers = _batch_workers(base)
+    if workers == 1:
+        return None
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_batch_worker,
+        initargs=(base, _build_topology(base["processes"])))
+
+
+def simulate_batch(base: Dict[str, Any],
+                   variants: Optional[List[Dict[str, Any]]] = None,
+                   pool: Optional[concurrent.futures.Executor] = None) -> Dict[str, Any]:
+    """기준 입력 + variant 목록(또는 base["grid"])을 한 번에 평가하여 결과 표 반환.
+
+    variant 형식: {"name": "...", "overrides": {"P001": {"parallel_count": 2}}}
+    ("num_products"를 주면 그 variant만 해당 제품 수로 실행)
+    위상정렬/선후행 맵은 한 번만 구성하여 모든 variant가 공유하고,
+    variant들은 ProcessPoolExecutor(max_workers)로 병렬 평가한다.
+    pool: 같은 base의 batch_pool() — 반복 탐색에서 라운드마다 풀을 새로 띄우지 않는다.
+    """
+    _validate(base)
+    if variants is None:
+        variants = list(base.get("variants", []))
+        if base.get("grid"):
+            variants.extend(expand_grid(base["grid"]))
+    if base.get("include_base", True):
+        variants = [{"name": "base", "overrides": {}}] + list(variants)
+    if not variants:
+        raise ValueError("평가할 variant가 없습니다")
+
+    topo = _build_topology(base["processes"])
+    warmup = base.get("warmup_products", 10)
+    for variant in variants:
+        for proc in _apply_overrides(topo, variant.get("overrides", {})).ordered:
+            _validate_dist(proc, base.get("cycle_time_dist"))
+        if "num_products" in variant and not (isinstance(warmup, int)
+                                              and int(variant["num_products"]) > warmup):
+            raise ValueError("variant의 num_products는 정수 warmup_products보다 커야 합니다")
+
+    workers = _batch_workers(base, len(variants))
+    log.info("[simulate_batch] variant %d개 (workers=%d%s)", len(variants), workers,
+             ", 공유 풀" if pool is not None else "")
+
+    if pool is not None:
+        chunksize = max(1, len(variants) // (workers * 4))
+        rows = list(pool.map(_run_batch_variant, variants, chunksize=chunksize))
+    elif workers == 1:
+        rows = [_evaluate_variant(base, topo, v) for v in variants]
+    else:
+        chunksize = max(1, len(variants) // (workers * 4))
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_batch_worker,
+                initargs=(base, topo)) as pool:
+            rows = list(pool.map(_run_batch_variant, variants, chunksize=chunksize))
+
+    best = max(range(len(rows)), key=lambda i: rows[i][1])
+    return {
+        "batch_summary": {
+            "n_variants": len(rows),
+            "engine": base.get("engine", "sequential"),
+            "best_variant": rows[best][0],
+            "best_throughput_uph": rows[best][1],
+        },
+        "columns": BATCH_COLUMNS,
+        "rows": rows,
+    }
+
+
+# ── 민감도 분석 ───────────────────────────────────────────
+SENSITIVITY_COLUMNS = [
+    "rank", "process_id", "name", "cycle_time_sec", "parallel_count",
+    "d_uph_d_ct", "ct_elasticity", "d_uph_d_parallel", "parallel_gain_pct",
+]
+
+
+def sensitivity(base: Dict[str, Any], ct_step: Optional[float] = None) -> Dict[str, Any]:
+    """공정별 처리량 민감도를 한 번의 배치 평가로 계산 (mode="sensitivity").
+
+    공정마다 CT를 ct_step(기본 5%)만큼 줄인 variant와 parallel_count를 1 늘린 variant를
+    만들어 기준 입력과 함께 simulate_batch()로 병렬 평가한다 (공정 N개 → 2N + 1회 실행).
+    확률적 CT면 variant 간 잡음을 줄이도록 공통 난수를 기본으로 켠다.
+
+        d_uph_d_ct        = ΔUPH / ΔCT (UPH/초, 음수면 CT 단축이 처리량을 늘림)
+        ct_elasticity     = (ΔUPH / UPH) / (ΔCT / CT)
+        d_uph_d_parallel  = 서버 1대 추가 시 ΔUPH
+
+    결과 표는 ct_elasticity 오름차순(CT 단축 효과가 큰 공정부터), 같으면 d_uph_d_parallel
+    내림차순으로 순위를 매긴다.
+    """
+    step = float(ct_step if ct_step is not None else base.get("sensitivity_ct_step", 0.05))
+    if not 0 < step < 1:
+        raise ValueError("sensitivity_ct_step must be between 0 and 1")
+
+    data = {k: v for k, v in base.items() if k not in ("mode", "variants", "grid")}
+    data["include_base"] = True
+    if _is_stochastic(data):
+        data.setdefault("common_random_numbers", True)
+
+    processes = data["processes"]
+    variants: List[Dict[str, Any]] = []
+    for p in processes:
+        pid = p["process_id"]
+        ct = float(p["cycle_time_sec"])
+        pc = int(p.get("parallel_count", 1))
+        faster: Dict[str, Any] = {"cycle_time_sec": ct * (1 - step)}
+        dist = p.get("cycle_time_dist", data.get("cycle_time_dist"))
+        if dist and dist.get("type") == "triangular":
+            # 구간도 같은 비율로 줄여야 mode(기본값 CT)가 [min, max] 안에 남는다
+            faster["cycle_time_dist"] = {**dist, **{k: float(dist[k]) * (1 - step)
+                                                    for k in ("min", "max", "mode") if k in dist}}
+        variants.append({"name": f"{pid}.cycle_time_sec={ct * (1 - step):g}",
+                         "overrides": {pid: faster}})
+        variants.append({"name": f"{pid}.parallel_count={pc + 1}",
+                         "overrides": {pid: {"parallel_count": pc + 1}}})
+
+    batch = simulate_batch(data, variants)
+    rows = batch["rows"]
+    base_uph = rows[0][1]
+
+    table = []
+    for i, p in enumerate(processes):
+        ct = float(p["cycle_time_sec"])
+        ct_uph = rows[1 + 2 * i][1]
+        pc_uph = rows[2 + 2 * i][1]
+        d_ct = -ct * step
+        d_uph_ct = ct_uph - base_uph
+        d_uph_pc = pc_uph - base_uph
+        elasticity = (d_uph_ct / base_uph) / (d_ct / ct) if base_uph > 0 and ct > 0 else 0.0
+        table.append([
+            0, p["process_id"], p.get("name", ""), ct, int(p.get("parallel_count", 1)),
+            round(d_uph_ct / d_ct, 4) + 0.0 if d_ct else 0.0,
+            round(elasticity, 4) + 0.0,
+            round(d_uph_pc, 2) + 0.0,
+            round(d_uph_pc / base_uph * 100.0, 2) + 0.0 if base_uph > 0 else 0.0,
+        ])
+    table.sort(key=lambda row: (row[6], -row[7]))
+    for rank, row in enumerate(table, 1):
+        row[0] = rank
+
+    return {
+        "sensitivity_summary": {
+            "engine": data.get("engine", "sequential"),
+            "base_throughput_uph": base_uph,
+            "ct_step": step,
+            "n_variants": batch["batch_summary"]["n_variants"],
+            "top_ct_process_id": table[0][1] if table else None,
+            "top_parallel_process_id": max(table, key=lambda row: row[7])[1] if table else None,
+        },
+        "columns": SENSITIVITY_COLUMNS,
+        "rows": table,
+    }
+
+
+# ── 버퍼 용량 최적화 ──────────────────────────────────────
+def optimize_buffers(data: Dict[str, Any], target_uph: Optional[float] = None,
+                     total_buffer: Optional[int] = None) -> Dict[str, Any]:
+    """target_uph를 만족하는 최소 버퍼 배분을 시뮬레이션 탐색으로 구한다 (mode="optimize_buffers").
+
+    대상은 선행 공정이 있는 공정의 buffer_capacity이다 (투입 공정의 대기열은 정체에 관여하지 않음).
+    1) 모든 대상 공정 1에서 시작해, 라운드마다 각 공정 +1 이웃을 simulate_batch()로 병렬 평가하고
+       UPH가 가장 많이 오르는 이웃으로 이동한다 (개선이 없으면 +2, +4, ... 로 보폭을 늘려 재시도).
+    2) 목표를 만족하면 -1 이웃 중 목표를 유지하는 것을 반복 적용해 국소 최소 배분으로 줄인다.
+    total_buffer(대상 공정 합계 상한)와 max_buffer_per_process(기본 50)가 탐색 범위를 제한하고,
+    같은 배분은 메모 캐시로 한 번만 평가한다. 확률적 CT면 공통 난수를 기본으로 켠다.
+    """
+    target = float(target_uph if target_uph is not None else data.get("target_uph", 0))
+    if target <= 0:
+        raise ValueError("target_uph must be positive")
+    budget = total_buffer if total_buffer is not None else data.get("total_buffer")
+    max_per_process = int(data.get("max_buffer_per_process", 50))
+
+    base = {k: v for k, v in data.items() if k not in ("mode", "variants", "grid")}
+    base["include_base"] = False
+    if _is_stochastic(base):
+        base.setdefault("common_random_numbers", True)
+    _validate(base)
+
+    topo = _build_topology(base["processes"])
+    targets = [p for p in topo.ordered if p.get("predecessor_ids")]
+    pids = [p["process_id"] for p in targets]
+    n = len(pids)
+    budget = int(budget) if budget is not None else n * max_per_process
+    if budget < n:
+        raise ValueError(f"total_buffer must be >= {n} (대상 공정당 최소 1)")
+
+    memo: Dict[tuple, float] = {}
+    rounds = 0
+
+    def evaluate(plans: List[tuple]) -> List[float]:
+        nonlocal rounds
+        pending = [plan for plan in dict.fromkeys(plans) if plan not in memo]
+        if pending:
+            rounds += 1
+            variants = [{"name": ",".join(map(str, plan)),
+                         "overrides": {pid: {"buffer_capacity": c} for pid, c in zip(pids, plan)}}
+                        for plan in pending]
+            for plan, row in zip(pending, simulate_batch(base, variants)["rows"]):
+                memo[plan] = row[1]
+        return [memo[plan] for plan in plans]
+
+    default_plan = tuple(_queue_capacities(targets, [int(p.get("parallel_count", 1)) for p in targets]))
+    plan = (1,) * n
+    default_uph, uph = evaluate([default_plan, plan])
+
+    # 1) 탐욕적 상승
+    while uph < target and sum(plan) < budget:
+        best_plan, best_uph = None, uph
+        step = 1
+        while best_plan is None and step <= budget - sum(plan):
+            neighbours = [plan[:i] + (plan[i] + step,) + plan[i + 1:]
+                          for i in range(n) if plan[i] + step <= max_per_process]
+            if not neighbours:
+                break
+            for candidate, value in zip(neighbours, evaluate(neighbours)):
+                if value > best_uph:
+                    best_plan, best_uph = candidate, value
+            step *= 2
+        if best_plan is None:
+            break
+        plan, uph = best_plan, best_uph
+
+    # 2) 목표를 유지하는 범위에서 감축
+    feasible = uph >= target
+    while feasible:
+        neighbours = [plan[:i] + (plan[i] - 1,) + plan[i + 1:] for i in range(n) if plan[i] > 1]
+        keep = [(value, candidate) for candidate, value in zip(neighbours, evaluate(neighbours))
+                if value >= target]
+        if not keep:
+            break
+        uph, plan = max(keep)
+
+    capacities = dict(zip(pids, plan))
+    process_buffers = []
+    for p in topo.ordered:
+        pc = int(p.get("parallel_count", 1))
+        default = int(p.get("buffer_capacity", pc * 2))
+        process_buffers.append({
+            "process_id": p["process_id"],
+            "name": p.get("name", ""),
+            "parallel_count": pc,
+            "buffer_capacity": capacities.get(p["process_id"], default),
+            "default_buffer_capacity": default,
+        })
+
+    log.info("[optimize_buffers] feasible=%s uph=%.2f total=%d (평가 %d회, 라운드 %d)",
+             feasible, uph, sum(plan), len(memo), rounds)
+    return {
+        "buffer_plan": {
+            "target_uph": target,
+            "feasible": feasible,
+            "achieved_uph": uph,
+            "total_buffer": sum(plan),
+            "default_total_buffer": sum(default_plan),
+            "default_uph": default_uph,
+            "total_buffer_limit": budget,
+            "evaluations": len(memo),
+            "rounds": rounds,
+        },
+        "process_buffers": process_buffers,
+    }
+
+
+# ── 증분 재시뮬레이션 ─────────────────────────────────────
+class LineSimulation:
+    """체크포인트 기반 증분 재시뮬레이션 (sequential 엔진, 결정적 CT).
+
+    run()은 전체 시뮬레이션을 수행하면서 checkpoint_interval 제품마다 공정별 상태
+    (서버 가용 시각, 대기열 계수, 누적 통계)를 저장하고 제품별 완료 시각을 보관한다.
+    update_process()는 변경 공정의 하류 영역(+ 정체로 결합된 상류 공정)만
+    변경 시점 직전 체크포인트부터 다시 계산한다.
+
+        sim = LineSimulation(data)
+        sim.run()
+        sim.update_process("P003", cycle_time_sec=55)                    # 전체 구간 적용
+        sim.update_process("P003", cycle_time_sec=60, from_product=500)  # 500번째 제품부터
+    """
+
+    def __init__(self, data: Dict[str, Any], checkpoint_interval: Optional[int] = None):
+        _validate(data, allow_auto_warmup=False)
+        if data.get("engine", "sequential") != "sequential":
+            raise ValueError("LineSimulation은 sequential 엔진만 지원합니다")
+        if _is_stochastic(data):
+            raise ValueError("LineSimulation은 결정적 CT만 지원합니다")
+
+        self.data = dict(data)
+        self.topo = _build_topology([dict(p) for p in data["processes"]])
+        self.num_products: int = data.get("num_products", 100)
+        self.warmup_products: int = data.get("warmup_products", 10)
+        self.checkpoint_interval = max(1, int(
+            checkpoint_interval or data.get("checkpoint_interval") or
+            max(self.num_products // 20, 1)))
+
+        # 공정별 CT 구간: [(적용 시작 제품, CT), ...]
+        self._ct_segments = [[(0, float(p["cycle_time_sec"]))] for p in self.topo.ordered]
+        self.parallel_counts = [int(p.get("parallel_count", 1)) for p in self.topo.ordered]
+        self._rows: List[Any] = []
+        self._checkpoints: Dict[int, _SequentialState] = {}
+        self._state: Optional[_SequentialState] = None
+        self.last_update: Dict[str, Any] = {}
+
+    def _cycle_times_at(self, prod_idx: int) -> List[float]:
+        cycle_times = []
+        for segments in self._ct_segments:
+            ct = segments[0][1]
+            for start, value in segments:
+                if start <= prod_idx:
+                    ct = value
+            cycle_times.append(ct)
+        return cycle_times
+
+    def _replay(self, start: int, steps: List[int]) -> None:
+        """start 제품부터 steps 공정을 재계산하며 체크포인트를 갱신."""
+        topo = self.topo
+        active = set(steps)
+        plan = []
+        for j in range(topo.num_procs):
+            if j in active:
+                plan.append((j, True, topo.succ_idx[j]))
+            else:
+                feeds = [s for s in topo.succ_idx[j] if s in active]
+                if feeds:
+                    plan.append((j, False, feeds))
+
+        queue_capacities = _queue_capacities(topo.ordered, self.parallel_counts)
+        samplers = [None] * topo.num_procs
+        interval = self.checkpoint_interval
+        boundaries = {start, self.num_products}
+        boundaries.update(range(start - start % interval + interval, self.num_products, interval))
+        for segments in self._ct_segments:
+            boundaries.update(s for s, _ct in segments if start < s < self.num_products)
+        cuts = sorted(boundaries)
+
+        for lo, hi in zip(cuts, cuts[1:]):
+            if lo % interval == 0:
+                ckpt = self._checkpoints.get(lo)
+                if ckpt is None:
+                    ckpt = _SequentialState(self.parallel_counts)
+                    self._checkpoints[lo] = ckpt
+                ckpt.copy_steps(self._state, steps)
+            _sequential_advance(self._state, plan, topo.pred_idx, self._cycle_times_at(lo),
+                                samplers, queue_capacities, range(lo, hi),
+                                self.warmup_products, self.num_products, self._rows)
+
+    def run(self) -> Dict[str, Any]:
+        """전체 구간 시뮬레이션 + 체크포인트/완료 시각 기록."""
+        num_procs = self.topo.num_procs
+        self._rows = [array("d", bytes(8 * num_procs)) for _ in range(self.num_products)]
+        self._checkpoints = {}
+        self._state = _SequentialState(self.parallel_counts)
+        self._replay(0, list(range(num_procs)))
+        self.last_update = {"replayed_processes": num_procs, "replayed_products": self.num_products}
+        return self.result()
+
+    def _affected(self, step: int, capacity_changed: bool) -> List[int]:
+        """변경 공정의 하류 영역 + 대기열 포화로 정체가 전파되는 상류 공정 (폐포)."""
+        topo = self.topo
+        saturated = self._state.saturated
+        affected = {step}
+        stack = [step]
+        if capacity_changed:
+            stack.extend(topo.pred_idx[step])
+            affected.update(topo.pred_idx[step])
+        while stack:
+            j = stack.pop()
+            linked = list(topo.succ_idx[j])
+            if saturated[j]:
+                linked.extend(topo.pred_idx[j])
+            for k in linked:
+                if k not in affected:
+                    affected.add(k)
+                    stack.append(k)
+        return sorted(affected)
+
+    def update_process(self, process_id: str, cycle_time_sec: Optional[float] = None,
+                       parallel_count: Optional[int] = None,
+                       from_product: int = 0) -> Dict[str, Any]:
+        """공정 CT/병렬 수 변경 후 영향 영역만 재계산하여 최신 결과 반환.
+
+        cycle_time_sec는 from_product 번째 제품부터 적용할 수 있고,
+        parallel_count 변경은 서버 구성이 바뀌므로 전체 구간(from_product=0)에만 적용한다.
+        """
+        if self._state is None:
+            self.run()
+        if process_id not in self.topo.proc_index:
+            raise KeyError(f"알 수 없는 공정: {process_id}")
+        if not 0 <= from_product < self.num_products:
+            raise ValueError("from_product must be within [0, num_products)")
+        if parallel_count is not None and from_product != 0:
+            raise ValueError("parallel_count 변경은 from_product=0에서만 지원합니다")
+
+        step = self.topo.proc_index[process_id]
+        overrides: Dict[str, Any] = {}
+        if cycle_time_sec is not None:
+            segments = [(s, ct) for s, ct in self._ct_segments[step] if s < from_product]
+            segments.append((from_product, float(cycle_time_sec)))
+            self._ct_segments[step] = segments
+            overrides["cycle_time_sec"] = float(cycle_time_sec)
+        capacity_changed = parallel_count is not None and int(parallel_count) != self.parallel_counts[step]
+        if parallel_count is not None:
+            self.parallel_counts[step] = int(parallel_count)
+            overrides["parallel_count"] = int(parallel_count)
+        self.topo = _apply_overrides(self.topo, {process_id: overrides})
+
+        steps = self._affected(step, capacity_changed)
+        start = from_product - from_product % self.checkpoint_interval
+        if capacity_changed:
+            # 서버 배열 배치를 새 병렬 수에 맞추고, 서버 수가 바뀐 공정은 초기 상태부터 다시 시작 (start == 0)
+            for ckpt in self._checkpoints.values():
+                ckpt.relayout(self.parallel_counts)
+            self._state.relayout(self.parallel_counts)
+            self._checkpoints[0].copy_steps(_SequentialState(self.parallel_counts), steps)
+        self._state.copy_steps(self._checkpoints[start], steps)
+        self._replay(start, steps)
+
+        self.last_update = {
+            "process_id": process_id,
+            "from_product": from_product,
+            "checkpoint": start,
+            "replayed_processes": len(steps),
+            "replayed_products": self.num_products - start,
+        }
+        log.debug("[LineSimulation] 증분 재계산: %s", self.last_update)
+        return self.result()
+
+    def result(self) -> Dict[str, Any]:
+        if self._state is None:
+            return self.run()
+        return _summarize_sequential(self.topo, self.parallel_counts, self._state,
+                                     self.num_products, self.warmup_products)
+
+
+# ── 결과 캐시 ─────────────────────────────────────────────
+# 결과에 영향을 주지 않아 캐시 키에서 제외하는 입력 키
+_CACHE_IGNORED_KEYS = ("max_workers", "profile", "coordinator_address", "lease_sec",
+                       "allow_remote_workers", "_no_cache") + _CHECKPOINT_KEYS
+_code_digest: Optional[str] = None
+
+
+def _uncacheable(data: Dict[str, Any]) -> bool:
+    """입력 JSON 밖의 상태에 의존하거나 부수 효과가 있는 실행 (캐시 적중으로 건너뛰면 안 됨).
+
+    replay는 로그 파일 내용, checkpoint_path는 체크포인트 파일 기록/재개,
+    coordinator_address는 원격 worker와의 작업 분배에 의존한다.
+    """
+    return (data.get("mode") == "replay" or bool(data.get("checkpoint_path"))
+            or bool(data.get("coordinator_address")))
+
+
+def _module_digest() -> str:
+    """이 모듈 소스의 해시 (시뮬레이터 코드가 바뀌면 기존 캐시 항목을 무효화)."""
+    global _code_digest
+    if _code_digest is None:
+        with open(os.path.abspath(__file__), "rb") as f:
+            _code_digest = hashlib.sha256(f.read()).hexdigest()
+    return _code_digest
+
+
+def input_key(data: Dict[str, Any]) -> str:
+    """시뮬레이터 입력의 정규화 해시.
+
+    dict 키는 정렬하여 직렬화하지만 processes와 predecessor_ids의 나열 순서는 그대로 키에 포함한다.
+    위상 정렬의 동순위 처리와 대기열 갱신 순서가 입력 순서를 따르므로 process_analysis 순서
+    (동순위 경우에는 수치까지)가 나열 순서에 따라 달라질 수 있기 때문이다.
+    """
+    canonical = {k: v for k, v in data.items() if k not in _CACHE_IGNORED_KEYS}
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.sha256(_module_digest().encode())
+    digest.update(payload.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """input_key() → 결과 dict 캐시. 메모리 LRU + 선택적 디스크 영속화.
+
+    directory가 주어지면 항목을 <key>.json.gz로 저장하고, 전체 크기가 max_disk_bytes를
+    넘으면 마지막 사용 시각(mtime)이 오래된 파일부터 삭제한다. 반환값은 복사본이다.
+
+        cache = ResultCache(directory="data/simulation_cache")
+        result = run(data, cache=cache)
+    """
+
+    def __init__(self, max_entries: int = 128, directory: Optional[str] = None,
+                 max_disk_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max(1, int(max_entries))
+        self.directory = directory
+        self.max_disk_bytes = int(max_disk_bytes)
+        self._entries: "collections.OrderedDict[str, Dict[str, Any]]" = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        elif self.directory:
+            path = self._path(key)
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    result = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                result = None
+            if result is not None:
+                self._remember(key, result)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        result = copy.deepcopy(result)
+        self._remember(key, result)
+        if not self.directory:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+        self._prune()
+
+    def _prune(self) -> None:
+        files = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json.gz"):
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        files.sort()
+        for _mtime, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        if self.directory:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json.gz"):
+                    os.remove(entry.path)
+
+
+def run(data: Dict[str, Any], cache: Optional[ResultCache] = None) -> Dict[str, Any]:
+    """CLI/어댑터 진입점: data["mode"]에 따라 단일 시뮬레이션 또는 배치 스윕.
+
+    cache가 주어지면 정규화 입력 해시가 같은 이전 결과를 재사용한다.
+    data["profile"]이 참이면 단계별 wall/CPU 시간과 이벤트 수를 결과의 "timings"에 첨부한다.
+    """
+    global _timings
+    if not data.get("profile"):
+        return _run_cached(data, cache)
+    _timings = timings = _Timings()
+    try:
+        result = _run_cached(data, cache)
+    finally:
+        _timings = None
+    result["timings"] = timings.to_dict()
+    return result
+
+
+def _run_cached(data: Dict[str, Any], cache: Optional[ResultCache]) -> Dict[str, Any]:
+    if cache is None or _uncacheable(data):
+        return _run_mode(data)
+    with _phase("cache"):
+        key = input_key(data)
+        result = cache.get(key)
+    if result is not None:
+        log.info("[cache] 적중 %s", key[:12])
+        return result
+    result = _run_mode(data)
+    with _phase("cache"):
+        cache.put(key, result)
+    return result
+
+
+def _run_mode(data: Dict[str, Any]) -> Dict[str, Any]:
+    mode = data.get("mode", "simulate")
+    if mode == "batch":
+        return simulate_batch(data)
+    if mode == "analytic":
+        return estimate(data)
+    if mode == "optimize_buffers":
+        return optimize_buffers(data)
+    if mode == "sensitivity":
+        return sensitivity(data)
+    if mode == "replay":
+        return replay(data)
+    if mode == "compare":
+        if not data.get("variant"):
+            raise ValueError("mode=\"compare\"에는 variant({\"overrides\": {...}})가 필요합니다")
+        return compare(data, _variant_input(data, data["variant"]))
+    if mode != "simulate":
+        raise ValueError(f"알 수 없는 mode: {mode}")
+    return simulate(data)
+
+
 # ── 어댑터 ────────────────────────────────────────────────
+# params에서 도구 입력으로 그대로 전달하는 선택 키
+_PASSTHROUGH_PARAMS = (
+    "engine", "cycle_time_dist", "n_replications", "seed", "confidence", "max_workers",
+    "mode", "variants", "grid", "include_base",
+    "adaptive", "target_rel_half_width", "batch_products", "min_batches", "max_products",
+    "wip_population", "timeline_window_sec", "common_random_numbers", "variant", "profile",
+    "sensitivity_ct_step", "target_uph", "total_buffer", "max_buffer_per_process",
+    "checkpoint_path", "resume", "checkpoint_interval_sec", "parallel_chunk_products",
+    "coordinator_address", "lease_sec", "allow_remote_workers", "event_log",
+)
+
+
 def pre_process(bop_json: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
     """BOP JSON + params → 도구 입력 형태로 변환."""
     log.info("[pre_process] 호출됨")
@@ -242,11 +3423,12 @@ def pre_process(bop_json: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, A
         raise KeyError("bop_json에 'processes' 키가 없습니다")
 
     log.info("[pre_process] 추출된 공정 수: %d", len(processes))
-    for p in processes:
-        log.debug("[pre_process]   공정 %s (%s): CT=%s, parallel=%s, predecessors=%s",
-                  p.get("process_id"), p.get("name"),
-                  p.get("cycle_time_sec"), p.get("parallel_count"),
-                  p.get("predecessor_ids"))
+    if log.isEnabledFor(logging.DEBUG):
+        for p in processes:
+            log.debug("[pre_process]   공정 %s (%s): CT=%s, parallel=%s, predecessors=%s",
+                      p.get("process_id"), p.get("name"),
+                      p.get("cycle_time_sec"), p.get("parallel_count"),
+                      p.get("predecessor_ids"))
 
     num_products = params.get("num_products", 100)
     warmup_products = params.get("warmup_products", 10)
@@ -259,7 +3441,14 @@ def pre_process(bop_json: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, A
         "num_products": num_products,
         "warmup_products": warmup_products,
     }
-    log.info("[pre_process] 도구 입력 생성 완료 (공정 %d개, num_products=%d, warmup=%d)",
+    for key in _PASSTHROUGH_PARAMS:
+        if key in params:
+            tool_input[key] = params[key]
+            log.info("[pre_process] %s=%s", key, params[key])
+    if _uncacheable(tool_input):
+        tool_input["_no_cache"] = True  # 도구 실행기(result_cache.NO_CACHE_KEY)의 결과 캐시 제외
+        log.info("[pre_process] 외부 상태 의존 실행 — 결과 캐시 제외 요청")
+    log.info("[pre_process] 도구 입력 생성 완료 (공정 %d개, num_products=%s, warmup=%s)",
              len(processes), num_products, warmup_products)
     return tool_input
 
@@ -269,6 +3458,36 @@ def post_process(bop_json: Dict[str, Any], result: Dict[str, Any]) -> Dict[str,
     log.info("[post_process] 호출됨")
     log.info("[post_process] result 키: %s", list(result.keys()))
 
+    if "batch_summary" in result:
+        log.info("[post_process] batch_summary: %s", result["batch_summary"])
+        bop_json["_simulation_batch"] = result
+        log.info("[post_process] bop_json['_simulation_batch'] 키 첨부 완료")
+        return bop_json
+
+    if "buffer_plan" in result:
+        log.info("[post_process] buffer_plan: %s", result["buffer_plan"])
+        bop_json["_simulation_buffer_plan"] = result
+        log.info("[post_process] bop_json['_simulation_buffer_plan'] 키 첨부 완료")
+        return bop_json
+
+    if "sensitivity_summary" in result:
+        log.info("[post_process] sensitivity_summary: %s", result["sensitivity_summary"])
+        bop_json["_simulation_sensitivity"] = result
+        log.info("[post_process] bop_json['_simulation_sensitivity'] 키 첨부 완료")
+        return bop_json
+
+    if "replay" in result:
+        log.info("[post_process] replay: %s", result["replay"])
+        bop_json["_simulation_replay"] = result
+        log.info("[post_process] bop_json['_simulation_replay'] 키 첨부 완료")
+        return bop_json
+
+    if "comparison_summary" in result:
+        log.info("[post_process] comparison_summary: %s", result["comparison_summary"]["throughput_uph_diff"])
+        bop_json["_simulation_comparison"] = result
+        log.info("[post_process] bop_json['_simulation_comparison'] 키 첨부 완료")
+        return bop_json
+
     summary = result.get("simulation_summary", {})
     log.info("[post_process] simulation_summary: throughput=%.2f UPH, "
              "measured=%d개, total_time=%.1fs",
@@ -278,12 +3497,13 @@ def post_process(bop_json: Dict[str, Any], result: Dict[str, Any]) -> Dict[str,
 
     analysis = result.get("process_analysis", [])
     log.info("[post_process] process_analysis 항목 수: %d", len(analysis))
-    for pa in analysis:
-        log.debug("[post_process]   [%s] %s — 부하=%.1f%% 대기=%.1f%% 정체=%.1f%%",
-                  pa.get("process_id"), pa.get("name"),
-                  pa.get("utilization_pct", 0),
-                  pa.get("starving_pct", 0),
-                  pa.get("blocking_pct", 0))
+    if log.isEnabledFor(logging.DEBUG):
+        for pa in analysis:
+            log.debug("[post_process]   [%s] %s — 부하=%.1f%% 대기=%.1f%% 정체=%.1f%%",
+                      pa.get("process_id"), pa.get("name"),
+                      pa.get("utilization_pct", 0),
+                      pa.get("starving_pct", 0),
+                      pa.get("blocking_pct", 0))
 
     bop_json["_simulation_result"] = result
     log.info("[post_process] bop_json['_simulation_result'] 키 첨부 완료")
@@ -296,10 +3516,32 @@ def post_process(bop_json: Dict[str, Any], result: Dict[str, Any]) -> Dict[str,
 # ── CLI ───────────────────────────────────────────────────
 def main() -> None:
     parser = argparse.ArgumentParser(description="Line Simulator — 부하율/대기율/정체율 분석")
-    parser.add_argument("--input", required=True, help="입력 JSON 파일 경로")
-    parser.add_argument("--output", required=True, help="출력 JSON 파일 경로")
-    parser.add_argument("--log-level", default="DEBUG",
-                        help="로그 레벨 (DEBUG|INFO|WARNING|ERROR, default: DEBUG)")
+    parser.add_argument("--input", help="입력 JSON 파일 경로")
+    parser.add_argument("--output", help="출력 JSON 파일 경로")
+    parser.add_argument("--log-level", default="INFO",
+                        help="로그 레벨 (DEBUG|INFO|WARNING|ERROR, default: INFO)")
+    parser.add_argument("--trace", default=None,
+                        help="제품×공정 트레이스 NDJSON 경로 (.gz면 압축, sequential 엔진)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="결과 캐시 디렉토리 (동일 입력이면 저장된 결과 재사용)")
+    parser.add_argument("--profile", action="store_true",
+                        help="단계별 wall/CPU 시간과 이벤트 수를 출력 JSON의 timings에 첨부")
+    parser.add_argument("--profile-out", default=None,
+                        help="cProfile 통계(pstats) 저장 경로 (상위 함수 요약은 로그로 출력)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="체크포인트 파일 경로 (sequential 단일 실행, 주기적으로 상태 기록)")
+    parser.add_argument("--resume", action="store_true",
+                        help="--checkpoint 파일의 최신 스냅샷부터 이어서 실행")
+    parser.add_argument("--replay", default=None, metavar="EVENT_LOG",
+                        help="실측 공정 이벤트 로그(CSV/NDJSON, .gz 가능)를 라인 모델로 재생해 KPI 산출")
+    parser.add_argument("--serve", default=None, metavar="HOST:PORT",
+                        help="반복 실험을 이 주소의 코디네이터로 원격 워커에 분배 (HOST 생략 시 127.0.0.1)")
+    parser.add_argument("--allow-remote-workers", action="store_true",
+                        help="--serve의 외부 주소(0.0.0.0 등) 바인딩 허용")
+    parser.add_argument("--worker", default=None, metavar="URL",
+                        help="워커 모드: 코디네이터(http://HOST:PORT)에서 작업을 가져와 실행 (--input/--output 불필요)")
+    parser.add_argument("--worker-idle-timeout", type=float, default=30.0,
+                        help="워커가 코디네이터에 연결하지 못하면 종료할 때까지의 초 (default: 30)")
     args, _unknown = parser.parse_known_args()
 
     level = getattr(logging, args.log_level.upper(), None)
@@ -311,13 +3553,44 @@ def main() -> None:
         stream=sys.stderr,
     )
 
+    if args.worker:
+        run_worker(args.worker, idle_timeout=args.worker_idle_timeout)
+        return
+    if not args.input or not args.output:
+        parser.error("--input과 --output이 필요합니다 (--worker 모드 제외)")
+
     log.info("[CLI] 입력 파일: %s", args.input)
     with open(args.input, encoding="utf-8") as f:
         data = json.load(f)
     log.info("[CLI] 입력 JSON 로드 완료 (키: %s)", list(data.keys()))
 
-    result = simulate(data)
-    log.info("[CLI] simulate() 완료 — throughput: %.2f UPH",
+    if args.profile:
+        data["profile"] = True
+    if args.replay:
+        data["mode"] = "replay"
+        data["event_log"] = args.replay
+    if args.serve:
+        data["coordinator_address"] = args.serve
+        data["allow_remote_workers"] = args.allow_remote_workers
+    if args.checkpoint:
+        data["checkpoint_path"] = os.path.abspath(args.checkpoint)
+        data["resume"] = args.resume
+    profiler = cProfile.Profile() if args.profile_out else None
+    if profiler is not None:
+        profiler.enable()
+    if args.trace:
+        result = write_trace(data, args.trace)
+    else:
+        result = run(data, ResultCache(directory=args.cache_dir) if args.cache_dir else None)
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile_out)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(15)
+        log.info("[CLI] cProfile 저장: %s\n%s", args.profile_out, summary.getvalue())
+    if "timings" in result:
+        log.info("[CLI] timings: %s", json.dumps(result["timings"]["phases"], ensure_ascii=False))
+    log.info("[CLI] run() 완료 — throughput: %.2f UPH",
              result.get("simulation_summary", {}).get("throughput_uph", 0))
 
     with open(args.output, "w", encoding="utf-8") as f:
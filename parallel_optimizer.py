@@ -5,20 +5,57 @@ parallel_optimizer.py — 목표 UPH 기반 최적 병렬 수 계산 도구
 각 공정의 cycle_time과 목표 UPH로부터 takt time을 산출하고,
 공정별 최적 parallel_count를 계산하여 BOP의 parallel_count를 직접 수정한다.
 
+시뮬레이션 검증 모드("mode": "verified"): 공정별 ceil(CT / takt) 해에서 시작해 line_simulator로
+선후행 DAG, 정체/대기 효과를 포함한 UPH를 평가하고, 목표 UPH를 만족하는 최소 총 병렬 수 구성을
+탐색한다 (line_simulator 모듈이 같은 디렉토리 또는 PYTHONPATH에 있어야 함).
+
+용량 곡선("target_uph_sweep": [10, 20, ...] 또는 {"start": 10, "stop": 300, "step": 5}): 목표 UPH 배열
+전체의 공정별 병렬 수, 총 병렬 수, 달성 UPH, 라인 효율을 NumPy로 한 번에 계산하고 공정별로
+서버가 하나 더 필요해지는 UPH 분기점(3600 * n / CT)을 보고한다 (BOP는 수정하지 않음, numpy 필요).
+
+Pareto 모드("mode": "pareto"): resource_assignments와 설비/작업자 마스터로 공정 1대 추가 비용을 산정하고,
+추가 비용 대비 시뮬레이션 UPH의 비지배 parallel_count 구성들을 표로 반환한다 (BOP는 수정하지 않음,
+line_simulator 필요).
+
 Usage:
     python parallel_optimizer.py --input input.json --output output.json
     python parallel_optimizer.py --input input.json --output output.json --log-level DEBUG
+    python parallel_optimizer.py --input input.json --output output.json --mode verified
+    python parallel_optimizer.py --input input.json --output output.json --sweep 10 300 5
+    python parallel_optimizer.py --input input.json --output output.json --mode pareto
 """
 
 import argparse
+import heapq
 import json
 import logging
 import math
 import sys
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import line_simulator
+except ImportError:  # 도구 단독 업로드 실행 시에는 시뮬레이션 검증 모드만 사용할 수 없다
+    line_simulator = None
 
 log = logging.getLogger("parallel_optimizer")
 
+DEFAULT_TIME_BUDGET_SEC = 45.0   # 도구 subprocess 제한(60초) 안에서 Pareto 탐색 종료
+_BOTTLENECK_SLACK = 0.05
+
+# 시뮬레이션 검증 모드에서 line_simulator 입력으로 그대로 전달하는 키
+_SIMULATION_KEYS = (
+    "num_products", "warmup_products", "engine", "cycle_time_dist", "seed",
+    "n_replications", "common_random_numbers", "max_workers",
+)
+
 
 def optimize(data: Dict[str, Any]) -> Dict[str, Any]:
     """목표 UPH 달성을 위한 공정별 최적 parallel_count 계산."""
@@ -89,7 +126,441 @@ def optimize(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+class _ConfigEvaluator:
+    """parallel_count 구성 튜플 → 정상상태 시뮬레이션 UPH. 구성 메모를 공유하고 미평가 구성만
+    line_simulator.simulate_batch()로 한 번에 평가하며, 프로세스 풀은 탐색 전체에서 하나를 쓴다
+    (with 블록 종료 시 정리).
+
+    line_simulator의 UPH는 측정 첫 제품의 투입 시각부터 재므로 유한 구간에서는 그 제품의 흐름
+    시간만큼 용량보다 낮게 나온다. 그래서 구성마다 측정 제품 1개짜리 구간(warmup + 1)을 함께
+    돌려 그 흐름 시간 T1을 빼고, (측정 제품 수 - 1) / (T - T1)을 정상상태 UPH로 쓴다
+    (같은 seed/CRN이면 두 실행의 앞쪽 제품 경로가 같다). 병렬 서버의 출하는 병렬 수 주기로 몰려
+    나오므로 측정 제품 수 - 1을 구성 병렬 수들의 최소공배수 배수로 맞춰 주기 위상 오차를 없앤다
+    (결정적 라인에서 병목 처리 능력과 일치). warmup_products="auto"면 보정하지 않는다.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        if line_simulator is None:
+            raise RuntimeError("시뮬레이션 평가에는 line_simulator 모듈이 필요합니다 (같은 디렉토리 또는 PYTHONPATH)")
+        base: Dict[str, Any] = {"processes": data["processes"], "include_base": False,
+                                "num_products": 300, "warmup_products": 30}
+        base.update({k: data[k] for k in _SIMULATION_KEYS if k in data})
+        if base.get("cycle_time_dist") or any(p.get("cycle_time_dist") for p in base["processes"]):
+            base.setdefault("common_random_numbers", True)  # 구성 간 비교 분산 감소
+        self.base = base
+        self.pids = [p["process_id"] for p in data["processes"]]
+        self.memo: Dict[tuple, float] = {}
+        self.rounds = 0
+        warmup = base["warmup_products"]
+        self.head = warmup + 1 if isinstance(warmup, int) and base["num_products"] > warmup + 1 else None
+        self.pool = line_simulator.batch_pool(base)
+
+    def __enter__(self) -> "_ConfigEvaluator":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def __call__(self, configs: List[tuple]) -> List[float]:
+        pending = [c for c in dict.fromkeys(configs) if c not in self.memo]
+        if pending:
+            self.rounds += 1
+            variants = []
+            measured: List[int] = []
+            for c in pending:
+                variant = {"name": ",".join(map(str, c)),
+                           "overrides": {pid: {"parallel_count": n} for pid, n in zip(self.pids, c)}}
+                if self.head is not None:
+                    period = math.lcm(*c)
+                    m = self.base["num_products"] - self.head
+                    m = m - m % period if m >= period else m
+                    measured.append(m)
+                    variants.append({**variant, "num_products": self.head + m})
+                    variants.append({**variant, "num_products": self.head})
+                else:
+                    variants.append(variant)
+            rows = line_simulator.simulate_batch(self.base, variants, pool=self.pool)["rows"]
+            if self.head is None:
+                for config, row in zip(pending, rows):
+                    self.memo[config] = row[1]
+            else:
+                for config, m, row, head_row in zip(pending, measured, rows[::2], rows[1::2]):
+                    span = row[2] - head_row[2]
+                    self.memo[config] = m / span * 3600.0 if span > 0 else row[1]
+        return [self.memo[c] for c in configs]
+
+
+def optimize_verified(data: Dict[str, Any]) -> Dict[str, Any]:
+    """ceil 해에서 시작해 정상상태 시뮬레이션 UPH(_ConfigEvaluator 참고)가 target_uph 이상인 최소 총 병렬 수 구성을 탐색.
+
+    공정 j의 처리 능력 상한(parallel_count * 3600 / CT)은 라인 UPH의 상한이므로 ceil 해는 공정별
+    하한이다. 따라서 ceil 해에 서버를 더하는 방향으로만 분기하며, 추가 수 k = 1, 2, ...
+    단계마다 직전 단계의 상위 beam_width개 구성에 +1 이웃을 만들어 line_simulator.simulate_batch()로
+    병렬 평가한다. 처음 목표를 만족하는 단계에서 멈추므로 그 단계의 최고 UPH 구성이 해이고
+    (beam_width가 충분히 크면 추가 수 기준 최적), 이후 -1 이웃을 평가해 목표를 유지하는 감축을 적용한다.
+    같은 구성은 구성 튜플 키의 메모로 한 번만 평가하고, 평가 수는 max_evaluations(기본 400)로 제한한다.
+    """
+    if line_simulator is None:
+        raise RuntimeError("mode=\"verified\"에는 line_simulator 모듈이 필요합니다 (같은 디렉토리 또는 PYTHONPATH)")
+
+    result = optimize(data)
+    target = float(data["target_uph"])
+    beam_width = max(1, int(data.get("beam_width", 4)))
+    max_evaluations = int(data.get("max_evaluations", 400))
+    max_added = int(data.get("max_added_stations", len(data["processes"]) * 2))
+
+    with _ConfigEvaluator(data) as evaluate:
+        memo = evaluate.memo
+
+        ceil_config = tuple(o["optimal_parallel"] for o in result["optimization"])
+        current_config = tuple(o["current_parallel"] for o in result["optimization"])
+        ceil_uph, current_uph = evaluate([ceil_config, current_config])
+        best, best_uph = ceil_config, ceil_uph
+        log.info("[optimize_verified] ceil 해 시뮬레이션 UPH=%.2f (목표 %.2f)", ceil_uph, target)
+
+        # 1) 추가 수 단계별 beam 분기: 목표를 처음 만족하는 단계에서 종료
+        beam = [(ceil_uph, ceil_config)]
+        added = 0
+        while best_uph < target and added < max_added and len(memo) < max_evaluations:
+            added += 1
+            children = list(dict.fromkeys(
+                config[:i] + (config[i] + 1,) + config[i + 1:]
+                for _uph, config in beam for i in range(len(config))))
+            children = children[:max(0, max_evaluations - len(memo))] or children[:1]
+            scored = sorted(zip(evaluate(children), children), reverse=True)
+            beam = scored[:beam_width]
+            if scored[0][0] > best_uph or scored[0][0] >= target:
+                best_uph, best = scored[0]
+            log.info("[optimize_verified] +%d대: 후보 %d개, 최고 UPH=%.2f", added, len(children), scored[0][0])
+
+        # 2) 목표를 유지하는 -1 감축 (정체/대기 완화로 다른 공정 서버가 불필요해진 경우)
+        feasible = best_uph >= target
+        while feasible:
+            neighbours = [best[:i] + (best[i] - 1,) + best[i + 1:] for i in range(len(best)) if best[i] > 1]
+            keep = [(uph, c) for c, uph in zip(neighbours, evaluate(neighbours)) if uph >= target]
+            if not keep:
+                break
+            best_uph, best = max(keep)
+
+    for entry, n in zip(result["optimization"], best):
+        entry["ceil_parallel"] = entry["optimal_parallel"]
+        entry["optimal_parallel"] = n
+        entry["optimized_eff_ct"] = round(entry["cycle_time_sec"] / n, 2)
+        entry["changed"] = entry["current_parallel"] != n
+
+    summary = result["summary"]
+    summary["analytic_achieved_uph"] = summary["achieved_uph"]
+    summary["total_optimal_parallel"] = sum(best)
+    summary["additional_lines_needed"] = sum(best) - summary["total_current_parallel"]
+    summary["achieved_uph"] = round(best_uph, 2)
+    result["verification"] = {
+        "feasible": feasible,
+        "ceil_total_parallel": sum(ceil_config),
+        "ceil_simulated_uph": round(ceil_uph, 2),
+        "current_simulated_uph": round(current_uph, 2),
+        "simulated_uph": round(best_uph, 2),
+        "evaluations": len(memo),
+        "rounds": evaluate.rounds,
+        "engine": evaluate.base.get("engine", "sequential"),
+    }
+    log.info("[optimize_verified] feasible=%s total=%d (ceil %d) UPH=%.2f, 평가 %d회/%d라운드",
+             feasible, sum(best), sum(ceil_config), best_uph, len(memo), evaluate.rounds)
+    return result
+
+
+def _station_costs(data: Dict[str, Any]) -> List[Dict[str, float]]:
+    """공정 인스턴스(병렬 1대)당 설비 수, 작업자 수, 비용.
+
+    resource_assignments의 parallel_index 1 행(없으면 공정에 포함된 resources의 parallel_line_index 0 행)
+    중 equipment/worker를 센다. 단가는 마스터(equipments/workers)의 cost 또는 unit_cost, 없으면
+    resource_costs[설비 type 또는 "worker"], 그것도 없으면 1.0이며 자재는 제외한다.
+    자원 정보가 없는 공정은 1대당 resource_costs["station"](기본 1.0)이다.
+    """
+    unit = dict(data.get("resource_costs") or {})
+    master: Dict[tuple, Dict[str, Any]] = {}
+    for eq in data.get("equipments") or []:
+        master[("equipment", eq.get("equipment_id"))] = eq
+    for w in data.get("workers") or []:
+        master[("worker", w.get("worker_id"))] = w
+    assigned: Dict[str, List[Dict[str, Any]]] = {}
+    for ra in data.get("resource_assignments") or []:
+        if ra.get("parallel_index", 1) == 1:
+            assigned.setdefault(ra.get("process_id"), []).append(ra)
+
+    out: List[Dict[str, float]] = []
+    for proc in data["processes"]:
+        rows = assigned.get(proc["process_id"])
+        if rows is None:
+            rows = [r for r in proc.get("resources") or [] if r.get("parallel_line_index", 0) == 0]
+        equipment = workers = cost = 0.0
+        for r in rows:
+            rtype = r.get("resource_type")
+            if rtype not in ("equipment", "worker"):
+                continue
+            qty = float(r.get("quantity", 1))
+            m = master.get((rtype, r.get("resource_id")), {})
+            key = m.get("type", rtype) if rtype == "equipment" else "worker"
+            price = m.get("cost", m.get("unit_cost", unit.get(key, unit.get(rtype, 1.0))))
+            cost += qty * float(price)
+            if rtype == "equipment":
+                equipment += qty
+            else:
+                workers += qty
+        if equipment == 0 and workers == 0:
+            cost = float(unit.get("station", 1.0))
+        out.append({"equipment": equipment, "workers": workers, "cost": cost})
+    return out
+
+
+def pareto_frontier(data: Dict[str, Any]) -> Dict[str, Any]:
+    """추가 설비/작업자 비용 대비 시뮬레이션 UPH의 비지배(Pareto) parallel_count 구성 표.
+
+    현재 구성에서 시작해 추가 비용이 작은 구성부터 확장한다 (비용 순 우선순위 큐, 한 번에 beam_width개).
+    확장 시 공정 처리 능력(parallel_count * 3600 / CT)이 가장 낮은 branch_width개 공정 각각에 +1, 그리고
+    병목과 5% 이내인 공정 전체에 +1 한 자식을 만든다. 처리 능력의 최솟값은 시뮬레이션 UPH의 상한이므로
+    같거나 더 싼 평가 구성이 이미 그 상한 이상의 UPH를 냈다면 자식을 평가하지 않고 버린다.
+    남은 자식은 _ConfigEvaluator(구성 메모 공유 + simulate_batch 프로세스 풀)로 한 번에 평가하며,
+    max_evaluations, max_added_stations, time_budget_sec(기본 45초, 직전 라운드의 평가당 시간으로
+    라운드 크기를 줄임)에서 멈춘다. max_uph(기본 target_uph의 1.5배) 이상인 구성은 더 확장하지 않는다.
+    """
+    t0 = time.perf_counter()
+    with _ConfigEvaluator(data) as evaluate:
+        processes = data["processes"]
+        pids = evaluate.pids
+        ct = [float(p["cycle_time_sec"]) for p in processes]
+        costs = _station_costs(data)
+        unit_cost = [c["cost"] for c in costs]
+        start = tuple(int(p.get("parallel_count", 1)) for p in processes)
+
+        budget = float(data.get("time_budget_sec", DEFAULT_TIME_BUDGET_SEC))
+        max_evaluations = int(data.get("max_evaluations", 400))
+        max_added = int(data.get("max_added_stations", len(processes) * 2))
+        beam_width = max(1, int(data.get("beam_width", 4)))
+        branch_width = max(1, int(data.get("branch_width", 3)))
+        max_uph = data.get("max_uph")
+        if max_uph is None and data.get("target_uph"):
+            max_uph = 1.5 * float(data["target_uph"])
+
+        def capacity(config: tuple) -> float:
+            return min((n * 3600.0 / c for n, c in zip(config, ct) if c > 0), default=math.inf)
+
+        def added_cost(config: tuple) -> float:
+            return sum((n - s) * u for n, s, u in zip(config, start, unit_cost))
+
+        def dominated(cost: float, uph: float, strict: bool) -> bool:
+            for c2, u2, _cfg in archive:
+                if c2 <= cost + 1e-9 and (u2 > uph or (not strict and u2 >= uph)) and (c2, u2) != (cost, uph):
+                    return True
+            return False
+
+        def children(config: tuple) -> List[tuple]:
+            caps = [(n * 3600.0 / c if c > 0 else math.inf, j) for j, (n, c) in enumerate(zip(config, ct))]
+            caps.sort()
+            out = [config[:j] + (config[j] + 1,) + config[j + 1:] for _cap, j in caps[:branch_width]]
+            group = {j for cap, j in caps if cap <= caps[0][0] * (1 + _BOTTLENECK_SLACK)}
+            if len(group) > 1:
+                out.append(tuple(n + 1 if j in group else n for j, n in enumerate(config)))
+            return out
+
+        # (추가 비용, 시뮬레이션 UPH, 구성) — UPH는 보고 정밀도(소수 둘째 자리)로 비교해
+        # 반올림하면 같아지는 UPH에 비용만 더 드는 구성을 비지배로 남기지 않는다
+        archive: List[tuple] = []
+        start_uph = evaluate([start])[0]
+        archive.append((0.0, round(start_uph, 2), start))
+        heap = [(0.0, -start_uph, start)]
+        expanded = set()
+        pruned = 0
+        sec_per_eval: Optional[float] = None
+        stop_reason = "exhausted"
+
+        while heap:
+            remaining = budget - (time.perf_counter() - t0)
+            quota = max_evaluations - len(evaluate.memo)
+            if sec_per_eval is not None:
+                quota = min(quota, int(remaining / sec_per_eval))
+            if quota <= 0:
+                stop_reason = "max_evaluations" if len(evaluate.memo) >= max_evaluations else "time_budget"
+                break
+
+            parents: List[tuple] = []
+            while heap and len(parents) < beam_width:
+                cost, neg_uph, config = heapq.heappop(heap)
+                if config in expanded or dominated(cost, -neg_uph, strict=True):
+                    continue
+                if max_uph is not None and -neg_uph >= max_uph:
+                    continue
+                expanded.add(config)
+                parents.append(config)
+
+            kids: List[tuple] = []
+            for config in parents:
+                for child in children(config):
+                    if child in evaluate.memo or child in kids or sum(child) - sum(start) > max_added:
+                        continue
+                    if dominated(added_cost(child), capacity(child), strict=False):
+                        pruned += 1
+                        continue
+                    kids.append(child)
+            if not kids:
+                continue
+            kids.sort(key=added_cost)
+            kids = kids[:quota]
+
+            t_round = time.perf_counter()
+            for child, uph in zip(kids, evaluate(kids)):
+                cost = added_cost(child)
+                archive.append((cost, round(uph, 2), child))
+                heapq.heappush(heap, (cost, -uph, child))
+            sec_per_eval = (time.perf_counter() - t_round) / len(kids)
+            log.debug("[pareto] 라운드 %d: 부모 %d, 평가 %d (%.3fs/구성)",
+                      evaluate.rounds, len(parents), len(kids), sec_per_eval)
+
+    frontier = sorted((c, u, cfg) for c, u, cfg in archive if not dominated(c, u, strict=False))
+    rows = []
+    for cost, uph, config in frontier:
+        delta = [n - s for n, s in zip(config, start)]
+        rows.append([
+            round(cost, 4),
+            sum(delta),
+            round(sum(d * c["equipment"] for d, c in zip(delta, costs)), 4),
+            round(sum(d * c["workers"] for d, c in zip(delta, costs)), 4),
+            round(uph, 2),
+            round(capacity(config), 2),
+            ", ".join(f"{pid}+{d}" for pid, d in zip(pids, delta) if d),
+        ])
+    elapsed = time.perf_counter() - t0
+    log.info("[pareto] 비지배 구성 %d개 (평가 %d회/%d라운드, 상한 가지치기 %d, %.1fs, 종료: %s)",
+             len(rows), len(evaluate.memo), evaluate.rounds, pruned, elapsed, stop_reason)
+    return {
+        "frontier": {
+            "columns": ["added_cost", "added_stations", "added_equipment", "added_workers",
+                        "simulated_uph", "analytic_uph", "changes"],
+            "rows": rows,
+            "process_ids": pids,
+            "configurations": [list(cfg) for _c, _u, cfg in frontier],
+        },
+        "station_costs": [dict(process_id=pid, **c) for pid, c in zip(pids, costs)],
+        "summary": {
+            "n_frontier": len(rows),
+            "current_simulated_uph": round(start_uph, 2),
+            "max_simulated_uph": round(max(u for _c, u, _cfg in frontier), 2),
+            "evaluations": len(evaluate.memo),
+            "rounds": evaluate.rounds,
+            "pruned_by_bound": pruned,
+            "stop_reason": stop_reason,
+            "elapsed_sec": round(elapsed, 2),
+            "engine": evaluate.base.get("engine", "sequential"),
+        },
+    }
+
+
+def _sweep_targets(spec: Any) -> "np.ndarray":
+    """target_uph_sweep(목표 UPH 목록 또는 {"start", "stop", "step"}, stop 포함) → 1차원 배열."""
+    if isinstance(spec, dict):
+        start, stop = float(spec["start"]), float(spec["stop"])
+        step = float(spec.get("step", 1.0))
+        if step <= 0 or stop < start:
+            raise ValueError("target_uph_sweep는 start <= stop, step > 0이어야 합니다")
+        targets = start + step * np.arange(int(math.floor((stop - start) / step + 1e-9)) + 1)
+    else:
+        targets = np.asarray(spec, dtype=float).ravel()
+    if targets.size == 0 or (targets <= 0).any():
+        raise ValueError("target_uph_sweep의 목표 UPH는 모두 양수여야 합니다")
+    return targets
+
+
+def capacity_curve(data: Dict[str, Any]) -> Dict[str, Any]:
+    """목표 UPH 배열 전체에 대한 ceil(CT / takt) 병렬 수와 라인 지표를 (목표 × 공정) 행렬 연산으로 계산.
+
+    목표별 값은 optimize()와 같은 식이다: takt = 3600 / UPH, 병렬 수 = max(ceil(CT / takt), 1),
+    달성 UPH = 3600 / max(소수 둘째 자리 반올림한 유효 CT), 라인 효율 = Σ유효 CT / (공정 수 × takt).
+    공정 j는 목표 UPH가 3600 * n / CT_j를 넘으면 n + 1대가 필요하므로 sweep 범위 안의 분기점을
+    공정별로 보고하고, 전체 분기점을 합쳐 총 병렬 수가 늘어나는 목표 UPH 목록도 반환한다.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("target_uph_sweep에는 numpy가 필요합니다. pip install numpy")
+    processes = data["processes"]
+    targets = _sweep_targets(data["target_uph_sweep"])
+    ct = np.array([float(p["cycle_time_sec"]) for p in processes])
+    current = np.array([int(p.get("parallel_count", 1)) for p in processes])
+    num_processes = len(processes)
+
+    takt = 3600.0 / targets                                             # (T,)
+    parallel = np.maximum(np.ceil(ct[None, :] / takt[:, None]), 1).astype(int)  # (T, P)
+    eff_ct = ct[None, :] / parallel
+    total_parallel = parallel.sum(axis=1)
+    # 반올림은 단조이므로 max 후 반올림 = optimize()의 반올림 후 max (np.round와 round()는 경계값이 달라 round 사용)
+    bottleneck = np.array([round(float(v), 2) for v in eff_ct.max(axis=1)]) if num_processes else np.zeros_like(targets)
+    achieved = np.where(bottleneck > 0, 3600.0 / np.where(bottleneck > 0, bottleneck, 1.0), 0.0)
+    efficiency = eff_ct.sum(axis=1) / (num_processes * takt) * 100.0 if num_processes else np.zeros_like(targets)
+
+    lo, hi = float(targets.min()), float(targets.max())
+    breakpoints: List[Dict[str, Any]] = []
+    line_steps: Dict[float, int] = {}
+    for j, proc in enumerate(processes):
+        if ct[j] <= 0:
+            continue
+        n = np.arange(max(1, math.ceil(ct[j] * lo / 3600.0)), math.floor(ct[j] * hi / 3600.0) + 1)
+        uph = 3600.0 * n / ct[j]
+        n, uph = n[(uph >= lo) & (uph < hi)], uph[(uph >= lo) & (uph < hi)]
+        for u in uph:
+            line_steps[round(float(u), 4)] = line_steps.get(round(float(u), 4), 0) + 1
+        breakpoints.append({
+            "process_id": proc["process_id"],
+            "name": proc.get("name", ""),
+            "cycle_time_sec": float(ct[j]),
+            "current_parallel": int(current[j]),
+            "max_uph_at_current": round(3600.0 * current[j] / ct[j], 2),
+            # 목표 UPH가 uph를 넘으면 parallel_count대가 필요
+            "steps": [{"uph": round(float(u), 4), "parallel_count": int(k) + 1} for k, u in zip(n, uph)],
+        })
+
+    rows = [[round(float(t), 4), round(float(tk), 4), int(tp), round(float(a), 2), round(float(e), 2)]
+            for t, tk, tp, a, e in zip(targets, takt, total_parallel, achieved, efficiency)]
+    feasible_now = targets <= (3600.0 * current / np.where(ct > 0, ct, np.inf)).min(initial=np.inf)
+    log.info("[capacity_curve] 목표 %d개 (%.1f~%.1f UPH), 분기점 %d개", targets.size, lo, hi, len(line_steps))
+    return {
+        "capacity_curve": {
+            "columns": ["target_uph", "takt_time_sec", "total_parallel", "achieved_uph", "line_efficiency_pct"],
+            "rows": rows,
+            "process_ids": [p["process_id"] for p in processes],
+            "parallel_counts": parallel.tolist(),
+        },
+        "breakpoints": breakpoints,
+        "line_breakpoints": [{"uph": u, "stations_added": c} for u, c in sorted(line_steps.items())],
+        "summary": {
+            "n_targets": int(targets.size),
+            "min_target_uph": lo,
+            "max_target_uph": hi,
+            "total_current_parallel": int(current.sum()),
+            "max_uph_with_current": round(float(targets[feasible_now].max()), 4) if feasible_now.any() else None,
+        },
+    }
+
+
+def run(data: Dict[str, Any]) -> Dict[str, Any]:
+    """CLI/어댑터 진입점: target_uph_sweep이 있으면 용량 곡선, mode="verified"면 시뮬레이션
+    검증 탐색, mode="pareto"면 비용/UPH Pareto 구성 표, 아니면 ceil 계산."""
+    if data.get("target_uph_sweep") is not None:
+        return capacity_curve(data)
+    if data.get("mode") == "verified":
+        return optimize_verified(data)
+    if data.get("mode") == "pareto":
+        return pareto_frontier(data)
+    return optimize(data)
+
+
 # ── 어댑터 ────────────────────────────────────────────────
+# params에서 도구 입력으로 그대로 전달하는 선택 키
+_PASSTHROUGH_PARAMS = ("mode", "beam_width", "max_evaluations", "max_added_stations",
+                       "target_uph_sweep", "branch_width", "max_uph", "time_budget_sec",
+                       "resource_costs") + _SIMULATION_KEYS
+# mode="pareto"에서 설비/작업자 비용 산정을 위해 BOP에서 그대로 넘기는 키
+_RESOURCE_KEYS = ("resource_assignments", "equipments", "workers")
+
+
 def pre_process(bop_json: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
     """BOP JSON + params → 도구 입력 형태로 변환."""
     log.info("[pre_process] 호출됨")
@@ -108,7 +579,7 @@ def pre_process(bop_json: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, A
                   p.get("cycle_time_sec"), p.get("parallel_count"))
 
     target_uph = params.get("target_uph")
-    if target_uph is None:
+    if target_uph is None and params.get("target_uph_sweep") is None and params.get("mode") != "pareto":
         log.error("[pre_process] params에 'target_uph' 키가 없습니다")
         raise KeyError("params에 'target_uph' 키가 없습니다")
     log.info("[pre_process] target_uph = %s", target_uph)
@@ -117,6 +588,15 @@ def pre_process(bop_json: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, A
         "processes": processes,
         "target_uph": target_uph,
     }
+    for key in _PASSTHROUGH_PARAMS:
+        if key in params:
+            tool_input[key] = params[key]
+            log.info("[pre_process] %s=%s", key, params[key])
+    if params.get("mode") == "pareto":
+        for key in _RESOURCE_KEYS:
+            if key in bop_json:
+                tool_input[key] = bop_json[key]
+                log.info("[pre_process] %s %d개 전달", key, len(bop_json[key]))
     log.info("[pre_process] 도구 입력 생성 완료 (공정 %d개, target_uph=%s)",
              len(processes), target_uph)
     return tool_input
@@ -126,6 +606,19 @@ def post_process(bop_json: Dict[str, Any], result: Dict[str, Any]) -> Dict[str,
     """최적화 결과를 BOP에 반영: parallel_count 직접 수정 + 메타데이터 첨부."""
     log.info("[post_process] 호출됨")
     log.info("[post_process] result 키: %s", list(result.keys()))
+
+    if "frontier" in result:
+        log.info("[post_process] pareto: %s", result["summary"])
+        bop_json["_parallel_pareto"] = result
+        log.info("[post_process] bop_json['_parallel_pareto'] 키 첨부 완료 (BOP 변경 없음)")
+        return bop_json
+
+    if "capacity_curve" in result:
+        log.info("[post_process] capacity_curve: %s", result["summary"])
+        bop_json["_parallel_capacity_curve"] = result
+        log.info("[post_process] bop_json['_parallel_capacity_curve'] 키 첨부 완료 (BOP 변경 없음)")
+        return bop_json
+
     log.info("[post_process] 최적화 공정 수: %d", len(result.get("optimization", [])))
 
     opt_map = {o["process_id"]: o["optimal_parallel"] for o in result["optimization"]}
@@ -166,6 +659,11 @@ def main() -> None:
     parser.add_argument("--output", required=True, help="출력 JSON 파일 경로")
     parser.add_argument("--log-level", default="DEBUG",
                         help="로그 레벨 (DEBUG|INFO|WARNING|ERROR, default: DEBUG)")
+    parser.add_argument("--mode", default=None, choices=["verified", "pareto"],
+                        help="verified: ceil 해를 시뮬레이션으로 검증하며 최소 병렬 수 구성 탐색, "
+                             "pareto: 추가 설비/작업자 비용 대비 UPH의 비지배 구성 표")
+    parser.add_argument("--sweep", type=float, nargs=3, default=None, metavar=("START", "STOP", "STEP"),
+                        help="목표 UPH 범위 전체의 용량 곡선과 공정별 분기점 계산 (numpy 필요)")
     args, _unknown = parser.parse_known_args()
 
     level = getattr(logging, args.log_level.upper(), None)
@@ -182,8 +680,12 @@ def main() -> None:
         data = json.load(f)
     log.info("[CLI] 입력 JSON 로드 완료 (키: %s)", list(data.keys()))
 
-    result = optimize(data)
-    log.info("[CLI] optimize() 완료 — summary: %s", result.get("summary"))
+    if args.mode:
+        data["mode"] = args.mode
+    if args.sweep:
+        data["target_uph_sweep"] = dict(zip(("start", "stop", "step"), args.sweep))
+    result = run(data)
+    log.info("[CLI] run() 완료 — summary: %s", result.get("summary"))
 
     with open(args.output, "w", encoding="utf-8") as f:
         json.dump(result, f, ensure_ascii=False, indent=2)
@@ -3,6 +3,8 @@ Filename: process_relocator.py
 Description: 
     Three.js(Y-up) 좌표계 기반 공정 설비 자동 재배치 스크립트.
     AABB 알고리즘 및 나선형 탐색을 사용하여 최단 거리의 충돌 회피 좌표를 산출함.
+    장애물 AABB는 solve 호출마다 X-Z 평면 균일 격자(spatial hash)로 한 번 색인하고,
+    각 후보 위치는 겹치는 격자 셀의 장애물만 검사함.
 
 Usage:
     python process_relocator.py --input input.json --output output.json
@@ -13,6 +15,7 @@ import json
 import math
 import argparse
 import logging
+import statistics
 import sys
 
 def setup_logging(level):
@@ -22,15 +25,76 @@ def setup_logging(level):
         stream=sys.stdout
     )
 
+class ObstacleGrid:
+    """장애물 AABB의 X-Z 평면 균일 격자 색인 (spatial hash)
+
+    셀 크기는 장애물 X/Z 크기의 중앙값(최소 min_cell). 셀을 max_cells개 넘게 덮는 큰 장애물(벽 등)은
+    격자에 넣지 않고 매 질의마다 직접 검사함.
+    """
+
+    def __init__(self, obstacles, min_cell=0.5, max_cells=256):
+        # (min_x, max_x, min_y, max_y, min_z, max_z) — is_colliding의 dict 계산과 동일한 경계
+        self.boxes = []
+        for obs in obstacles:
+            o_pos, o_size = obs['pos'], obs['size']
+            self.boxes.append((
+                o_pos['x'] - o_size['x'] / 2, o_pos['x'] + o_size['x'] / 2,
+                o_pos['y'], o_pos['y'] + o_size['y'],
+                o_pos['z'] - o_size['z'] / 2, o_pos['z'] + o_size['z'] / 2,
+            ))
+
+        extents = [max(b[1] - b[0], b[5] - b[4]) for b in self.boxes]
+        self.cell = max(statistics.median(extents) if extents else min_cell, min_cell)
+        self.cells = {}
+        self.large = []
+        for idx, b in enumerate(self.boxes):
+            ix0, ix1, iz0, iz1 = self._cell_range(b[0], b[1], b[4], b[5])
+            if (ix1 - ix0 + 1) * (iz1 - iz0 + 1) > max_cells:
+                self.large.append(b)
+                continue
+            for ix in range(ix0, ix1 + 1):
+                for iz in range(iz0, iz1 + 1):
+                    self.cells.setdefault((ix, iz), []).append(b)
+        logging.debug(f"ObstacleGrid: {len(self.boxes)} obstacles, cell={self.cell:.3f}, "
+                      f"{len(self.cells)} cells, {len(self.large)} large")
+
+    def _cell_range(self, min_x, max_x, min_z, max_z):
+        c = self.cell
+        return (math.floor(min_x / c), math.floor(max_x / c),
+                math.floor(min_z / c), math.floor(max_z / c))
+
+    def hits(self, min_x, max_x, min_y, max_y, min_z, max_z):
+        """주어진 AABB와 겹치는(경계 접촉 제외) 장애물이 있으면 True"""
+        for b in self.large:
+            if min_x < b[1] and max_x > b[0] and min_y < b[3] and max_y > b[2] and \
+               min_z < b[5] and max_z > b[4]:
+                return True
+        ix0, ix1, iz0, iz1 = self._cell_range(min_x, max_x, min_z, max_z)
+        cells = self.cells
+        for ix in range(ix0, ix1 + 1):
+            for iz in range(iz0, iz1 + 1):
+                for b in cells.get((ix, iz), ()):
+                    if min_x < b[1] and max_x > b[0] and min_y < b[3] and max_y > b[2] and \
+                       min_z < b[5] and max_z > b[4]:
+                        return True
+        return False
+
+
 class ProcessOptimizer:
     def __init__(self, step=0.5, max_range=20.0):
         self.step = step
         self.max_range = max_range
 
     def is_colliding(self, p_pos, p_size, p_rot_y, obstacles):
-        """Three.js Y-up 좌표계 기준 AABB 충돌 검사"""
+        """Three.js Y-up 좌표계 기준 AABB 충돌 검사 (obstacles: 장애물 목록 또는 ObstacleGrid)"""
         # 회전(90/270도)에 따른 X, Z 크기 스왑 결정
         is_rotated = abs(math.sin(p_rot_y)) > 0.5
+        if isinstance(obstacles, ObstacleGrid):
+            half_x = (p_size['z'] if is_rotated else p_size['x']) / 2
+            half_z = (p_size['x'] if is_rotated else p_size['z']) / 2
+            return obstacles.hits(p_pos['x'] - half_x, p_pos['x'] + half_x,
+                                  p_pos['y'], p_pos['y'] + p_size['y'],
+                                  p_pos['z'] - half_z, p_pos['z'] + half_z)
         actual_size = {
             'x': p_size['z'] if is_rotated else p_size['x'],
             'y': p_size['y'],
@@ -74,7 +138,10 @@ class ProcessOptimizer:
         origin_pos = process['pos']
         # 4가지 회전 방향 고려 (Radian)
         rotations = [0, math.pi/2, math.pi, (3 * math.pi)/2]
-        
+        # 0/180도, 90/270도는 AABB가 같으므로 같은 위치에서 한 번만 검사
+        footprints = [abs(math.sin(rot)) > 0.5 for rot in rotations]
+        grid = ObstacleGrid(obstacles, min_cell=self.step)
+
         logging.debug(f"Starting search near: {origin_pos}")
 
         r = 0.0
@@ -93,8 +160,12 @@ class ProcessOptimizer:
                         'z': origin_pos['z'] + iz * self.step
                     }
 
-                    for rot in rotations:
-                        if not self.is_colliding(test_pos, process['size'], rot, obstacles):
+                    tested = set()
+                    for rot, footprint in zip(rotations, footprints):
+                        if footprint in tested:
+                            continue
+                        tested.add(footprint)
+                        if not self.is_colliding(test_pos, process['size'], rot, grid):
                             logging.info(f"Optimization Success! Position: {test_pos}, Rotation: {rot}")
                             return {
                                 "success": True,
@@ -0,0 +1,122 @@
+"""
+line_balancer 테스트
+- 공개 SALBP 벤치마크(Jackson 11작업)의 알려진 최적 스테이션 수 / 사이클 타임
+- 선후행 순환, takt보다 긴 작업 처리
+- 어댑터: parallel_lines 구조 BOP(input.json)의 pre_process → balance → post_process
+"""
+import copy
+import json
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import line_balancer  # noqa: E402
+
+# Jackson (1956), Scholl SALBP 데이터셋 JACKSON.IN2: 작업 시간과 선후행 관계 (작업 번호 1부터)
+JACKSON_TIMES = [6, 2, 5, 7, 1, 2, 3, 6, 5, 5, 4]
+JACKSON_ARCS = [(1, 2), (1, 3), (1, 4), (1, 5), (2, 6), (3, 7), (4, 7), (5, 7),
+                (6, 8), (7, 9), (8, 10), (9, 11), (10, 11)]
+
+
+def jackson_processes():
+    return [{"process_id": f"T{i:02d}", "cycle_time_sec": float(t),
+             "predecessor_ids": [f"T{a:02d}" for a, b in JACKSON_ARCS if b == i]}
+            for i, t in enumerate(JACKSON_TIMES, start=1)]
+
+
+def assert_feasible(result, cycle):
+    """모든 작업이 한 번씩, 선후행 순서대로, 스테이션 부하가 사이클 이내로 배정되었는지 확인."""
+    station_of = {}
+    for k, station in enumerate(result["stations"]):
+        for pid in station["process_ids"]:
+            assert pid not in station_of
+            station_of[pid] = k
+        assert station["effective_ct_sec"] <= cycle + 1e-9
+    assert sorted(station_of) == [f"T{i:02d}" for i in range(1, len(JACKSON_TIMES) + 1)]
+    for a, b in JACKSON_ARCS:
+        assert station_of[f"T{a:02d}"] <= station_of[f"T{b:02d}"]
+
+
+# ── SALBP-1: takt → 최소 스테이션 수 ──────────────────────
+@pytest.mark.parametrize("cycle,stations", [(7, 8), (9, 6), (10, 5), (13, 4), (14, 4), (21, 3)])
+def test_jackson_salbp1_optimal_station_count(cycle, stations):
+    result = line_balancer.balance({"processes": jackson_processes(), "takt_time_sec": cycle})
+
+    assert result["problem"] == "SALBP-1"
+    assert result["solver"]["optimal"] is True
+    assert result["summary"]["num_stations"] == stations
+    assert result["solver"]["lower_bound"] <= stations
+    assert_feasible(result, cycle)
+
+
+def test_target_uph_is_converted_to_takt():
+    result = line_balancer.balance({"processes": jackson_processes(), "target_uph": 360})  # takt 10초
+
+    assert result["takt_time_sec"] == 10.0
+    assert result["summary"]["num_stations"] == 5
+
+
+# ── SALBP-2: 스테이션 수 → 최소 사이클 타임 ────────────────
+@pytest.mark.parametrize("station_count,cycle", [(2, 23), (3, 16), (4, 12), (5, 10), (6, 9), (7, 8), (8, 7)])
+def test_jackson_salbp2_optimal_cycle_time(station_count, cycle):
+    result = line_balancer.balance({"processes": jackson_processes(), "station_count": station_count})
+
+    assert result["problem"] == "SALBP-2"
+    assert result["solver"]["optimal"] is True
+    assert result["summary"]["cycle_time_sec"] == pytest.approx(cycle)
+    assert result["summary"]["num_stations"] <= station_count
+    assert_feasible(result, cycle)
+
+
+# ── 오류 / 특수 경로 ──────────────────────────────────────
+def test_precedence_cycle_is_rejected():
+    processes = jackson_processes()
+    processes[0]["predecessor_ids"] = ["T11"]  # T01 → ... → T11 → T01
+
+    with pytest.raises(ValueError, match="선후행 관계에 순환이 있습니다"):
+        line_balancer.balance({"processes": processes, "takt_time_sec": 10})
+
+
+def test_task_longer_than_takt_gets_own_parallel_station():
+    takt = 5.0
+    result = line_balancer.balance({"processes": jackson_processes(), "takt_time_sec": takt})
+
+    oversized = {f"T{i:02d}": t for i, t in enumerate(JACKSON_TIMES, start=1) if t > takt}
+    for station in result["stations"]:
+        pids = station["process_ids"]
+        if any(pid in oversized for pid in pids):
+            assert len(pids) == 1
+            assert station["parallel_count"] == math.ceil(oversized[pids[0]] / takt)
+        else:
+            assert station["parallel_count"] == 1
+    assert_feasible(result, takt)
+    assert result["summary"]["num_stations"] == sum(s["parallel_count"] for s in result["stations"])
+
+
+# ── 어댑터: parallel_lines 구조 BOP ───────────────────────
+@pytest.mark.parametrize("params", [{"target_uph": 30}, {"takt_time_sec": 90}, {"station_count": 3}])
+def test_post_process_rebuilds_parallel_lines_on_input_json(params):
+    with open(project_root / "input.json", "r", encoding="utf-8") as f:
+        bop = json.load(f)
+    original_ids = [p["process_id"] for p in bop["processes"]]
+
+    tool_input = line_balancer.pre_process(copy.deepcopy(bop), params)
+    result = json.loads(json.dumps(line_balancer.run(tool_input)))  # 도구 출력은 JSON으로 전달
+    updated = line_balancer.post_process(copy.deepcopy(bop), result)
+
+    merged = [pid for s in updated["_line_balancing"]["stations"] for pid in s["process_ids"]]
+    assert sorted(merged) == sorted(original_ids)
+    for proc, station in zip(updated["processes"], updated["_line_balancing"]["stations"]):
+        lines = proc["parallel_lines"]
+        assert [ln["parallel_index"] for ln in lines] == list(range(1, proc["parallel_count"] + 1))
+        assert all(ln["cycle_time_sec"] == station["load_sec"] for ln in lines)
+        assert all(isinstance(ln["location"], dict) for ln in lines)
+        assert len({(ln["location"]["x"], ln["location"]["z"]) for ln in lines}) == len(lines)
+        assert all(r.get("parallel_line_index", 0) < proc["parallel_count"] for r in proc.get("resources", []))
+        assert "cycle_time_sec" not in proc and "location" not in proc  # 새 BOP 구조: parallel_lines에만
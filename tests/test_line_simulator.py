@@ -0,0 +1,725 @@
+"""
+line_simulator 테스트
+- 엔진 간 결과 일치 (parallel vs sequential)
+- LineSimulation 증분 재계산 vs 전체 재시뮬레이션
+- 체크포인트 중단/재개, 손상 슬롯 복구
+- 분산 반복 실험: 워커 중단 시 임대 만료/재할당, 중복 결과 처리, 루프백 기본 바인딩, 워커 입력 정리/검증
+- event 엔진 정체(buffer_capacity=1)
+- maxplus: 무한 버퍼 직렬 라인에서 sequential과 일치, 유한 버퍼 정체 가능 시 경고
+- 트레이스: 즉시 입력 검증, 결과 일치
+- replay: sequential 트레이스 로그 재생 시 KPI 재현, 버퍼 모델로 정체 추론
+- adaptive 배치 평균: 첫 배치 구간
+- triangular CT 분포 입력 검증
+- 민감도 분석: 배치 평가 결과 = 공정별 개별 실행 차이, 순위 정렬
+- 버퍼 최적화: 전수 탐색 최소 버퍼 합계와 일치
+- 결과 캐시(ResultCache): 적중/미스, 캐시 제외 입력, 메모리 LRU / 디스크 크기 제한 삭제
+- analytic 추정: Schweitzer 근사 MVA vs 정확 MVA, 모집단 크기와 무관한 비용
+"""
+import copy
+import http.server
+import itertools
+import json
+import logging
+import os
+import random
+import socket
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import line_simulator  # noqa: E402
+
+
+def branched_line(branches: int, depth: int, buffer_capacity=None, stochastic: bool = False):
+    """투입 → branches개 서브 조립 가지(각 depth 공정) → 합류 → 검사 라인."""
+    processes = [{"process_id": "IN", "cycle_time_sec": 20.0, "parallel_count": 1, "predecessor_ids": []}]
+    tails = []
+    for b in range(branches):
+        prev = "IN"
+        for d in range(depth):
+            pid = f"B{b}_{d}"
+            processes.append({"process_id": pid, "cycle_time_sec": 25.0 + 7 * b + 3 * d,
+                              "parallel_count": 1 + (b + d) % 2, "predecessor_ids": [prev]})
+            prev = pid
+        tails.append(prev)
+    processes.append({"process_id": "MERGE", "cycle_time_sec": 40.0, "parallel_count": 2,
+                      "predecessor_ids": tails})
+    processes.append({"process_id": "QC", "cycle_time_sec": 30.0, "parallel_count": 1,
+                      "predecessor_ids": ["MERGE"]})
+    for p in processes:
+        if buffer_capacity is not None:
+            p["buffer_capacity"] = buffer_capacity
+        if stochastic:
+            ct = p["cycle_time_sec"]
+            p["cycle_time_dist"] = {"type": "triangular", "min": 0.8 * ct, "max": 1.4 * ct}
+    return processes
+
+
+def _without_engine(result):
+    result = copy.deepcopy(result)
+    result.pop("parallel", None)
+    result["simulation_summary"].pop("engine", None)
+    return result
+
+
+# ── engine="parallel" == engine="sequential" ─────────────
+@pytest.mark.parametrize("branches,depth,buffer_capacity,stochastic", [
+    (2, 3, None, False),
+    (3, 4, 1, False),
+    (4, 2, 1, True),
+    (3, 3, None, True),
+])
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_parallel_engine_matches_sequential(branches, depth, buffer_capacity, stochastic, max_workers):
+    data = {"processes": branched_line(branches, depth, buffer_capacity, stochastic),
+            "num_products": 150, "warmup_products": 15, "max_workers": max_workers,
+            "parallel_chunk_products": 16}
+    if stochastic:
+        data.update({"seed": 7, "common_random_numbers": True})
+
+    sequential = line_simulator.run({**data, "engine": "sequential"})
+    parallel = line_simulator.run({**data, "engine": "parallel"})
+
+    assert parallel["simulation_summary"]["engine"] == "parallel"
+    assert _without_engine(parallel) == _without_engine(sequential)
+
+
+def test_parallel_engine_requires_crn_for_stochastic_ct():
+    data = {"processes": branched_line(2, 2, stochastic=True), "engine": "parallel", "seed": 1}
+    with pytest.raises(ValueError, match="common_random_numbers"):
+        line_simulator.run(data)
+
+
+# ── checkpoint_path / resume ─────────────────────────────
+def serial_line(stations: int, stochastic: bool = False):
+    processes = []
+    for i in range(stations):
+        ct = 30.0 + (i * 13) % 40
+        p = {"process_id": f"S{i:02d}", "cycle_time_sec": ct, "parallel_count": 1 + i % 3,
+             "predecessor_ids": [f"S{i - 1:02d}"] if i else []}
+        if stochastic:
+            p["cycle_time_dist"] = {"type": "triangular", "min": 0.7 * ct, "max": 1.5 * ct}
+        processes.append(p)
+    return processes
+
+
+def _interrupt_after(monkeypatch, calls: int) -> None:
+    """_sequential_advance를 calls번 진행한 뒤 예외로 실행을 끊는다 (프로세스 중단 대용)."""
+    advance = line_simulator._sequential_advance
+    count = {"n": 0}
+
+    def interrupted(*args, **kwargs):
+        if count["n"] == calls:
+            raise KeyboardInterrupt
+        count["n"] += 1
+        return advance(*args, **kwargs)
+
+    monkeypatch.setattr(line_simulator, "_sequential_advance", interrupted)
+
+
+def _without_checkpoint(result):
+    result = copy.deepcopy(result)
+    result.pop("checkpoint", None)
+    return result
+
+
+@pytest.mark.parametrize("extra", [
+    {},
+    {"seed": 3},
+    {"seed": 3, "common_random_numbers": True},
+])
+def test_checkpoint_resume_matches_uninterrupted_run(tmp_path, monkeypatch, extra):
+    stochastic = bool(extra)
+    data = {"processes": serial_line(8, stochastic), "num_products": 400, "warmup_products": 40, **extra}
+    reference = line_simulator.run(copy.deepcopy(data))
+
+    ckpt = {**data, "checkpoint_path": str(tmp_path / "run.ckpt"), "checkpoint_interval_sec": 0}
+    with monkeypatch.context() as m:
+        _interrupt_after(m, 30)
+        with pytest.raises(KeyboardInterrupt):
+            line_simulator.run(copy.deepcopy(ckpt))
+
+    resumed = line_simulator.run({**copy.deepcopy(ckpt), "resume": True})
+
+    assert resumed["checkpoint"]["resumed_from_product"] == 120  # chunk 4제품 × 30회
+    assert _without_checkpoint(resumed) == reference
+
+
+def test_checkpoint_falls_back_to_other_slot_on_crc_mismatch(tmp_path, monkeypatch):
+    data = {"processes": serial_line(6, stochastic=True), "num_products": 400, "warmup_products": 40,
+            "seed": 11}
+    reference = line_simulator.run(copy.deepcopy(data))
+
+    path = tmp_path / "run.ckpt"
+    ckpt = {**data, "checkpoint_path": str(path), "checkpoint_interval_sec": 0}
+    with monkeypatch.context() as m:
+        _interrupt_after(m, 30)
+        with pytest.raises(KeyboardInterrupt):
+            line_simulator.run(copy.deepcopy(ckpt))
+
+    # 스냅샷 30회: 최신(seq 30, 120제품)은 슬롯 0, 직전(seq 29, 116제품)은 슬롯 1
+    header = line_simulator._CheckpointFile.HEADER.size
+    raw = bytearray(path.read_bytes())
+    raw[header + line_simulator._CheckpointFile.SLOT.size + 5] ^= 0xFF
+    path.write_bytes(bytes(raw))
+
+    resumed = line_simulator.run({**copy.deepcopy(ckpt), "resume": True})
+
+    assert resumed["checkpoint"]["resumed_from_product"] == 116
+    assert _without_checkpoint(resumed) == reference
+
+
+# ── LineSimulation.update_process (증분 재계산) ──────────
+@pytest.mark.parametrize("processes", [
+    serial_line(8), branched_line(3, 3, buffer_capacity=1), branched_line(2, 4),
+], ids=["serial", "branched-blocking", "branched"])
+def test_incremental_update_matches_full_resimulation(processes):
+    data = {"processes": processes, "num_products": 300, "warmup_products": 30}
+    sim = line_simulator.LineSimulation(copy.deepcopy(data))
+    assert sim.run() == line_simulator.run(copy.deepcopy(data))
+
+    rng = random.Random(1)
+    current = copy.deepcopy(data)
+    for _ in range(8):
+        proc = rng.choice(current["processes"])
+        if rng.random() < 0.5:
+            proc["cycle_time_sec"] = rng.choice([20.0, 35.0, 55.0, 80.0])
+            result = sim.update_process(proc["process_id"], cycle_time_sec=proc["cycle_time_sec"])
+        else:
+            proc["parallel_count"] = rng.randint(1, 3)
+            result = sim.update_process(proc["process_id"], parallel_count=proc["parallel_count"])
+        assert result == line_simulator.run(copy.deepcopy(current))
+
+
+def test_incremental_update_from_product_matches_full_replay():
+    data = {"processes": branched_line(2, 3, buffer_capacity=2), "num_products": 400, "warmup_products": 40}
+    sim = line_simulator.LineSimulation(copy.deepcopy(data), checkpoint_interval=25)
+    sim.run()
+    sim.update_process("B0_1", cycle_time_sec=60.0, from_product=130)
+    result = sim.update_process("B1_0", cycle_time_sec=15.0, from_product=260)
+    assert sim.last_update["checkpoint"] == 250
+
+    # 같은 CT 구간으로 처음부터 전 공정을 다시 계산한 결과와 동일 (보고되는 CT는 마지막 변경값)
+    latest = copy.deepcopy(data)
+    for proc in latest["processes"]:
+        proc["cycle_time_sec"] = {"B0_1": 60.0, "B1_0": 15.0}.get(proc["process_id"], proc["cycle_time_sec"])
+    full = line_simulator.LineSimulation(latest, checkpoint_interval=25)
+    full._ct_segments = copy.deepcopy(sim._ct_segments)
+    assert full.run() == result
+
+# ── coordinator_address / run_worker ─────────────────────
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _lease_and_die(url: str, timeout: float = 10.0) -> int:
+    """작업 하나를 임대한 뒤 결과를 보내지 않는 워커 (작업 도중 종료된 워커)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/job", timeout=5) as resp:
+                if resp.status == 200:
+                    return json.load(resp)["replication"]
+        except OSError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError("코디네이터가 작업을 제공하지 않았습니다")
+
+
+def test_distributed_run_survives_dead_worker(caplog):
+    data = {"processes": serial_line(6, stochastic=True), "num_products": 200, "warmup_products": 20,
+            "seed": 5, "n_replications": 6, "max_workers": 1}
+    local = line_simulator.run(copy.deepcopy(data))
+
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    remote = {**copy.deepcopy(data), "coordinator_address": f"127.0.0.1:{port}", "lease_sec": 0.5}
+    outcome = {}
+
+    def coordinate():
+        outcome["result"] = line_simulator.run(remote)
+
+    caplog.set_level(logging.WARNING, logger="line_simulator")
+    coordinator = threading.Thread(target=coordinate)
+    coordinator.start()
+    abandoned = _lease_and_die(url)
+
+    done = []
+    workers = [threading.Thread(target=lambda: done.append(line_simulator.run_worker(url, idle_timeout=2.0,
+                                                                                     poll_sec=0.05)))
+               for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    coordinator.join(timeout=60)
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert not coordinator.is_alive()
+    # 버려진 작업도 재할당되어 살아 있는 워커가 처리 (느린 워커의 중복 결과는 코디네이터가 버림)
+    assert sum(done) >= data["n_replications"]
+    assert f"반복 {abandoned} 임대 만료" in caplog.text
+    assert outcome["result"]["simulation_summary"] == local["simulation_summary"]
+    assert outcome["result"]["replications"] == local["replications"]
+
+
+@pytest.mark.parametrize("address,allowed", [
+    (":8765", True), ("127.0.0.1:8765", True), ("localhost:8765", True), ("[::1]:8765", True),
+    ("0.0.0.0:8765", False), ("10.0.0.5:8765", False),
+])
+def test_coordinator_binds_loopback_unless_remote_workers_allowed(address, allowed):
+    data = {"processes": serial_line(2), "n_replications": 2, "coordinator_address": address}
+    host, port = line_simulator._coordinator_bind(address)
+    assert port == 8765 and (host == "127.0.0.1" or address.strip("[]").startswith(host))
+
+    if allowed:
+        line_simulator._validate(data)
+    else:
+        with pytest.raises(ValueError, match="allow_remote_workers"):
+            line_simulator._validate(data)
+    line_simulator._validate({**data, "allow_remote_workers": True})
+
+
+def _work_on_board(board):
+    """board를 제공하는 코디네이터 + 워커 1개로 실행 (모든 결과 또는 오류가 모이면 코디네이터 종료)."""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), line_simulator._CoordinatorHandler)
+    server.daemon_threads = True
+    server.board = board
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    done = []
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    worker = threading.Thread(target=lambda: done.append(line_simulator.run_worker(url, idle_timeout=0.5,
+                                                                                  poll_sec=0.05)))
+    worker.start()
+    try:
+        return board.wait()
+    finally:
+        server.shutdown()
+        server.server_close()
+        worker.join(timeout=30)
+
+
+def test_worker_strips_side_effect_keys_and_validates(tmp_path):
+    checkpoint = tmp_path / "worker.ckpt"
+    data = {"processes": serial_line(4), "num_products": 60, "warmup_products": 5, "n_replications": 2,
+            "checkpoint_path": str(checkpoint), "resume": True, "event_log": str(tmp_path / "events.csv")}
+    runs = _work_on_board(line_simulator._JobBoard(data, n_replications=2, lease_sec=60.0))
+
+    assert list(tmp_path.iterdir()) == []  # 체크포인트 파일을 만들지 않는다
+    plain = {k: v for k, v in data.items() if k not in ("checkpoint_path", "resume", "event_log")}
+    assert [r["simulation_summary"] for r in runs] == [
+        line_simulator._run_replication(plain, r)["simulation_summary"] for r in range(2)]
+
+    bad = {**data, "processes": [{**p, "buffer_capacity": 0} for p in serial_line(2)]}
+    with pytest.raises(RuntimeError, match="buffer_capacity must be >= 1"):
+        _work_on_board(line_simulator._JobBoard(bad, n_replications=2, lease_sec=60.0))
+
+def test_job_board_ignores_duplicate_results():
+    board = line_simulator._JobBoard({"processes": serial_line(2)}, n_replications=2, lease_sec=60.0)
+    first = board.lease()
+    board.leased[first] = 0.0  # 임대 시간 경과
+    assert board.lease() == 1 - first  # 다른 작업을 임대하며 first의 임대는 만료 → 재할당 대기
+    assert board.requeued == 1 and first in board.pending
+
+    # 늦게 도착한 원래 워커의 결과도 유효: 대기 큐에서 빠지고 다시 임대되지 않는다
+    board.complete(first, {"value": "late"})
+    assert first not in board.pending and board.lease() is None
+
+    board.complete(first, {"value": "duplicate"})
+    board.complete(1 - first, {"value": "other"})
+    assert board.wait() == [
+        {"value": "late"} if r == first else {"value": "other"} for r in range(2)
+    ]
+
+
+# ── engine="event" 정체 ──────────────────────────────────
+def steady_state_uph(data) -> float:
+    """측정 제품 1개 구간의 시간(첫 측정 제품의 흐름 시간)을 빼 유한 구간 오차를 없앤 UPH.
+
+    엔진마다 측정 시작(warmup 제품 투입 시각)이 정체 여부에 따라 달라 유한 구간 UPH를 직접
+    비교하면 흐름 시간 차이가 섞인다.
+    """
+    warmup, num_products = data["warmup_products"], data["num_products"]
+    span = line_simulator.run(data)["simulation_summary"]["total_time_sec"]
+    head = line_simulator.run({**data, "num_products": warmup + 1})["simulation_summary"]["total_time_sec"]
+    return (num_products - warmup - 1) / (span - head) * 3600.0
+
+
+@pytest.mark.parametrize("stations", [3, 6, 10])
+@pytest.mark.parametrize("stochastic", [False, True])
+@pytest.mark.parametrize("single_server", [True, False])
+def test_event_blocking_never_exceeds_sequential_uph(stations, stochastic, single_server):
+    processes = serial_line(stations, stochastic)
+    for p in processes:
+        p["buffer_capacity"] = 1
+        if single_server:
+            p["parallel_count"] = 1
+    data = {"processes": processes, "num_products": 2000, "warmup_products": 100,
+            "seed": 4, "common_random_numbers": True}
+
+    event = steady_state_uph({**data, "engine": "event"})
+    sequential = steady_state_uph({**data, "engine": "sequential"})
+
+    assert event <= sequential * (1 + 1e-6)  # total_time_sec 반올림(0.01초) 오차
+
+
+def test_event_reports_blocking_upstream_of_bottleneck():
+    processes = [dict(p, parallel_count=1, buffer_capacity=1) for p in serial_line(6)]
+    result = line_simulator.run({"processes": processes, "num_products": 300, "warmup_products": 30,
+                                 "engine": "event"})
+    blocking = [pa["blocking_pct"] for pa in result["process_analysis"]]
+    bottleneck = max(range(len(processes)), key=lambda j: processes[j]["cycle_time_sec"])
+
+    assert all(b > 0 for b in blocking[:bottleneck])
+    assert all(b == 0 for b in blocking[bottleneck:])
+
+
+# ── engine="maxplus" ─────────────────────────────────────
+def _without_queue_length(result):
+    """sequential의 max_queue_length는 제품 단위 진행 중의 버퍼 카운터라 실제 대기 수와 다르다."""
+    result = _without_engine(result)
+    for pa in result["process_analysis"]:
+        pa.pop("max_queue_length")
+    return result
+
+
+@pytest.mark.parametrize("stations", [1, 4, 9])
+def test_maxplus_matches_sequential_with_unbounded_buffers(stations, caplog):
+    pytest.importorskip("numpy")
+    processes = [{**p, "buffer_capacity": 10 ** 6} for p in serial_line(stations)]
+    data = {"processes": processes, "num_products": 400, "warmup_products": 40, "block_size": 64}
+
+    caplog.set_level(logging.WARNING, logger="line_simulator")
+    maxplus = line_simulator.run({**data, "engine": "maxplus"})
+    sequential = line_simulator.run({**data, "engine": "sequential"})
+
+    assert _without_queue_length(maxplus) == _without_queue_length(sequential)
+    assert "버퍼 정체를 모델링하지 않습니다" not in caplog.text
+
+
+def test_maxplus_warns_when_finite_buffer_would_block(caplog):
+    pytest.importorskip("numpy")
+    data = {"processes": serial_line(4), "num_products": 200, "warmup_products": 20, "engine": "maxplus"}
+
+    caplog.set_level(logging.WARNING, logger="line_simulator")
+    result = line_simulator.run(data)
+
+    assert all(pa["blocking_pct"] == 0.0 for pa in result["process_analysis"])
+    assert "버퍼 정체를 모델링하지 않습니다" in caplog.text
+    assert line_simulator.run({**data, "engine": "event"})["simulation_summary"]["throughput_uph"] <= (
+        result["simulation_summary"]["throughput_uph"])
+
+# ── iter_trace / write_trace ─────────────────────────────
+@pytest.mark.parametrize("bad", [
+    {"engine": "event"},
+    {"n_replications": 3},
+    {"num_products": 10, "warmup_products": 20},
+])
+def test_iter_trace_validates_on_call(tmp_path, bad):
+    data = {"processes": serial_line(3), "num_products": 50, "warmup_products": 5, **bad}
+
+    with pytest.raises(ValueError):
+        line_simulator.iter_trace(data)  # next() 전에 예외
+    with pytest.raises(ValueError):
+        line_simulator.write_trace(data, str(tmp_path / "trace.ndjson"))
+    assert not (tmp_path / "trace.ndjson").exists()
+
+
+def test_iter_trace_records_and_result_match_run():
+    data = {"processes": serial_line(4, stochastic=True), "num_products": 60, "warmup_products": 6, "seed": 9}
+    trace = line_simulator.iter_trace(data, chunk_products=7)
+    records = []
+    while True:
+        try:
+            records.append(next(trace))
+        except StopIteration as stop:
+            result = stop.value
+            break
+
+    assert len(records) == 60 * 4
+    assert result == line_simulator.run(copy.deepcopy(data))
+
+
+# ── replay (이벤트 로그 재생) ────────────────────────────
+def write_event_log(data, path):
+    """sequential 트레이스 → 실측 형식 CSV 이벤트 로그 (같은 시각이면 완료를 시작보다 먼저)."""
+    trace = line_simulator.iter_trace(data)
+    events = []
+    for rec in trace:
+        events.append((rec["start"], 1, rec["process_id"], "start"))
+        events.append((rec["finish"] - rec["block"], 0, rec["process_id"], "finish"))
+    events.sort()
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("timestamp,process_id,event\n")
+        for t, _order, pid, kind in events:
+            f.write(f"{t!r},{pid},{kind}\n")
+    return events
+
+
+def test_replay_of_sequential_trace_reproduces_kpis(tmp_path):
+    processes = [{**p, "buffer_capacity": 10 ** 6} for p in serial_line(6, stochastic=True)]
+    data = {"processes": processes, "num_products": 300, "warmup_products": 0, "seed": 4}
+    path = str(tmp_path / "events.csv")
+    events = write_event_log(data, path)
+
+    result = line_simulator.run({**data, "mode": "replay", "event_log": path})
+
+    span = events[-1][0] - events[0][0]
+    records = list(line_simulator.iter_trace(data))
+    assert result["replay"]["anomalies"] == {} and result["replay"]["events"] == len(events)
+    assert result["simulation_summary"]["throughput_uph"] == pytest.approx(300 / span * 3600, abs=0.01)
+    for j, pa in enumerate(result["process_analysis"]):
+        mine = [r for r in records if r["process_id"] == pa["process_id"]]
+        busy = sum(r["finish"] - r["block"] - r["start"] for r in mine)
+        assert pa["utilization_pct"] == pytest.approx(busy / (pa["parallel_count"] * span) * 100, abs=0.01)
+        assert pa["blocking_pct"] == 0.0
+        if j:  # 대기 시간 = 선행 완료(버퍼 투입) ~ 시작, 리틀의 법칙 적분과 같다
+            assert pa["avg_wait_time_sec"] == pytest.approx(sum(r["wait"] for r in mine) / len(mine), abs=0.01)
+
+
+def test_replay_infers_blocking_from_buffer_model():
+    processes = [{"process_id": "A", "cycle_time_sec": 10.0, "parallel_count": 1, "predecessor_ids": []},
+                 {"process_id": "B", "cycle_time_sec": 30.0, "parallel_count": 1, "predecessor_ids": ["A"],
+                  "buffer_capacity": 1}]
+    events = [(0, "A", "start"), (10, "A", "finish"), (10, "A", "start"), (12, "B", "start"),
+              (20, "A", "finish"), (20, "A", "start"), (30, "A", "finish"),  # B 버퍼(1) 가득 → A 정체
+              (42, "B", "finish"), (42, "B", "start"), (42, "A", "start"),  # B 투입으로 A 정체 해소
+              (72, "B", "finish"), (72, "B", "start"), (102, "B", "finish")]
+
+    result = line_simulator.replay({"processes": processes}, iter(events))
+    a, b = result["process_analysis"]
+
+    assert result["replay"]["anomalies"] == {}
+    assert result["simulation_summary"]["throughput_uph"] == pytest.approx(3 / 102 * 3600, abs=0.01)
+    assert (a["utilization_pct"], a["blocking_pct"], a["starving_pct"]) == (
+        round(90 / 102 * 100, 2), round(12 / 102 * 100, 2), 0.0)
+    assert (b["utilization_pct"], b["starving_pct"]) == (round(90 / 102 * 100, 2), round(12 / 102 * 100, 2))
+    assert b["avg_wait_time_sec"] == 18.0  # 버퍼 길이 적분 54초 / 시작 3회
+
+# ── adaptive (batch means) ───────────────────────────────
+def test_adaptive_batches_are_equal_on_deterministic_line():
+    """첫 배치도 warmup 제품의 완료 시각부터 재므로 결정적 라인의 배치 UPH는 모두 같다."""
+    data = {"processes": serial_line(5), "adaptive": True, "warmup_products": 20,
+            "batch_products": 30, "min_batches": 10}  # 30 = 병렬 수(1, 2, 3) 최소공배수의 배수
+    adaptive = line_simulator.run(data)["simulation_summary"]["adaptive"]
+
+    assert adaptive["converged"] is True
+    assert adaptive["batches"] == 10
+    assert adaptive["rel_half_width"] == 0.0
+
+
+# ── cycle_time_dist 검증 ─────────────────────────────────
+def test_triangular_default_mode_outside_range_is_rejected():
+    processes = serial_line(3)
+    processes[1]["cycle_time_dist"] = {"type": "triangular", "min": 10, "max": 20}  # CT 43 > max
+
+    with pytest.raises(ValueError, match=r"mode 기본값 cycle_time_sec\(43\).*\[10, 20\].*S01"):
+        line_simulator.run({"processes": processes, "seed": 1})
+
+
+def test_triangular_explicit_mode_and_default_dist_are_checked():
+    processes = serial_line(3)
+    processes[0]["cycle_time_dist"] = {"type": "triangular", "min": 20, "max": 40, "mode": 45}
+    with pytest.raises(ValueError, match=r"mode\(45\)"):
+        line_simulator.run({"processes": processes, "seed": 1})
+
+    # 공정에 분포가 없으면 data의 기본 분포로 검사 (S00 CT 30만 범위 안)
+    with pytest.raises(ValueError, match="S01"):
+        line_simulator.run({"processes": serial_line(3), "seed": 1,
+                            "cycle_time_dist": {"type": "triangular", "min": 25, "max": 35}})
+
+
+def test_batch_override_moving_ct_outside_triangular_range_is_rejected():
+    processes = serial_line(3, stochastic=True)  # min 0.7 CT, max 1.5 CT
+    variants = [{"name": "slow", "overrides": {"S00": {"cycle_time_sec": 100.0}}}]
+
+    with pytest.raises(ValueError, match="S00"):
+        line_simulator.simulate_batch({"processes": processes, "seed": 1, "max_workers": 1}, variants)
+
+
+def test_sensitivity_scales_triangular_range_with_ct():
+    processes = serial_line(3)
+    for p in processes:
+        p["cycle_time_dist"] = {"type": "triangular", "min": p["cycle_time_sec"], "max": 1.3 * p["cycle_time_sec"]}
+
+    result = line_simulator.run({"processes": processes, "mode": "sensitivity", "seed": 1, "max_workers": 1})
+
+    assert len(result["rows"]) == len(processes)
+
+
+@pytest.mark.parametrize("stochastic", [False, True])
+def test_sensitivity_matches_one_at_a_time_runs(stochastic):
+    processes = branched_line(2, 2, buffer_capacity=2, stochastic=stochastic)
+    base = {"processes": processes, "num_products": 200, "warmup_products": 20, "seed": 3, "max_workers": 1}
+    result = line_simulator.run({**base, "mode": "sensitivity"})
+    columns = result["columns"]
+
+    # 확률적 CT의 배치 평가는 공통 난수를 켜므로 개별 실행도 같은 난수열로 비교
+    single = {**base, "common_random_numbers": True} if stochastic else base
+
+    def uph(changes):
+        variant = copy.deepcopy(processes)
+        for proc in variant:
+            proc.update(changes.get(proc["process_id"], {}))
+        return line_simulator.run({**single, "processes": variant})["simulation_summary"]["throughput_uph"]
+
+    base_uph = uph({})
+    assert result["sensitivity_summary"]["base_throughput_uph"] == base_uph
+    for row in result["rows"]:
+        record = dict(zip(columns, row))
+        proc = next(p for p in processes if p["process_id"] == record["process_id"])
+        faster = {"cycle_time_sec": proc["cycle_time_sec"] * 0.95}
+        if "cycle_time_dist" in proc:
+            faster["cycle_time_dist"] = {**proc["cycle_time_dist"], **{
+                k: proc["cycle_time_dist"][k] * 0.95 for k in ("min", "max", "mode") if k in proc["cycle_time_dist"]}}
+        d_ct = -0.05 * proc["cycle_time_sec"]
+
+        assert record["d_uph_d_ct"] == pytest.approx((uph({proc["process_id"]: faster}) - base_uph) / d_ct, abs=1e-4)
+        assert record["d_uph_d_parallel"] == pytest.approx(
+            uph({proc["process_id"]: {"parallel_count": proc["parallel_count"] + 1}}) - base_uph, abs=0.01)
+
+    keys = [(dict(zip(columns, row))["ct_elasticity"], -dict(zip(columns, row))["d_uph_d_parallel"])
+            for row in result["rows"]]
+    assert keys == sorted(keys) and [row[0] for row in result["rows"]] == list(range(1, len(processes) + 1))
+
+
+# ── mode="optimize_buffers" ──────────────────────────────
+def test_buffer_optimizer_matches_exhaustive_minimum():
+    """변동이 큰 균형 직렬 라인(event 엔진)에서 탐욕 탐색 + 감축 결과를 전수 탐색 최소 합계와 비교."""
+    processes = [{"process_id": f"S{i}", "cycle_time_sec": 60.0, "parallel_count": 1,
+                  "predecessor_ids": [f"S{i - 1}"] if i else [],
+                  "cycle_time_dist": {"type": "triangular", "min": 30.0, "max": 120.0, "mode": 30.0}}
+                 for i in range(4)]
+    base = {"processes": processes, "num_products": 300, "warmup_products": 30, "seed": 2,
+            "engine": "event", "common_random_numbers": True, "max_workers": 1}
+
+    def uph(plan):
+        variant = copy.deepcopy(processes)
+        for proc, capacity in zip(variant[1:], plan):
+            proc["buffer_capacity"] = capacity
+        return line_simulator.run({**base, "processes": variant})["simulation_summary"]["throughput_uph"]
+
+    table = {plan: uph(plan) for plan in itertools.product(range(1, 7), repeat=3)}
+    values = sorted(table.values())
+    for target in (values[len(values) // 5], values[len(values) // 2], values[-1]):
+        result = line_simulator.run({**base, "mode": "optimize_buffers", "target_uph": target,
+                                     "max_buffer_per_process": 6})
+        plan = tuple(p["buffer_capacity"] for p in result["process_buffers"][1:])
+
+        assert result["buffer_plan"]["feasible"] is True
+        assert result["buffer_plan"]["achieved_uph"] == table[plan] >= target
+        assert result["buffer_plan"]["total_buffer"] == min(sum(p) for p, v in table.items() if v >= target)
+        assert result["buffer_plan"]["evaluations"] < len(table)
+
+
+# ── 결과 캐시 (ResultCache) ──────────────────────────────
+def test_result_cache_hit_returns_copy_and_ignores_execution_keys(monkeypatch):
+    cache = line_simulator.ResultCache()
+    data = {"processes": serial_line(3), "num_products": 50, "warmup_products": 5}
+    first = line_simulator.run(copy.deepcopy(data), cache=cache)
+
+    def fail(_data):
+        raise AssertionError("캐시 적중인데 시뮬레이션이 실행되었습니다")
+
+    monkeypatch.setattr(line_simulator, "_run_mode", fail)
+    again = line_simulator.run({**copy.deepcopy(data), "max_workers": 4}, cache=cache)
+    assert again == first and (cache.hits, cache.misses) == (1, 1)
+
+    again["simulation_summary"]["throughput_uph"] = -1.0  # 반환값 수정이 캐시 항목에 번지지 않는다
+    assert line_simulator.run(copy.deepcopy(data), cache=cache) == first
+
+
+def test_result_cache_misses_on_changed_input_and_skips_uncacheable(tmp_path):
+    cache = line_simulator.ResultCache()
+    data = {"processes": serial_line(3), "num_products": 50, "warmup_products": 5}
+    line_simulator.run(copy.deepcopy(data), cache=cache)
+
+    line_simulator.run({**copy.deepcopy(data), "num_products": 60}, cache=cache)
+    reordered = {**copy.deepcopy(data), "processes": serial_line(3)[::-1]}
+    assert line_simulator.input_key(reordered) != line_simulator.input_key(data)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    # 체크포인트 기록 실행은 캐시를 조회/저장하지 않는다
+    line_simulator.run({**copy.deepcopy(data), "checkpoint_path": str(tmp_path / "run.ckpt")}, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2) and len(cache._entries) == 2
+    assert line_simulator.pre_process({"processes": serial_line(2)},
+                                      {"checkpoint_path": "run.ckpt"})["_no_cache"] is True
+
+
+def test_result_cache_memory_lru_evicts_least_recently_used():
+    cache = line_simulator.ResultCache(max_entries=2)
+    cache.put("a", {"value": 1})
+    cache.put("b", {"value": 2})
+    assert cache.get("a") == {"value": 1}  # a가 최근 사용
+    cache.put("c", {"value": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"value": 1} and cache.get("c") == {"value": 3}
+
+
+def test_result_cache_disk_reload_and_size_limited_pruning(tmp_path):
+    directory = tmp_path / "cache"
+    payload = {"rows": [[i, i * 0.5] for i in range(200)]}
+    cache = line_simulator.ResultCache(max_entries=1, directory=str(directory))
+    cache.put("old", payload)
+    entry_size = (directory / "old.json.gz").stat().st_size
+
+    # 메모리에서 밀려나도 디스크에서 다시 읽는다
+    cache.put("other", {"value": 0})
+    assert cache.get("old") == payload
+
+    small = line_simulator.ResultCache(max_entries=8, directory=str(directory), max_disk_bytes=2 * entry_size)
+    small.clear()
+    for i, key in enumerate(("k0", "k1", "k2")):
+        small.put(key, {**payload, "i": i})
+        timestamp = time.time() - 100 + i  # 사용 순서대로 mtime 증가
+        os.utime(directory / f"{key}.json.gz", (timestamp, timestamp))
+    small.put("k3", {**payload, "i": 3})
+
+    remaining = sorted(p.name for p in directory.iterdir())
+    assert "k0.json.gz" not in remaining and "k3.json.gz" in remaining
+    assert sum((directory / name).stat().st_size for name in remaining) <= 2 * entry_size + 64
+
+# ── mode="analytic" (Schweitzer MVA) ─────────────────────
+def exact_mva_uph(processes, population: int) -> float:
+    """직렬 라인의 정확 MVA 처리량 (Seidmann 근사: CT/c 단일 서버 + CT(c-1)/c 지연)."""
+    demands = [(p["cycle_time_sec"] / p["parallel_count"],
+                p["cycle_time_sec"] * (p["parallel_count"] - 1) / p["parallel_count"]) for p in processes]
+    queue = [0.0] * len(demands)
+    throughput = 0.0
+    for n in range(1, population + 1):
+        residence = [dq * (1.0 + q) for (dq, _dd), q in zip(demands, queue)]
+        throughput = n / sum(r + dd for r, (_dq, dd) in zip(residence, demands))
+        queue = [throughput * r for r in residence]
+    return throughput * 3600.0
+
+
+@pytest.mark.parametrize("stations,population", [(3, 1), (6, 5), (8, 30), (12, 60)])
+def test_analytic_schweitzer_is_close_to_exact_mva(stations, population):
+    processes = serial_line(stations)
+    result = line_simulator.estimate({"processes": processes, "wip_population": population})
+    summary = result["simulation_summary"]
+
+    assert summary["throughput_uph"] <= summary["capacity_uph"]
+    assert summary["throughput_uph"] == pytest.approx(
+        min(exact_mva_uph(processes, population), summary["capacity_uph"]), rel=0.05)
+
+
+def test_analytic_cost_does_not_grow_with_population():
+    processes = serial_line(12)
+    start = time.perf_counter()
+    result = line_simulator.estimate({"processes": processes, "wip_population": 10 ** 7})
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert result["simulation_summary"]["throughput_uph"] == pytest.approx(
+        result["simulation_summary"]["capacity_uph"], rel=1e-3)
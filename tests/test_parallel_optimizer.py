@@ -0,0 +1,140 @@
+"""
+parallel_optimizer 테스트
+- Pareto 모드: 비용 대비 UPH 비지배 구성, 최소 비용 / 최대 UPH 양 끝점
+- 시뮬레이션 검증 모드: 정상상태 UPH로 목표 비교
+- 용량 곡선(target_uph_sweep): 목표별 optimize() 결과와 일치, 병렬 수 분기점
+"""
+import itertools
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import parallel_optimizer  # noqa: E402
+
+CYCLE_TIMES = [50.0, 80.0, 65.0]
+UNIT_COSTS = [1.0, 3.0, 2.0]
+
+
+def costed_line(stochastic: bool = False):
+    """직렬 3공정 + 공정별 설비 1대 (단가가 서로 다름)."""
+    processes = []
+    for i, ct in enumerate(CYCLE_TIMES):
+        p = {"process_id": f"P{i + 1}", "cycle_time_sec": ct, "parallel_count": 1,
+             "predecessor_ids": [f"P{i}"] if i else [],
+             "resources": [{"resource_type": "equipment", "resource_id": f"E{i + 1}", "quantity": 1}]}
+        if stochastic:
+            p["cycle_time_dist"] = {"type": "triangular", "min": 0.8 * ct, "max": 1.3 * ct}
+        processes.append(p)
+    return {"processes": processes, "mode": "pareto",
+            "equipments": [{"equipment_id": f"E{i + 1}", "cost": c} for i, c in enumerate(UNIT_COSTS)]}
+
+
+def dominates(a, b):
+    """a = (비용, UPH)가 b를 지배: 비용 이하, UPH 이상이고 둘 중 하나는 엄격."""
+    return a[0] <= b[0] and a[1] >= b[1] and a != b
+
+
+def frontier_points(result):
+    columns = result["frontier"]["columns"]
+    cost, uph = columns.index("added_cost"), columns.index("simulated_uph")
+    return [(row[cost], row[uph]) for row in result["frontier"]["rows"]]
+
+
+@pytest.mark.parametrize("stochastic", [False, True])
+def test_pareto_frontier_is_mutually_non_dominated(stochastic):
+    data = {**costed_line(stochastic), "max_added_stations": 4, "max_uph": 1000, "seed": 2}
+    result = parallel_optimizer.run(data)
+    points = frontier_points(result)
+
+    assert len(points) >= 2
+    for a, b in itertools.permutations(points, 2):
+        assert not dominates(a, b)
+    # 최소 비용 끝점: 현재 구성 (추가 비용 0)
+    assert min(points) == (0.0, result["summary"]["current_simulated_uph"])
+    # 최대 UPH 끝점: 평가한 구성 중 최고 UPH
+    assert max(uph for _cost, uph in points) == result["summary"]["max_simulated_uph"]
+
+
+def test_pareto_frontier_matches_exhaustive_search_on_deterministic_line():
+    max_added = 4
+    result = parallel_optimizer.run({**costed_line(), "max_added_stations": max_added, "max_uph": 1000})
+
+    # 결정적 직렬 라인의 정상상태 UPH = 병목 처리 능력 min(n * 3600 / CT)
+    candidates = set()
+    for added in itertools.product(range(max_added + 1), repeat=len(CYCLE_TIMES)):
+        if sum(added) <= max_added:
+            cost = sum(a * c for a, c in zip(added, UNIT_COSTS))
+            uph = min((1 + a) * 3600.0 / ct for a, ct in zip(added, CYCLE_TIMES))
+            candidates.add((cost, round(uph, 2)))
+    expected = sorted(p for p in candidates if not any(dominates(q, p) for q in candidates))
+
+    assert frontier_points(result) == expected
+
+
+# ── mode="verified" ──────────────────────────────────────
+@pytest.mark.parametrize("target_uph", [60.0, 72.0, 110.0])
+def test_verified_accepts_ceil_solution_at_exact_capacity(target_uph):
+    """결정적 라인에서 ceil 해의 처리 능력이 목표와 같아도 유한 구간 오차로 탈락하지 않는다."""
+    data = {**costed_line(), "mode": "verified", "target_uph": target_uph, "max_workers": 2}
+    result = parallel_optimizer.run(data)
+    verification = result["verification"]
+
+    assert verification["feasible"] is True
+    assert result["summary"]["total_optimal_parallel"] == verification["ceil_total_parallel"]
+    assert verification["ceil_simulated_uph"] == pytest.approx(
+        min(o["ceil_parallel"] * 3600.0 / o["cycle_time_sec"] for o in result["optimization"]), abs=0.01)
+
+
+# ── target_uph_sweep (capacity_curve) ────────────────────
+def random_line(seed: int, size: int = 12):
+    rng = random.Random(seed)
+    return [{"process_id": f"P{i:02d}", "cycle_time_sec": rng.choice([rng.randint(20, 180), rng.uniform(20, 180)]),
+             "parallel_count": rng.randint(1, 3)} for i in range(size)]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_capacity_curve_matches_optimize_per_target(seed):
+    pytest.importorskip("numpy")
+    processes = random_line(seed)
+    # 등간격 목표 + 공정별 분기점(3600 n / CT) 정확값을 섞어 ceil 경계까지 비교
+    boundaries = [3600.0 * n / p["cycle_time_sec"] for p in processes[:4] for n in (1, 2, 3)]
+    sweep = sorted({*(5.0 + 7.5 * k for k in range(40)), *boundaries})
+    result = parallel_optimizer.run({"processes": processes, "target_uph_sweep": sweep})
+    curve = result["capacity_curve"]
+    columns = curve["columns"]
+
+    assert len(curve["rows"]) == len(sweep)
+    for target, row, counts in zip(sweep, curve["rows"], curve["parallel_counts"]):
+        record = dict(zip(columns, row))
+        expected = parallel_optimizer.optimize({"processes": processes, "target_uph": target})
+        assert counts == [o["optimal_parallel"] for o in expected["optimization"]]
+        assert record["takt_time_sec"] == expected["takt_time_sec"]
+        assert record["total_parallel"] == expected["summary"]["total_optimal_parallel"]
+        assert record["achieved_uph"] == expected["summary"]["achieved_uph"]
+        assert record["line_efficiency_pct"] == expected["summary"]["line_efficiency_pct"]
+
+
+def test_capacity_curve_breakpoints_are_where_optimize_adds_a_station():
+    pytest.importorskip("numpy")
+    processes = random_line(5, size=6)
+    result = parallel_optimizer.run({"processes": processes,
+                                     "target_uph_sweep": {"start": 10, "stop": 200, "step": 10}})
+
+    def optimal(process_id, target):
+        rows = parallel_optimizer.optimize({"processes": processes, "target_uph": target})["optimization"]
+        return next(o["optimal_parallel"] for o in rows if o["process_id"] == process_id)
+
+    assert result["breakpoints"] and all(bp["steps"] for bp in result["breakpoints"])
+    for bp in result["breakpoints"]:
+        for step in bp["steps"]:
+            assert 10 <= step["uph"] < 200
+            assert optimal(bp["process_id"], step["uph"] * (1 - 1e-5)) == step["parallel_count"] - 1
+            assert optimal(bp["process_id"], step["uph"] * (1 + 1e-5)) == step["parallel_count"]
+    assert sum(s["stations_added"] for s in result["line_breakpoints"]) == sum(
+        len(bp["steps"]) for bp in result["breakpoints"])
@@ -0,0 +1,114 @@
+"""
+process_relocator 테스트
+- ObstacleGrid 색인 충돌 검사가 장애물 목록 선형 검사와 일치 (경계 접촉, 벽 같은 큰 장애물 포함)
+- solve 결과가 색인 없는 기준 탐색(모든 회전을 장애물 목록으로 검사)과 일치
+"""
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import process_relocator  # noqa: E402
+
+ROTATIONS = [0, math.pi / 2, math.pi, (3 * math.pi) / 2]
+
+
+def random_scene(seed: int, count: int = 60, walls: int = 2):
+    """격자 정렬 좌표(경계 접촉이 자주 생김)와 임의 실수 좌표를 섞은 장애물 + 긴 벽."""
+    rng = random.Random(seed)
+
+    def coord(lo, hi):
+        return rng.choice([rng.randint(int(lo * 2), int(hi * 2)) / 2, rng.uniform(lo, hi)])
+
+    obstacles = [{"pos": {"x": coord(-10, 10), "y": rng.choice([0.0, coord(0, 2)]), "z": coord(-10, 10)},
+                  "size": {"x": coord(0.5, 4), "y": coord(0.5, 3), "z": coord(0.5, 4)}}
+                 for _ in range(count)]
+    for _ in range(walls):
+        long_side = {"x": 60.0, "z": 0.5} if rng.random() < 0.5 else {"x": 0.5, "z": 60.0}
+        obstacles.append({"pos": {"x": coord(-8, 8), "y": 0.0, "z": coord(-8, 8)},
+                          "size": {**long_side, "y": 3.0}})
+    process = {"pos": {"x": coord(-5, 5), "y": 0.0, "z": coord(-5, 5)},
+               "size": {"x": coord(1, 5), "y": coord(0.5, 2), "z": coord(1, 5)}}
+    return process, obstacles
+
+
+def reference_solve(optimizer, process, obstacles):
+    """색인 도입 전 탐색: 같은 나선 순서로 4개 회전을 모두 장애물 목록에 대해 선형 검사."""
+    origin, step = process["pos"], optimizer.step
+    r = 0.0
+    while r <= optimizer.max_range:
+        steps = int(r / step) if r > 0 else 0
+        for ix in range(-steps, steps + 1):
+            for iz in range(-steps, steps + 1):
+                if r > 0 and abs(ix) < steps and abs(iz) < steps:
+                    continue
+                pos = {"x": origin["x"] + ix * step, "y": origin["y"], "z": origin["z"] + iz * step}
+                for rot in ROTATIONS:
+                    if not optimizer.is_colliding(pos, process["size"], rot, obstacles):
+                        return {"success": True, "translate": pos, "rotation_y": rot,
+                                "distance": math.sqrt((ix * step) ** 2 + (iz * step) ** 2)}
+        r += step
+    return {"success": False, "message": "No valid position found within max range"}
+
+
+# ── ObstacleGrid vs 선형 검사 ─────────────────────────────
+@pytest.mark.parametrize("seed", range(5))
+def test_grid_collision_matches_linear_scan(seed):
+    process, obstacles = random_scene(seed)
+    optimizer = process_relocator.ProcessOptimizer(step=0.5)
+    # max_cells를 낮춰 벽이 격자 밖(large) 목록 경로로 검사되게 함
+    grid = process_relocator.ObstacleGrid(obstacles, min_cell=optimizer.step, max_cells=16)
+    rng = random.Random(100 + seed)
+
+    assert grid.large and grid.cells
+    collisions = 0
+    for _ in range(2000):
+        pos = {"x": rng.choice([rng.randint(-30, 30) / 2, rng.uniform(-15, 15)]),
+               "y": rng.choice([0.0, rng.uniform(0, 3)]),
+               "z": rng.choice([rng.randint(-30, 30) / 2, rng.uniform(-15, 15)])}
+        size = {"x": rng.uniform(0.2, 6), "y": rng.uniform(0.2, 3), "z": rng.uniform(0.2, 6)}
+        rot = rng.choice(ROTATIONS)
+        expected = optimizer.is_colliding(pos, size, rot, obstacles)
+        assert optimizer.is_colliding(pos, size, rot, grid) == expected
+        collisions += expected
+    assert 0 < collisions < 2000
+
+
+def test_touching_boxes_do_not_collide_in_grid():
+    obstacles = [{"pos": {"x": 0.0, "y": 0.0, "z": 0.0}, "size": {"x": 2.0, "y": 1.0, "z": 2.0}}]
+    grid = process_relocator.ObstacleGrid(obstacles, min_cell=0.5)
+    optimizer = process_relocator.ProcessOptimizer()
+    size = {"x": 2.0, "y": 1.0, "z": 2.0}
+
+    for pos in ({"x": 2.0, "y": 0.0, "z": 0.0}, {"x": 0.0, "y": 0.0, "z": -2.0}, {"x": 0.0, "y": 1.0, "z": 0.0}):
+        assert optimizer.is_colliding(pos, size, 0, obstacles) is False
+        assert optimizer.is_colliding(pos, size, 0, grid) is False
+    assert optimizer.is_colliding({"x": 1.9, "y": 0.0, "z": 0.0}, size, 0, grid) is True
+
+
+# ── solve vs 기준 탐색 ────────────────────────────────────
+@pytest.mark.parametrize("seed", range(8))
+def test_solve_matches_reference_search(seed):
+    process, obstacles = random_scene(seed, count=120)
+    optimizer = process_relocator.ProcessOptimizer(step=0.5, max_range=12.0)
+
+    result = optimizer.solve(process, obstacles)
+
+    assert result == reference_solve(optimizer, process, obstacles)
+
+
+def test_solve_reports_failure_when_enclosed():
+    process = {"pos": {"x": 0.0, "y": 0.0, "z": 0.0}, "size": {"x": 1.0, "y": 1.0, "z": 1.0}}
+    obstacles = [{"pos": {"x": 0.0, "y": 0.0, "z": 0.0}, "size": {"x": 50.0, "y": 5.0, "z": 50.0}}]
+    optimizer = process_relocator.ProcessOptimizer(step=0.5, max_range=3.0)
+
+    result = optimizer.solve(process, obstacles)
+
+    assert result["success"] is False
+    assert result == reference_solve(optimizer, process, obstacles)
@@ -0,0 +1,183 @@
+"""
+도구 실행 결과 캐시 테스트 (app/tools/result_cache.py, app/tools/executor.py)
+- 적중/미스: 같은 스크립트 + 같은 입력이면 subprocess 생략, 입력/스크립트가 바뀌면 재실행
+- 메타데이터 cacheable=False(기본) 도구와 pre-processor의 _no_cache 신호는 캐시하지 않음
+- post-processor가 실패한 출력은 캐시하지 않음
+- 메모리 LRU, 디스크 크기 제한(오래 사용하지 않은 항목부터 삭제)
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("pydantic")  # app.tools는 pydantic 모델을 사용 (requirements.txt)
+
+from app.tools import executor, result_cache  # noqa: E402
+from app.tools.tool_models import AdapterCode, ToolMetadata, ToolRegistryEntry  # noqa: E402
+
+# 호출될 때마다 calls.log에 한 줄을 남기고 입력의 value를 두 배로 돌려주는 도구 스크립트
+SCRIPT = """\
+import argparse, json
+from pathlib import Path
+parser = argparse.ArgumentParser()
+parser.add_argument("--input")
+parser.add_argument("--output")
+args = parser.parse_args()
+with open(Path(__file__).with_name("calls.log"), "a") as f:
+    f.write("call\\n")
+data = json.load(open(args.input))
+json.dump({"doubled": data["value"] * 2}, open(args.output, "w"))
+"""
+
+PRE_PROCESS = """\
+def convert_bop_to_input(bop_json, params):
+    data = {"value": bop_json["value"]}
+    if params.get("no_cache"):
+        data["_no_cache"] = True
+    return json.dumps(data)
+"""
+
+POST_PROCESS = """\
+def apply_result_to_bop(bop_json, tool_output):
+    if tool_output["doubled"] < 0:
+        raise ValueError("음수 결과")
+    return {**bop_json, "doubled": tool_output["doubled"]}
+"""
+
+
+@pytest.fixture
+def tool(tmp_path, monkeypatch):
+    """tmp_path에 스크립트/작업 디렉토리/캐시를 둔 임시 도구. calls()는 스크립트 실행 횟수."""
+    script = tmp_path / "scripts" / "doubler.py"
+    script.parent.mkdir()
+    script.write_text(SCRIPT, encoding="utf-8")
+    state = {"cacheable": True}
+
+    def get_tool(tool_id):
+        metadata = ToolMetadata(
+            tool_id=tool_id, tool_name="doubler", description="value × 2", execution_type="python",
+            file_name=script.name, cacheable=state["cacheable"],
+            input_schema={"type": "json", "description": "value"},
+            output_schema={"type": "json", "description": "doubled"})
+        adapter = AdapterCode(tool_id=tool_id, pre_process_code=PRE_PROCESS, post_process_code=POST_PROCESS)
+        return ToolRegistryEntry(metadata=metadata, adapter=adapter)
+
+    monkeypatch.setattr(executor, "get_tool", get_tool)
+    monkeypatch.setattr(executor, "get_script_path", lambda _tool_id, _name: script)
+    monkeypatch.setattr(executor, "WORKDIR_BASE", tmp_path / "workdir")
+    monkeypatch.setattr(executor, "LOGS_DIR", tmp_path / "logs")
+    monkeypatch.setattr(result_cache, "CACHE_DIR", tmp_path / "cache")
+    result_cache._memory.clear()
+
+    def calls():
+        log_file = script.with_name("calls.log")
+        return len(log_file.read_text().splitlines()) if log_file.exists() else 0
+
+    state["script"], state["calls"] = script, calls
+    yield state
+    result_cache._memory.clear()
+
+
+def execute(value, params=None, use_cache=True):
+    return asyncio.run(executor.execute_tool("doubler", {"value": value}, params, use_cache=use_cache))
+
+
+# ── executor: 적중 / 미스 ────────────────────────────────
+def test_cache_hit_skips_subprocess(tool):
+    first = execute(3)
+    second = execute(3)
+
+    assert first["success"] and second["success"]
+    assert (first["cache_hit"], second["cache_hit"]) == (False, True)
+    assert second["updated_bop"] == first["updated_bop"] == {"value": 3, "doubled": 6}
+    assert tool["calls"]() == 1
+
+
+def test_changed_input_or_script_misses(tool):
+    execute(3)
+    assert execute(4)["cache_hit"] is False
+
+    tool["script"].write_text(SCRIPT + "\n# 수정된 스크립트\n", encoding="utf-8")
+    assert execute(3)["cache_hit"] is False
+    assert tool["calls"]() == 3
+
+
+def test_use_cache_false_always_runs(tool):
+    execute(3)
+    assert execute(3, use_cache=False)["cache_hit"] is False
+    assert tool["calls"]() == 2
+
+
+# ── executor: cacheable 메타데이터 / _no_cache 신호 ──────
+def test_tool_without_cacheable_flag_is_not_cached(tool):
+    tool["cacheable"] = False
+    execute(3)
+    assert execute(3)["cache_hit"] is False
+    assert tool["calls"]() == 2 and not result_cache._memory
+
+
+def test_no_cache_signal_from_pre_processor_is_honoured(tool):
+    execute(3, {"no_cache": True})
+    assert execute(3, {"no_cache": True})["cache_hit"] is False
+    assert tool["calls"]() == 2 and not result_cache._memory
+
+
+# ── executor: post-processor 실패 ────────────────────────
+def test_output_rejected_by_post_processor_is_not_cached(tool):
+    failed = execute(-1)
+    assert failed["success"] is False and "Post-processor" in failed["message"]
+
+    retried = execute(-1)
+    assert retried["success"] is False
+    assert tool["calls"]() == 2 and not result_cache._memory
+
+
+# ── result_cache: 키 / LRU / 디스크 ──────────────────────
+def test_key_normalizes_json_input(tool):
+    script = tool["script"]
+    key = result_cache.make_key("doubler", script, '{"a": 1, "b": [1, 2]}')
+
+    assert key == result_cache.make_key("doubler", script, '{"b":[1,2],"a":1}')
+    assert key != result_cache.make_key("doubler", script, '{"a": 1, "b": [2, 1]}')
+    assert key != result_cache.make_key("other", script, '{"a": 1, "b": [1, 2]}')
+    assert result_cache.cacheable_input("not json") is True
+    assert result_cache.cacheable_input(json.dumps({"_no_cache": True})) is False
+
+
+def test_memory_lru_evicts_least_recently_used(tool, monkeypatch):
+    monkeypatch.setattr(result_cache, "MAX_MEMORY_ENTRIES", 2)
+    for key in ("a", "b"):
+        result_cache.put(key, f"out-{key}", None, None)
+    assert result_cache.get("a")["tool_output"] == "out-a"  # a가 최근 사용
+    result_cache.put("c", "out-c", None, None)
+
+    assert list(result_cache._memory) == ["a", "c"]
+    (result_cache.CACHE_DIR / "b.json").unlink()
+    assert result_cache.get("b") is None
+
+
+def test_disk_entries_reload_and_prune_oldest_first(tool, monkeypatch):
+    output = "x" * 4096
+    result_cache.put("k0", output, "stdout", None)
+    entry_size = (result_cache.CACHE_DIR / "k0.json").stat().st_size
+    result_cache._memory.clear()
+    assert result_cache.get("k0") == {"tool_output": output, "stdout": "stdout", "stderr": None}
+
+    monkeypatch.setattr(result_cache, "MAX_DISK_BYTES", 2 * entry_size)
+    result_cache.clear()
+    for i, key in enumerate(("k0", "k1", "k2")):
+        result_cache.put(key, output, None, None)
+        timestamp = time.time() - 100 + i  # 사용 순서대로 mtime 증가
+        os.utime(result_cache.CACHE_DIR / f"{key}.json", (timestamp, timestamp))
+    result_cache.put("k3", output, None, None)
+
+    remaining = sorted(p.name for p in result_cache.CACHE_DIR.glob("*.json"))
+    assert remaining == ["k2.json", "k3.json"]